@@ -1,56 +1,28 @@
 from __future__ import print_function
-import openpyxl
-import math
-import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
-from CoolProp import AbstractState
-from CoolProp.CoolProp import PhaseSI, PropsSI, get_global_param_string
-import CoolProp.CoolProp as CoolProp
+from greenhouse.weather import load_tmy
+from greenhouse.properties import reference_properties
 
 # 기본 상수 정의
 P_atm = 101325  # [K]
 T_mean = 300  # [K]
-rhoAir = PropsSI("D", "T", T_mean, "P", P_atm, "air")  # [kg/m3]
-rhoWater = PropsSI("D", "T", T_mean, "P", P_atm, "water")  # [kg/m3]
-cAir = PropsSI("C", "T", T_mean, "P", P_atm, "air") / 1000  # [kJ/kgK]
-cWater = PropsSI("C", "T", T_mean, "P", P_atm, "water") / 1000  # [kJ/kgK]
+rhoAir, rhoWater, cAir, cWater = reference_properties(T_mean, P_atm)  # [kg/m3], [kg/m3], [kJ/kgK], [kJ/kgK]
 pi = 3.14
 
-# 먼저 시간 배열 정의
-hour = np.ones(8760)
-
-# 그 다음 나머지 배열들 초기화
-Abs = np.ones(1470)
-wavelength = np.linspace(0.3, 15, 1470)
-Toutdoor = 300 * np.ones(len(hour))  # [K]
-Troom = 300 * np.ones(len(hour))
-Vwind = np.ones(8760)
-hconv = np.ones(8760)
-qTotalHouse = np.zeros(len(hour))  # [W]
-qInHouse = np.zeros(len(hour))  # [W]
-radSolar = np.zeros(len(hour))
-qRad = np.zeros(len(hour))
-qRoof = np.zeros(len(hour))  # [W]
-qFloor = np.zeros(len(hour))  # [W]
-qVent = np.zeros(len(hour))  # [W]
-qSideWall = np.zeros(len(hour))  # [W]
-qWindow = np.zeros(len(hour))  # 창문 열손실 [W]
-qHeating = np.zeros(len(hour))  # [W]
-qCooling = np.zeros(len(hour))  # [W]
-PW = np.zeros(len(hour))  # [W]
-mode = np.zeros(len(hour))  # [W]
-
-# 엑셀 파일 열기 (openpyxl 사용)
-wb = openpyxl.load_workbook('TMY3_Gangnung.xlsx')
-sheet = wb.active
-
-# 데이터를 엑셀 파일에서 읽어오기
-for i in range(0, len(hour)):
-    Toutdoor[i] = sheet.cell(i + 1, 2).value
-    Vwind[i] = sheet.cell(i + 1, 3).value
-    PW[i] = sheet.cell(i + 1, 4).value
-    radSolar[i] = sheet.cell(i + 1, 5).value
+# 기상데이터 읽기 (B~E열 일괄 로드, 두 번째 실행부터는 캐시 사용)
+Toutdoor, Vwind, PW, radSolar = load_tmy('TMY3_Gangnung.xlsx')
+
+# 시간별 배열 초기화
+Troom = 300 * np.ones(len(Toutdoor))
+qTotalHouse = np.zeros(len(Toutdoor))  # [W]
+qRad = np.zeros(len(Toutdoor))
+qRoof = np.zeros(len(Toutdoor))  # [W]
+qFloor = np.zeros(len(Toutdoor))  # [W]
+qVent = np.zeros(len(Toutdoor))  # [W]
+qSideWall = np.zeros(len(Toutdoor))  # [W]
+qWindow = np.zeros(len(Toutdoor))  # 창문 열손실 [W]
+qHeating = np.zeros(len(Toutdoor))  # [W]
+qCooling = np.zeros(len(Toutdoor))  # [W]
 
 # 온실 크기 및 기타 변수 설정
 lengthHouse = 70  # [m]
@@ -87,7 +59,7 @@ Tset_heating = 20 + 273  # 난방 설정 온도 (20°C)
 Tset_cooling = 28 + 273  # 냉방 설정 온도 (28°C)
 
 # 열 부하 계산
-for k in range(len(hour)):
+for k in range(len(Toutdoor)):
     # 환기 전열부하 계산 [W]
     qVent[k] = m_vent * cAir * 1000 * (Toutdoor[k] - Troom[k])  # cAir를 kJ/kgK에서 J/kgK로 변환
 
@@ -112,6 +84,8 @@ for k in range(len(hour)):
         qHeating[k] = 0
         qCooling[k] = 0
 
+from matplotlib import pyplot as plt  # 그래프를 그릴 때만 불러옴
+
 # 그래프 시각화
 plt.figure(figsize=(15, 15))
 
@@ -1,73 +1,34 @@
 from __future__ import print_function
-import openpyxl
-import math
-import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
-from CoolProp import AbstractState
-from CoolProp.CoolProp import PhaseSI, PropsSI, get_global_param_string
-import CoolProp.CoolProp as CoolProp
+from greenhouse.weather import load_tmy
+from greenhouse.solair import calculate_Tsolair2
+from greenhouse.properties import reference_properties
+from greenhouse.analysis import monthly_hourly
 
 # 기본 상수 정의
 P_atm = 101325  # [K]
 T_mean = 300  # [K]
-rhoAir = PropsSI("D", "T", T_mean, "P", P_atm, "air")  # [kg/m3]
-rhoWater = PropsSI("D", "T", T_mean, "P", P_atm, "water")  # [kg/m3]
-cAir = PropsSI("C", "T", T_mean, "P", P_atm, "air") / 1000  # [kJ/kgK]
-cWater = PropsSI("C", "T", T_mean, "P", P_atm, "water") / 1000  # [kJ/kgK]
+rhoAir, rhoWater, cAir, cWater = reference_properties(T_mean, P_atm)  # [kg/m3], [kg/m3], [kJ/kgK], [kJ/kgK]
 pi = 3.14
 
-# 먼저 시간 배열 정의
-hour = np.ones(8760)
-
-# 그 다음 나머지 배열들 초기화
-Abs = np.ones(1470)
-wavelength = np.linspace(0.3, 15, 1470)
-Toutdoor = 300 * np.ones(len(hour))  # [K]
-Troom = 295
-# Troom = 300 * np.ones(len(hour))
-Vwind = np.ones(8760)
-hconv = np.ones(8760)
-qTotalHouse = np.zeros(len(hour))  # [W]
-qInHouse = np.zeros(len(hour))  # [W]
-radSolar = np.zeros(len(hour))
-qRad = np.zeros(len(hour))
-qRoof = np.zeros(len(hour))  # [W]
-qFloor = np.zeros(len(hour))  # [W]
-qVent = np.zeros(len(hour))  # [W]
-qSideWall = np.zeros(len(hour))  # [W]
-qFrontBack = np.zeros(len(hour))
-qWindow = np.zeros(len(hour))  # 창문 열손실 [W]
-qHeating = np.zeros(len(hour))  # [W]
-qCooling = np.zeros(len(hour))  # [W]
-PW = np.zeros(len(hour))  # [W]
-mode = np.zeros(len(hour))  # [W]
-
 # Tsolair2 계산을 위한 변수 정의
 alpha_roof = 0.2  # 지붕 표면 일사흡수율 [-]
 epsilon = 0.9  # 지붕 표면 방사율 [-]
 sigma = 5.67e-8  # Stefan-Boltzmann 상수 [W/m2K4]
 
-# Tsolair2 계산 함수
-def calculate_Tsolair2(k, Toutdoor, radSolar, Vwind):
-    """
-    등가 외기온도(sol-air temperature) 계산
-    """
-    h_out_corrected = 5.7 + 3.8 * Vwind[k]  # 풍속 보정된 열전달계수 [W/m2K]
-    dT_longwave = (epsilon * 63) / h_out_corrected  # 장파장 복사 보정항 [K]
-    Tsolair2 = Toutdoor[k] + (alpha_roof * radSolar[k]) / h_out_corrected - dT_longwave  # 등가 외기온도 [K]
-    return Tsolair2
-
-# 엑셀 파일 열기 (openpyxl 사용)
-wb = openpyxl.load_workbook('TMY3_Gangnung.xlsx')
-sheet = wb.active
-
-# 데이터를 엑셀 파일에서 읽어오기
-for i in range(0, len(hour)):
-    Toutdoor[i] = sheet.cell(i + 1, 2).value
-    Vwind[i] = sheet.cell(i + 1, 3).value
-    PW[i] = sheet.cell(i + 1, 4).value
-    radSolar[i] = sheet.cell(i + 1, 5).value
+# 기상데이터 읽기 (B~E열 일괄 로드, 두 번째 실행부터는 캐시 사용)
+Toutdoor, Vwind, PW, radSolar = load_tmy('TMY3_Gangnung.xlsx')
+
+# 시간별 배열 초기화
+qTotalHouse = np.zeros(len(Toutdoor))  # [W]
+qRad = np.zeros(len(Toutdoor))
+qRoof = np.zeros(len(Toutdoor))  # [W]
+qFloor = np.zeros(len(Toutdoor))  # [W]
+qVent = np.zeros(len(Toutdoor))  # [W]
+qSideWall = np.zeros(len(Toutdoor))  # [W]
+qFrontBack = np.zeros(len(Toutdoor))
+qHeating = np.zeros(len(Toutdoor))  # [W]
+qCooling = np.zeros(len(Toutdoor))  # [W]
 
 # 온실 크기 및 기타 변수 설정
 lengthHouse = 70  # [m]
@@ -106,13 +67,11 @@ Tground = 4.12 + 273
 Tset_heating = 16 + 273  # 난방 설정 온도 (20°C)
 Tset_cooling = 28 + 273  # 냉방 설정 온도 (28°C)
 
-# Tsolair2 계산
-Tsolair2 = np.zeros(len(hour))
-for k in range(len(hour)):
-    Tsolair2[k] = calculate_Tsolair2(k, Toutdoor, radSolar, Vwind)
+# Tsolair2 계산 (연간 배열 일괄 계산)
+Tsolair2 = calculate_Tsolair2(Toutdoor, radSolar, Vwind, model='wind', alpha_roof=alpha_roof, epsilon=epsilon)
 
 # 열 부하 계산
-for k in range(len(hour)):
+for k in range(len(Toutdoor)):
     # 환기 전열부하 계산 [W]
     # qVent[k] = m_vent * cAir * 1000 * (Troom - Toutdoor[k])  # cAir를 kJ/kgK에서 J/kgK로 변환
     qVent[k] = (Troom - Toutdoor[k]) * hv * Agh
@@ -137,32 +96,15 @@ for k in range(len(hour)):
         qCooling[k] = 0
 
 # 기존 코드는 그대로 유지하고 그래프 부분만 수정
-# 데이터를 월별로 분리
-def get_monthly_averages(data, month):
-    # 각 월의 시작 인덱스 계산
-    start_idx = (month - 1) * 24 * 31  # 한 달을 31일로 가정
-    end_idx = start_idx + (24 * 31)
-
-    # 해당 월의 데이터 추출
-    monthly_data = data[start_idx:end_idx]
-
-    # 24시간 평균 계산
-    hourly_averages = np.zeros(24)
-    for hour in range(24):
-        # 같은 시간대의 모든 날짜 데이터 평균
-        hour_data = monthly_data[hour::24]
-        hourly_averages[hour] = np.mean(hour_data)
-
-    return hourly_averages
+# 월 x 시간대별 평균 (실제 월별 일수 사용)
+monthly_profile = monthly_hourly(qTotalHouse, stats=('mean',))['mean']
 
+# 1월, 4월, 7월, 10월의 시간별 평균 부하
+jan_loads, apr_loads, jul_loads, oct_loads = monthly_profile[[0, 3, 6, 9]]
 
-# 1월, 4월, 7월, 10월의 시간별 평균 부하 계산
-jan_loads = get_monthly_averages(qTotalHouse, 1)
-apr_loads = get_monthly_averages(qTotalHouse, 4)
-jul_loads = get_monthly_averages(qTotalHouse, 7)
-oct_loads = get_monthly_averages(qTotalHouse, 10)
 
 
+from matplotlib import pyplot as plt  # 그래프를 그릴 때만 불러옴
 
 # 그래프 그리기
 plt.figure(figsize=(12, 8))
@@ -1,58 +1,29 @@
 from __future__ import print_function
-import openpyxl
-import math
-import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
-from CoolProp import AbstractState
-from CoolProp.CoolProp import PhaseSI, PropsSI, get_global_param_string
-import CoolProp.CoolProp as CoolProp
+from greenhouse.weather import load_tmy
+from greenhouse.solair import calculate_Tsolair2
+from greenhouse.properties import reference_properties
 
 # 기본 상수 정의
 P_atm = 101325  # [K]
 T_mean = 300  # [K]
-rhoAir = PropsSI("D", "T", T_mean, "P", P_atm, "air")  # 1.1769955883877592 [kg/m3]
-rhoWater = PropsSI("D", "T", T_mean, "P", P_atm, "water")  # 996.5569352652021 [kg/m3]
-cAir = PropsSI("C", "T", T_mean, "P", P_atm, "air") / 1000  # 1.0063739076641027 [kJ/kgK]
-cWater = PropsSI("C", "T", T_mean, "P", P_atm, "water") / 1000  # 4.1806357765560715 [kJ/kgK]
+rhoAir, rhoWater, cAir, cWater = reference_properties(T_mean, P_atm)  # [kg/m3], [kg/m3], [kJ/kgK], [kJ/kgK]
 pi = 3.14
 
-# 먼저 시간 배열 정의
-hour = np.ones(8760)
-
-# 그 다음 나머지 배열들 초기화
-Abs = np.ones(1470)
-wavelength = np.linspace(0.3, 15, 1470)
-Toutdoor = 300 * np.ones(len(hour))  # [K]
-Troom = 300 * np.ones(len(hour))
-Vwind = np.ones(8760)
-
-hconv = np.ones(8760)
-qTotalHouse = np.zeros(len(hour))  # [W]
-qInHouse = np.zeros(len(hour))  # [W]
-radSolar = np.zeros(len(hour))
-qRad = np.zeros(len(hour))
-qRoof = np.zeros(len(hour))  # [W]
-qFloor = np.zeros(len(hour))  # [W]
-qVent = np.zeros(len(hour))  # [W]
-qSideWall = np.zeros(len(hour))  # [W]
-qFrontBack = np.zeros(len(hour))
-qWindow = np.zeros(len(hour))  # 창문 열손실 [W]
-qHeating = np.zeros(len(hour))  # [W]
-qCooling = np.zeros(len(hour))  # [W]
-PW = np.zeros(len(hour))  # [W]
-mode = np.zeros(len(hour))  # [W]
-
-# 엑셀 파일 열기 (openpyxl 사용)
-wb = openpyxl.load_workbook('TMY3_Gangnung.xlsx')
-sheet = wb.active
-
-# 데이터를 엑셀 파일에서 읽어오기
-for i in range(0, len(hour)):
-    Toutdoor[i] = sheet.cell(row=i + 1, column=2).value  # 배열은 0부터, 엑셀은 1부터 시작
-    Vwind[i] = sheet.cell(row=i + 1, column=3).value
-    PW[i] = sheet.cell(row=i + 1, column=4).value
-    radSolar[i] = sheet.cell(row=i + 1, column=5).value
+# 기상데이터 읽기 (B~E열 일괄 로드, 두 번째 실행부터는 캐시 사용)
+Toutdoor, Vwind, PW, radSolar = load_tmy('TMY3_Gangnung.xlsx')
+
+# 시간별 배열 초기화
+Troom = 300 * np.ones(len(Toutdoor))
+qTotalHouse = np.zeros(len(Toutdoor))  # [W]
+qRad = np.zeros(len(Toutdoor))
+qRoof = np.zeros(len(Toutdoor))  # [W]
+qFloor = np.zeros(len(Toutdoor))  # [W]
+qVent = np.zeros(len(Toutdoor))  # [W]
+qSideWall = np.zeros(len(Toutdoor))  # [W]
+qFrontBack = np.zeros(len(Toutdoor))
+qHeating = np.zeros(len(Toutdoor))  # [W]
+qCooling = np.zeros(len(Toutdoor))  # [W]
 
 # 온실 크기 및 기타 변수 설정
 lengthHouse = 70  # [m]
@@ -94,17 +65,11 @@ Tset_cooling = 20 + 273  # 냉방 설정 온도 (28°C)
 # Tsolair2 계산을 위한 변수 정의
 alpha_roof = 0.2  # 지붕 표면 일사흡수율 [-]
 
-def calculate_Tsolair2(k, Toutdoor, radSolar):
-    Tsolair2 = Toutdoor[k] + (alpha_roof * radSolar[k]) / 17 # 등가 외기온도 [K]
-    return Tsolair2
-
-# Tsolair2 계산
-Tsolair2 = np.zeros(len(hour))
-for k in range(len(hour)):
-    Tsolair2[k] = calculate_Tsolair2(k, Toutdoor, radSolar)
+# Tsolair2 계산 (연간 배열 일괄 계산)
+Tsolair2 = calculate_Tsolair2(Toutdoor, radSolar, model='fixed', alpha_roof=alpha_roof)
 
 # 열 부하 계산
-for k in range(len(hour)):
+for k in range(len(Toutdoor)):
     # 1. 먼저 현재 시간의 실내온도 계산 (k > 0일 때)
     if k > 0:
         dT = (qTotalHouse[k-1]) / (mHouse * cAir * 1000)  # 온도 변화
@@ -188,7 +153,7 @@ def get_monthly_averages(data, month):
 # plt.figure(figsize=(15, 6))
 #
 # # 시간 배열 생성
-# time = range(len(hour))
+# time = range(len(Toutdoor))
 #
 # # 열부하 데이터 플로팅 (단위: kW)
 # plt.plot(time, qTotalHouse / 1000, 'b-', label='Total Heat Load', linewidth=1)
@@ -207,11 +172,13 @@ def get_monthly_averages(data, month):
 # plt.tight_layout()
 # plt.show()
 #
+from matplotlib import pyplot as plt  # 그래프를 그릴 때만 불러옴
+
 # 난방부하와 냉방부하 그래프 그리기
 plt.figure(figsize=(15, 6))
 
 # 시간 배열 생성
-time = range(len(hour))
+time = range(len(Toutdoor))
 
 # 열부하 데이터 플로팅 (단위: kW)
 plt.plot(time, qTotalHouse / 1000, 'gray', label='Total Heat Load', alpha=0.5, linewidth=1)
@@ -236,7 +203,7 @@ plt.show()
 # plt.figure(figsize=(15, 6))
 #
 # # Create time array
-# time = range(len(hour))
+# time = range(len(Toutdoor))
 #
 # # Plot room temperature (convert from Kelvin to Celsius)
 # plt.plot(time, Troom - 273.15, 'g-', label='Room Temperature', linewidth=1)
@@ -287,7 +254,7 @@ plt.show()
 # plt.figure(figsize=(15, 6))
 #
 # # 시간 배열 생성
-# time = range(len(hour))
+# time = range(len(Toutdoor))
 #
 # # 온도 데이터 플로팅 (켈빈에서 섭씨로 변환)
 # plt.plot(time, Tsolair2 - 273.15, 'r-', label='Equivalent Outdoor Temperature (Tsolair2)', linewidth=1)
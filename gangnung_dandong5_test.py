@@ -1,58 +1,19 @@
 from __future__ import print_function
-import openpyxl
-import math
-import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
-from CoolProp import AbstractState
-from CoolProp.CoolProp import PhaseSI, PropsSI, get_global_param_string
-import CoolProp.CoolProp as CoolProp
+from greenhouse.weather import load_tmy
+from greenhouse.solair import calculate_Tsolair2
+from greenhouse.solver import solve_troom
+from greenhouse.properties import reference_properties
+from greenhouse.analysis import monthly_hourly
 
 # 기본 상수 정의
 P_atm = 101325  # [K]
 T_mean = 300  # [K]
-rhoAir = PropsSI("D", "T", T_mean, "P", P_atm, "air")  # 1.1769955883877592 [kg/m3]
-rhoWater = PropsSI("D", "T", T_mean, "P", P_atm, "water")  # 996.5569352652021 [kg/m3]
-cAir = PropsSI("C", "T", T_mean, "P", P_atm, "air") / 1000  # 1.0063739076641027 [kJ/kgK]
-cWater = PropsSI("C", "T", T_mean, "P", P_atm, "water") / 1000  # 4.1806357765560715 [kJ/kgK]
+rhoAir, rhoWater, cAir, cWater = reference_properties(T_mean, P_atm)  # [kg/m3], [kg/m3], [kJ/kgK], [kJ/kgK]
 pi = 3.14
 
-# 먼저 시간 배열 정의
-hour = np.ones(8760)
-
-# 그 다음 나머지 배열들 초기화
-Abs = np.ones(1470)
-wavelength = np.linspace(0.3, 15, 1470)
-Toutdoor = 300 * np.ones(len(hour))  # [K]
-Troom = 300 * np.ones(len(hour))
-Vwind = np.ones(8760)
-
-hconv = np.ones(8760)
-qTotalHouse = np.zeros(len(hour))  # [W]
-qInHouse = np.zeros(len(hour))  # [W]
-radSolar = np.zeros(len(hour))
-qRad = np.zeros(len(hour))
-qRoof = np.zeros(len(hour))  # [W]
-qFloor = np.zeros(len(hour))  # [W]
-qVent = np.zeros(len(hour))  # [W]
-qSideWall = np.zeros(len(hour))  # [W]
-qFrontBack = np.zeros(len(hour))
-qWindow = np.zeros(len(hour))  # 창문 열손실 [W]
-qHeating = np.zeros(len(hour))  # [W]
-qCooling = np.zeros(len(hour))  # [W]
-PW = np.zeros(len(hour))  # [W]
-mode = np.zeros(len(hour))  # [W]
-
-# 엑셀 파일 열기 (openpyxl 사용)
-wb = openpyxl.load_workbook('TMY3_Gangnung.xlsx')
-sheet = wb.active
-
-# 데이터를 엑셀 파일에서 읽어오기
-for i in range(0, len(hour)):
-    Toutdoor[i] = sheet.cell(row=i + 1, column=2).value  # 배열은 0부터, 엑셀은 1부터 시작
-    Vwind[i] = sheet.cell(row=i + 1, column=3).value
-    PW[i] = sheet.cell(row=i + 1, column=4).value
-    radSolar[i] = sheet.cell(row=i + 1, column=5).value
+# 기상데이터 읽기 (B~E열 일괄 로드, 두 번째 실행부터는 캐시 사용)
+Toutdoor, Vwind, PW, radSolar = load_tmy('TMY3_Gangnung.xlsx')
 
 # 온실 크기 및 기타 변수 설정
 lengthHouse = 70  # [m]
@@ -86,7 +47,6 @@ m_vent = ventilation_rate * rhoAir  # 환기 공기 질량유량 [kg/s]
 
 # 실내 온도 초기화
 Troom_initial = 7 + 273
-Troom[0] = Troom_initial
 Tground = 10 + 273
 Tset_heating = 15 + 273  # 난방 설정 온도 (16°C)
 Tset_cooling = 20 + 273  # 냉방 설정 온도 (28°C)
@@ -94,73 +54,30 @@ Tset_cooling = 20 + 273  # 냉방 설정 온도 (28°C)
 # Tsolair2 계산을 위한 변수 정의
 alpha_roof = 0.2  # 지붕 표면 일사흡수율 [-]
 
-def calculate_Tsolair2(k, Toutdoor, radSolar):
-    Tsolair2 = Toutdoor[k] + (alpha_roof * radSolar[k]) / 17 # 등가 외기온도 [K]
-    return Tsolair2
-
-# Tsolair2 계산
-Tsolair2 = np.zeros(len(hour))
-for k in range(len(hour)):
-    Tsolair2[k] = calculate_Tsolair2(k, Toutdoor, radSolar)
-
-# 열 부하 계산
-for k in range(len(hour)):
-    # 1. 먼저 현재 시간의 실내온도 계산 (k > 0일 때)
-    if k > 0:
-        dT = (qTotalHouse[k-1]) / (mHouse * cAir * 1000)  # 온도 변화
-        Troom[k] = Troom[k-1] + dT  # 새로운 실내온도
-
-    # 2. 계산된 실내온도로 열부하 계산
-    qVent[k] = (Tsolair2[k] - Troom[k]) * hv * Agh
-    qRad[k] = fracSolarWindow * transGlass * areaHouse * radSolar[k]
-    qRoof[k] = (Tsolair2[k] - Troom[k]) * ht * areaRoof * (1 - fr)
-    qFloor[k] = (Tground - Troom[k]) * hs * areaHouse
-    qSideWall[k] = (Tsolair2[k] - Troom[k]) * ht * areaSideWall * (1 - fr)
-    qFrontBack[k] = (Tsolair2[k] - Troom[k]) * ht * areaFrontBack * (1 - fr)
-
-    # 온실에 유입, 유출되는 열 에너지 총합
-    qTotalHouse[k] = qRoof[k] + qFloor[k] + qSideWall[k] + qVent[k] + qFrontBack[k] + qRad[k] + qHeating[k] - qCooling[k]
-
-    # 난방/냉방 부하 계산
-    if Troom[k] < Tset_heating:
-        # 난방 필요
-        qHeating[k] = ((Tset_heating - Troom[k]) * (mHouse * cAir * 1000))
-        qCooling[k] = 0
-        mode[k] = 1  # 난방 모드
-    elif Troom[k] > Tset_cooling:
-        # 냉방 필요
-        qCooling[k] = ((Troom[k] - Tset_cooling) * (mHouse * cAir * 1000))
-        qHeating[k] = 0
-        mode[k] = 2  # 냉방 모드
-    else:
-        # 난방/냉방 불필요
-        qHeating[k] = 0
-        qCooling[k] = 0
-        mode[k] = 0  # 중립 모드
-
-# 데이터를 월별로 분리
-def get_monthly_averages(data, month):
-    # 각 월의 시작 인덱스 계산
-    start_idx = (month - 1) * 24 * 31  # 한 달을 31일로 가정
-    end_idx = start_idx + (24 * 31)
-
-    # 해당 월의 데이터 추출
-    monthly_data = data[start_idx:end_idx]
-
-    # 24시간 평균 계산
-    hourly_averages = np.zeros(24)
-    for hour in range(24):
-        # 같은 시간대의 모든 날짜 데이터 평균
-        hour_data = monthly_data[hour::24]
-        hourly_averages[hour] = np.mean(hour_data)
-
-    return hourly_averages
-
-# 1월, 4월, 7월, 10월의 시간별 평균 부하 계산
-jan_loads = get_monthly_averages(qTotalHouse, 1)
-apr_loads = get_monthly_averages(qTotalHouse, 4)
-jul_loads = get_monthly_averages(qTotalHouse, 7)
-oct_loads = get_monthly_averages(qTotalHouse, 10)
+# Tsolair2 계산 (연간 배열 일괄 계산)
+Tsolair2 = calculate_Tsolair2(Toutdoor, radSolar, model='fixed', alpha_roof=alpha_roof)
+
+# 열 부하 계산 (실내온도 점화식과 난방/냉방 분기를 solve_troom으로 한 번에 해석)
+U_solair = ht * (areaRoof + areaSideWall + areaFrontBack) * (1 - fr) + hv * Agh  # Tsolair2 기준 열컨덕턴스 [W/K]
+U_ground = hs * areaHouse  # 지면 열컨덕턴스 [W/K]
+qRad = fracSolarWindow * transGlass * areaHouse * radSolar
+Troom, qTotalHouse, qHeating, qCooling, mode = solve_troom(
+    U_solair * Tsolair2 + U_ground * Tground + qRad, U_solair + U_ground, mHouse * cAir * 1000,
+    Troom_initial, Tset_heating, Tset_cooling)
+
+qVent = (Tsolair2 - Troom) * hv * Agh
+qRoof = (Tsolair2 - Troom) * ht * areaRoof * (1 - fr)
+qFloor = (Tground - Troom) * hs * areaHouse
+qSideWall = (Tsolair2 - Troom) * ht * areaSideWall * (1 - fr)
+qFrontBack = (Tsolair2 - Troom) * ht * areaFrontBack * (1 - fr)
+
+# 월 x 시간대별 평균 (실제 월별 일수 사용)
+monthly_profile = monthly_hourly(qTotalHouse, stats=('mean',))['mean']
+
+# 1월, 4월, 7월, 10월의 시간별 평균 부하
+jan_loads, apr_loads, jul_loads, oct_loads = monthly_profile[[0, 3, 6, 9]]
+
+from matplotlib import pyplot as plt  # 그래프를 그릴 때만 불러옴
 
 # 그래프 그리기
 plt.figure(figsize=(12, 8))
@@ -194,7 +111,7 @@ plt.show()
 plt.figure(figsize=(15, 6))
 
 # 시간 배열 생성
-time = range(len(hour))
+time = range(len(Toutdoor))
 
 # 열부하 데이터 플로팅 (단위: kW)
 plt.plot(time, qTotalHouse / 1000, 'b-', label='Total Heat Load', linewidth=1)
@@ -217,7 +134,7 @@ plt.show()
 plt.figure(figsize=(15, 6))
 
 # 시간 배열 생성
-time = range(len(hour))
+time = range(len(Toutdoor))
 
 # 열부하 데이터 플로팅 (단위: kW)
 plt.plot(time, qTotalHouse / 1000, 'gray', label='Total Heat Load', alpha=0.5, linewidth=1)
@@ -242,7 +159,7 @@ plt.show()
 plt.figure(figsize=(15, 6))
 
 # Create time array
-time = range(len(hour))
+time = range(len(Toutdoor))
 
 # Plot room temperature (convert from Kelvin to Celsius)
 plt.plot(time, Troom - 273.15, 'g-', label='Room Temperature', linewidth=1)
@@ -293,7 +210,7 @@ plt.show()
 plt.figure(figsize=(15, 6))
 
 # 시간 배열 생성
-time = range(len(hour))
+time = range(len(Toutdoor))
 
 # 온도 데이터 플로팅 (켈빈에서 섭씨로 변환)
 plt.plot(time, Tsolair2 - 273.15, 'r-', label='Equivalent Outdoor Temperature (Tsolair2)', linewidth=1)
@@ -355,5 +272,5 @@ print(f"실내온도: {Troom[min_temp_idx]-273.15:.2f}°C")
 print(f"외기온도: {Tsolair2[min_temp_idx]-273.15:.2f}°C")
 print(f"난방부하: {qHeating[min_temp_idx] / 1000:.2f}kW")
 
-# for k in range(len(hour)):
+# for k in range(len(Toutdoor)):
 #     print(Troom[k])
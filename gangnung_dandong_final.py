@@ -1,58 +1,18 @@
 from __future__ import print_function
-import openpyxl
-import math
-import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
-from CoolProp import AbstractState
-from CoolProp.CoolProp import PhaseSI, PropsSI, get_global_param_string
-import CoolProp.CoolProp as CoolProp
+from greenhouse.weather import load_tmy
+from greenhouse.solair import calculate_Tsolair2
+from greenhouse.solver import solve_troom
+from greenhouse.properties import reference_properties
 
 # 기본 상수 정의
 P_atm = 101325  # [K]
 T_mean = 300  # [K]
-rhoAir = PropsSI("D", "T", T_mean, "P", P_atm, "air")  # 1.1769955883877592 [kg/m3]
-rhoWater = PropsSI("D", "T", T_mean, "P", P_atm, "water")  # 996.5569352652021 [kg/m3]
-cAir = PropsSI("C", "T", T_mean, "P", P_atm, "air") / 1000  # 1.0063739076641027 [kJ/kgK]
-cWater = PropsSI("C", "T", T_mean, "P", P_atm, "water") / 1000  # 4.1806357765560715 [kJ/kgK]
+rhoAir, rhoWater, cAir, cWater = reference_properties(T_mean, P_atm)  # [kg/m3], [kg/m3], [kJ/kgK], [kJ/kgK]
 pi = 3.14
 
-# 먼저 시간 배열 정의
-hour = np.ones(8760)
-
-# 그 다음 나머지 배열들 초기화
-Abs = np.ones(1470)
-wavelength = np.linspace(0.3, 15, 1470)
-Toutdoor = 300 * np.ones(len(hour))  # [K]
-Troom = 300 * np.ones(len(hour))
-Vwind = np.ones(8760)
-
-hconv = np.ones(8760)
-qTotalHouse = np.zeros(len(hour))  # [W]
-qInHouse = np.zeros(len(hour))  # [W]
-radSolar = np.zeros(len(hour))
-qRad = np.zeros(len(hour))
-qRoof = np.zeros(len(hour))  # [W]
-qFloor = np.zeros(len(hour))  # [W]
-qVent = np.zeros(len(hour))  # [W]
-qSideWall = np.zeros(len(hour))  # [W]
-qFrontBack = np.zeros(len(hour))
-qWindow = np.zeros(len(hour))  # 창문 열손실 [W]
-qHeating = np.zeros(len(hour))  # [W]
-qCooling = np.zeros(len(hour))  # [W]
-PW = np.zeros(len(hour))  # [W]
-mode = np.zeros(len(hour))  # [W]
-
-# 엑셀 파일 열기 (openpyxl 사용)
-wb = openpyxl.load_workbook('TMY3_Gangnung.xlsx')
-sheet = wb.active
-
-# 데이터를 엑셀 파일에서 읽어오기
-for i in range(0, len(hour)):
-    Toutdoor[i] = sheet.cell(row=i + 1, column=2).value  # 배열은 0부터, 엑셀은 1부터 시작
-    Vwind[i] = sheet.cell(row=i + 1, column=3).value
-    PW[i] = sheet.cell(row=i + 1, column=4).value
-    radSolar[i] = sheet.cell(row=i + 1, column=5).value
+# 기상데이터 읽기 (B~E열 일괄 로드, 두 번째 실행부터는 캐시 사용)
+Toutdoor, Vwind, PW, radSolar = load_tmy('TMY3_Gangnung.xlsx')
 
 # 온실 크기 및 기타 변수 설정
 lengthHouse = 70  # [m]
@@ -87,7 +47,6 @@ m_vent = ventilation_rate * rhoAir  # 환기 공기 질량유량 [kg/s]
 
 # 실내 온도 초기화
 Troom_initial = 10 + 273
-Troom[0] = Troom_initial
 Tground = 15 + 273
 Tset_heating = 15 + 273  # 난방 설정 온도 (16°C)
 Tset_cooling = 25 + 273  # 냉방 설정 온도 (28°C)
@@ -95,62 +54,33 @@ Tset_cooling = 25 + 273  # 냉방 설정 온도 (28°C)
 # Tsolair2 계산을 위한 변수 정의
 alpha_roof = 0.15  # 지붕 표면 일사흡수율 [-]
 
-def calculate_Tsolair2(k, Toutdoor, radSolar):
-    Tsolair2 = Toutdoor[k] + ((alpha_roof * radSolar[k]) / 17)  # 등가 외기온도 [K]
-    return Tsolair2
-
-# Tsolair2 계산
-Tsolair2 = np.zeros(len(hour))
-for k in range(len(hour)):
-    Tsolair2[k] = calculate_Tsolair2(k, Toutdoor, radSolar)
-
-# 열 부하 계산
-for k in range(len(hour)):
-    # 1. 먼저 현재 시간의 실내온도 계산 (k > 0일 때)
-    if k > 0:
-        dT = (qTotalHouse[k-1] ) / (mHouse * cAir )  # 온도 변화
-        Troom[k] = Troom[k-1] + dT  # 새로운 실내온도
-
-    # 2. 계산된 실내온도로 열부하 계산
-    # qVent[k] = (Tsolair2[k] - Troom[k]) * hv * Agh * 0.001163
-    # qRad[k] = fracSolarWindow * transGlass * areaHouse * radSolar[k] / 1000
-    # qRoof[k] = (Tsolair2[k] - Troom[k]) * ht * areaRoof * (1 - fr) * 0.001163   #kWh
-    # qFloor[k] = (Tground - Troom[k]) * hs * areaHouse * 0.001163
-    # qSideWall[k] = (Tsolair2[k] - Troom[k]) * ht * areaSideWall * (1 - fr) * 0.001163
-    # qFrontBack[k] = (Tsolair2[k] - Troom[k]) * ht * areaFrontBack * (1 - fr) * 0.001163
-
-    qRad[k] = (fracSolarWindow * transGlass * areaHouse * radSolar[k]) / 1000  # [kWh]
-    qRoof[k] = (Tsolair2[k] - Troom[k]) / (rRoof) * areaHouse / 1000  # [kWh]
-    qFloor[k] = (Tground - Troom[k]) / (rFloor) * areaHouse / 1000  # [kWh]
-    qSideWall[k] = (Tsolair2[k] - Troom[k]) / (rSideWall) * surfaceHouse / 1000  # [kWh]
-    qVent[k] = ACH * (Toutdoor[k] - Troom[k]) * mHouse * cAir / 3600
-
-        # 온실에 유입, 유출되는 열 에너지 총합 양수가 나오면 열 획득, 음수가 나오면 열 손실
-        # qTotalHouse[k] = qRoof[k] + qFloor[k] + qSideWall[k] + qVent[k] + qFrontBack[k] + qRad[k] # kWh
-    qTotalHouse[k] = qRoof[k] + qFloor[k] + qSideWall[k] + qVent[k] + qRad[k] +qHeating[k] -qCooling[k]   # kWh
-
-    # 난방/냉방 부하 계산
-    if Troom[k] < Tset_heating:
-        # 난방 필요
-        qHeating[k] = ((Tset_heating - Troom[k]) * mHouse * cAir / 3600) + abs(qTotalHouse[k]) if qTotalHouse[k] < 0 else 0
-        qCooling[k] = 0
-        mode[k] = 1  # 난방 모드
-    elif Troom[k] > Tset_cooling:
-        # 냉방 필요
-        qCooling[k] = ((Troom[k] - Tset_cooling) * mHouse * cAir / 3600) + abs(qTotalHouse[k]) if qTotalHouse[k] > 0 else 0
-        qHeating[k] = 0
-        mode[k] = 2  # 냉방 모드
-    else:
-        # 난방/냉방 불필요
-        qHeating[k] = 0
-        qCooling[k] = 0
-        mode[k] = 0  # 중립 모드
+# Tsolair2 계산 (연간 배열 일괄 계산)
+Tsolair2 = calculate_Tsolair2(Toutdoor, radSolar, model='fixed', alpha_roof=alpha_roof)
+
+# 열 부하 계산 (실내온도 점화식과 난방/냉방 분기를 solve_troom으로 한 번에 해석, 해석은 W 단위)
+U_solair = areaHouse / rRoof + surfaceHouse / rSideWall  # Tsolair2 기준 열컨덕턴스 [W/K]
+U_ground = areaHouse / rFloor  # 지면 열컨덕턴스 [W/K]
+U_vent = ACH * mHouse * cAir * 1000 / 3600  # 환기 열컨덕턴스 [W/K]
+qRad = (fracSolarWindow * transGlass * areaHouse * radSolar) / 1000  # [kWh]
+Troom, qTotalHouse, qHeating, qCooling, mode = solve_troom(
+    U_solair * Tsolair2 + U_ground * Tground + U_vent * Toutdoor + qRad * 1000,
+    U_solair + U_ground + U_vent, mHouse * cAir * 1000,
+    Troom_initial, Tset_heating, Tset_cooling,
+    hvac_rule='load_following', hvac_gain=mHouse * cAir * 1000 / 3600)
+qTotalHouse, qHeating, qCooling = qTotalHouse / 1000, qHeating / 1000, qCooling / 1000  # [kWh]
+
+qRoof = (Tsolair2 - Troom) / (rRoof) * areaHouse / 1000  # [kWh]
+qFloor = (Tground - Troom) / (rFloor) * areaHouse / 1000  # [kWh]
+qSideWall = (Tsolair2 - Troom) / (rSideWall) * surfaceHouse / 1000  # [kWh]
+qVent = ACH * (Toutdoor - Troom) * mHouse * cAir / 3600
+
+from matplotlib import pyplot as plt  # 그래프를 그릴 때만 불러옴
 
 # 총 열부하 그래프 그리기
 plt.figure(figsize=(15, 6))
 
 # 시간 배열 생성
-time = range(len(hour))
+time = range(len(Toutdoor))
 
 # 열부하 데이터 플로팅 (단위: kW)
 plt.plot(time, qTotalHouse , 'b-', label='Total Heat Load', linewidth=1)
@@ -173,7 +103,7 @@ plt.show()
 plt.figure(figsize=(15, 6))
 
 # 시간 배열 생성
-time = range(len(hour))
+time = range(len(Toutdoor))
 
 # 열부하 데이터 플로팅 (단위: kW)
 plt.plot(time, qTotalHouse, 'gray', label='Total Heat Load', alpha=0.5, linewidth=1)
@@ -198,7 +128,7 @@ plt.show()
 plt.figure(figsize=(15, 6))
 
 # Create time array
-time = range(len(hour))
+time = range(len(Toutdoor))
 
 # Plot room temperature (convert from Kelvin to Celsius)
 plt.plot(time, Troom - 273.15, 'g-', label='Room Temperature', linewidth=1)
@@ -249,7 +179,7 @@ plt.show()
 plt.figure(figsize=(15, 6))
 
 # 시간 배열 생성
-time = range(len(hour))
+time = range(len(Toutdoor))
 
 # 온도 데이터 플로팅 (켈빈에서 섭씨로 변환)
 plt.plot(time, Tsolair2 - 273.15, 'r-', label='Equivalent Outdoor Temperature (Tsolair2)', linewidth=1)
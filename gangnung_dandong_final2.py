@@ -1,58 +1,29 @@
 from __future__ import print_function
-import openpyxl
-import math
-import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
-from CoolProp import AbstractState
-from CoolProp.CoolProp import PhaseSI, PropsSI, get_global_param_string
-import CoolProp.CoolProp as CoolProp
+from greenhouse.weather import load_tmy
+from greenhouse.solair import calculate_Tsolair2
+from greenhouse.properties import reference_properties
 
 # 기본 상수 정의
 P_atm = 101325  # [K]
 T_mean = 300  # [K]
-rhoAir = PropsSI("D", "T", T_mean, "P", P_atm, "air")  # 1.1769955883877592 [kg/m3]
-rhoWater = PropsSI("D", "T", T_mean, "P", P_atm, "water")  # 996.5569352652021 [kg/m3]
-cAir = PropsSI("C", "T", T_mean, "P", P_atm, "air") / 1000  # 1.0063739076641027 [kJ/kgK]
-cWater = PropsSI("C", "T", T_mean, "P", P_atm, "water") / 1000  # 4.1806357765560715 [kJ/kgK]
+rhoAir, rhoWater, cAir, cWater = reference_properties(T_mean, P_atm)  # [kg/m3], [kg/m3], [kJ/kgK], [kJ/kgK]
 pi = 3.14
 
-# 먼저 시간 배열 정의
-hour = np.ones(8760)
-
-# 그 다음 나머지 배열들 초기화
-Abs = np.ones(1470)
-wavelength = np.linspace(0.3, 15, 1470)
-Toutdoor = 300 * np.ones(len(hour))  # [K]
-Troom = 300 * np.ones(len(hour))
-Vwind = np.ones(8760)
-
-hconv = np.ones(8760)
-qTotalHouse = np.zeros(len(hour))  # [W]
-qInHouse = np.zeros(len(hour))  # [W]
-radSolar = np.zeros(len(hour))
-qRad = np.zeros(len(hour))
-qRoof = np.zeros(len(hour))  # [W]
-qFloor = np.zeros(len(hour))  # [W]
-qVent = np.zeros(len(hour))  # [W]
-qSideWall = np.zeros(len(hour))  # [W]
-qFrontBack = np.zeros(len(hour))
-qWindow = np.zeros(len(hour))  # 창문 열손실 [W]
-qHeating = np.zeros(len(hour))  # [W]
-qCooling = np.zeros(len(hour))  # [W]
-PW = np.zeros(len(hour))  # [W]
-mode = np.zeros(len(hour))  # [W]
-
-# 엑셀 파일 열기 (openpyxl 사용)
-wb = openpyxl.load_workbook('TMY3_Gangnung.xlsx')
-sheet = wb.active
-
-# 데이터를 엑셀 파일에서 읽어오기
-for i in range(0, len(hour)):
-    Toutdoor[i] = sheet.cell(row=i + 1, column=2).value  # 배열은 0부터, 엑셀은 1부터 시작
-    Vwind[i] = sheet.cell(row=i + 1, column=3).value
-    PW[i] = sheet.cell(row=i + 1, column=4).value
-    radSolar[i] = sheet.cell(row=i + 1, column=5).value
+# 기상데이터 읽기 (B~E열 일괄 로드, 두 번째 실행부터는 캐시 사용)
+Toutdoor, Vwind, PW, radSolar = load_tmy('TMY3_Gangnung.xlsx')
+
+# 시간별 배열 초기화
+Troom = 300 * np.ones(len(Toutdoor))
+qTotalHouse = np.zeros(len(Toutdoor))  # [W]
+qRad = np.zeros(len(Toutdoor))
+qRoof = np.zeros(len(Toutdoor))  # [W]
+qFloor = np.zeros(len(Toutdoor))  # [W]
+qVent = np.zeros(len(Toutdoor))  # [W]
+qSideWall = np.zeros(len(Toutdoor))  # [W]
+qHeating = np.zeros(len(Toutdoor))  # [W]
+qCooling = np.zeros(len(Toutdoor))  # [W]
+mode = np.zeros(len(Toutdoor))  # [W]
 
 # 온실 크기 및 기타 변수 설정
 lengthHouse = 70  # [m]
@@ -95,17 +66,11 @@ Tset_cooling = 30 + 273  # 냉방 설정 온도 (28°C)
 # Tsolair2 계산을 위한 변수 정의
 alpha_roof = 0.15  # 지붕 표면 일사흡수율 [-]
 
-def calculate_Tsolair2(k, Toutdoor, radSolar):
-    Tsolair2 = Toutdoor[k] + ((alpha_roof * radSolar[k]) / 17)  # 등가 외기온도 [K]
-    return Tsolair2
-
-# Tsolair2 계산
-Tsolair2 = np.zeros(len(hour))
-for k in range(len(hour)):
-    Tsolair2[k] = calculate_Tsolair2(k, Toutdoor, radSolar)
+# Tsolair2 계산 (연간 배열 일괄 계산)
+Tsolair2 = calculate_Tsolair2(Toutdoor, radSolar, model='fixed', alpha_roof=alpha_roof)
 
 # 열 부하 계산
-for k in range(len(hour)):
+for k in range(len(Toutdoor)):
     # 1. 먼저 현재 시간의 실내온도 계산 (k > 0일 때)
     if k > 0:
         dT = (qTotalHouse[k-1] ) / (mHouse * cAir )  # 온도 변화
@@ -150,6 +115,8 @@ for k in range(len(hour)):
 # 시간 배열 생성
 time = range(len(qRad))
 
+from matplotlib import pyplot as plt  # 그래프를 그릴 때만 불러옴
+
 # 1. Solar Radiation (qRad)
 plt.figure(figsize=(15, 5))
 plt.plot(time, qRad, 'r-', label='Solar Radiation', linewidth=1)
@@ -1,23 +1,15 @@
 ## 김제 스마트팜 혁신밸리 난방부하 계산
 
 from __future__ import print_function
-import xlrd
-import openpyxl
-import math
-import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
-from CoolProp import AbstractState
-from CoolProp.CoolProp import PhaseSI, PropsSI, get_global_param_string
-import CoolProp.CoolProp as CoolProp
+from greenhouse.weather import load_tmy
+from greenhouse.solair import calculate_Tsolair2
+from greenhouse.properties import reference_properties
 
 # 기본 물성치 정의
 P_atm = 101325  # 대기압 [Pa]
 T_mean = 300  # 평균 온도 [K]
-rhoAir = PropsSI("D", "T", T_mean, "P", P_atm, "air")  # 공기 밀도 [kg/m3]
-rhoWater = PropsSI("D", "T", T_mean, "P", P_atm, "water")  # 물 밀도 [kg/m3]
-cAir = PropsSI("C", "T", T_mean, "P", P_atm, "air") / 1000  # 공기 비열 [kJ/kgK]
-cWater = PropsSI("C", "T", T_mean, "P", P_atm, "water") / 1000  # 물 비열 [kJ/kgK]
+rhoAir, rhoWater, cAir, cWater = reference_properties(T_mean, P_atm)  # [kg/m3], [kg/m3], [kJ/kgK], [kJ/kgK]
 
 # 지붕 재료 물성치 정의 (유리로 변경)
 k_glass = 0.96  # 유리 열전도율 [W/mK]
@@ -45,48 +37,19 @@ epsilon = 0.9  # 지붕 표면 방사율 [-]
 sigma = 5.67e-8  # Stefan-Boltzmann 상수 [W/m2K4]
 
 pi = 3.14
-hour = np.ones(8760)  # 연간 시간 배열 [hr]
-Abs = np.ones(1470)  # 흡수율 배열 [-]
-wavelength = np.linspace(0.3, 15, 1470)  # 파장 범위 [μm]
-Toutdoor = 300 * np.ones(len(hour))  # 외기온도 배열 [K]
-Troom = 300 * np.ones(len(hour))  # 실내온도 배열 [K]
-Vwind = np.ones(8760)  # 풍속 배열 [m/s]
-
-# 열전달 관련 배열 초기화
-hconv = np.ones(8760)  # 대류 열전달계수 [W/m2K]
-qTotalHouse = np.zeros(len(hour))  # 총 열부하 [W]
-qInHouse = np.zeros(len(hour))  # 실내 발열 [W]
-radSolar = np.zeros(len(hour))  # 일사량 [W/m2]
-qRad = np.zeros(len(hour))  # 복사 열전달량 [W]
-qRoof = np.zeros(len(hour))  # 지붕 열전달량 [W]
-qFloor = np.zeros(len(hour))  # 바닥 열전달량 [W]
-qVent = np.zeros(len(hour))  # 환기 열전달량 [W]
-qSideWall = np.zeros(len(hour))  # 벽체 열전달량 [W]
-qHeating = np.zeros(len(hour))  # 난방 부하 [W]
-qCooling = np.zeros(len(hour))  # 냉방 부하 [W]
-PW = np.zeros(len(hour))  # 수증기분압 [Pa]
-mode = np.zeros(len(hour))  # 운전 모드 (0: 정지, 1: 난방, 2: 냉방)
-
-# Tsolair2 계산 함수
-def calculate_Tsolair2(k, Toutdoor, radSolar, Vwind):
-    """
-    등가 외기온도(sol-air temperature) 계산
-    """
-    h_out_corrected = 5.7 + 3.8 * Vwind[k]  # 풍속 보정된 열전달계수 [W/m2K]
-    dT_longwave = (epsilon * 63) / h_out_corrected  # 장파장 복사 보정항 [K]
-    Tsolair2 = Toutdoor[k] + (alpha_roof * radSolar[k]) / h_out_corrected - dT_longwave  # 등가 외기온도 [K]
-    return Tsolair2
-
-#엑셀 파일 열기 (openpyxl 사용)
-wb = openpyxl.load_workbook('TMY3_Gangnung.xlsx')
-sheet = wb.active
-
-# 데이터를 엑셀 파일에서 읽어오기
-for i in range(0, len(hour)):
-    Toutdoor[i] = sheet.cell(i + 1, 2).value
-    Vwind[i] = sheet.cell(i + 1, 3).value
-    PW[i] = sheet.cell(i + 1, 4).value
-    radSolar[i] = sheet.cell(i + 1, 5).value
+
+# 기상데이터 읽기 (B~E열 일괄 로드, 두 번째 실행부터는 캐시 사용)
+Toutdoor, Vwind, PW, radSolar = load_tmy('TMY3_Gangnung.xlsx')
+
+# 시간별 배열 초기화
+Troom = 300 * np.ones(len(Toutdoor))  # 실내온도 배열 [K]
+qRad = np.zeros(len(Toutdoor))  # 복사 열전달량 [W]
+qRoof = np.zeros(len(Toutdoor))  # 지붕 열전달량 [W]
+qFloor = np.zeros(len(Toutdoor))  # 바닥 열전달량 [W]
+qSideWall = np.zeros(len(Toutdoor))  # 벽체 열전달량 [W]
+qHeating = np.zeros(len(Toutdoor))  # 난방 부하 [W]
+qCooling = np.zeros(len(Toutdoor))  # 냉방 부하 [W]
+mode = np.zeros(len(Toutdoor))  # 운전 모드 (0: 정지, 1: 난방, 2: 냉방)
 
 # 건물 치수 정의
 lengthHouse = 70  # 건물 길이 [m]
@@ -115,13 +78,11 @@ transGlass = 0.8  # 유리 투과율 [-]
 dt = 3600  # 시간 간격 (1시간 = 3600초)
 cp_air = 1.005  # 공기의 비열 [kJ/kg·K]
 
-# Tsolair2 계산
-Tsolair2 = np.zeros(len(hour))
-for k in range(len(hour)):
-    Tsolair2[k] = calculate_Tsolair2(k, Toutdoor, radSolar, Vwind)
+# Tsolair2 계산 (연간 배열 일괄 계산)
+Tsolair2 = calculate_Tsolair2(Toutdoor, radSolar, Vwind, model='wind', alpha_roof=alpha_roof, epsilon=epsilon)
 
 # 열부하 계산
-for k in range(len(hour)):
+for k in range(len(Toutdoor)):
     qRad[k] = (fracSolarWindow * transGlass * areaHouse * radSolar[k]) / 1000  # 일사 열획득 [kWh]
     qRoof[k] = (Tsolair2[k] - Troom[k]) / (rRoof) * areaHouse / 1000  # 지붕 열전달 [kWh]
     qFloor[k] = (Tground - Troom[k]) / (rFloor) * areaHouse / 1000  # 바닥 열전달 [kWh]
@@ -131,13 +92,13 @@ for k in range(len(hour)):
 qTotalHouse = qRad + qRoof + qFloor + qSideWall  # 총 열부하 [kWh]
 
 # 실내온도 변화 계산
-for k in range(1, len(hour)):
+for k in range(1, len(Toutdoor)):
     # 이전 시간의 열부하로 현재 실내온도 계산
     dT = (qTotalHouse[k-1] * 1000) / (mHouse * cp_air)  # [K]
     Troom[k] = Troom[k-1] + dT
 
 # 난방/냉방 부하 계산
-for k in range(len(hour)):
+for k in range(len(Toutdoor)):
     if Troom[k] < Tset_heating:
         # 난방이 필요한 경우
         qHeating[k] = (Tset_heating - Troom[k]) * mHouse * cp_air / (dt * 1000)  # [kWh]
@@ -154,12 +115,14 @@ for k in range(len(hour)):
         qCooling[k] = 0
         mode[k] = 0  # 정지모드
 
+from matplotlib import pyplot as plt  # 그래프를 그릴 때만 불러옴
+
 # 그래프 생성
 plt.figure(figsize=(15, 15))
 
 # 1. 실내온도 변화 그래프
 plt.subplot(4, 1, 1)
-plt.plot(range(len(hour)), [t-273 for t in Troom], 'g-', label='Room Temperature')
+plt.plot(range(len(Toutdoor)), [t-273 for t in Troom], 'g-', label='Room Temperature')
 plt.axhline(y=Tset_heating-273, color='r', linestyle='--', label='Heating Setpoint')
 plt.axhline(y=Tset_cooling-273, color='b', linestyle='--', label='Cooling Setpoint')
 plt.title('Room Temperature Profile', fontsize=12, pad=10)
@@ -170,7 +133,7 @@ plt.legend()
 
 # 2. 총 열부하 그래프
 plt.subplot(4, 1, 2)
-plt.plot(range(len(hour)), qTotalHouse, 'b-', label='Total Heat Load')
+plt.plot(range(len(Toutdoor)), qTotalHouse, 'b-', label='Total Heat Load')
 plt.title('Total Heat Load Profile', fontsize=12, pad=10)
 plt.xlabel('Hour of Year')
 plt.ylabel('Heat Load (kWh)')
@@ -179,8 +142,8 @@ plt.legend()
 
 # 3. 난방/냉방 부하 그래프
 plt.subplot(4, 1, 3)
-plt.plot(range(len(hour)), qHeating, 'r-', label='Heating Load')
-plt.plot(range(len(hour)), qCooling, 'b-', label='Cooling Load')
+plt.plot(range(len(Toutdoor)), qHeating, 'r-', label='Heating Load')
+plt.plot(range(len(Toutdoor)), qCooling, 'b-', label='Cooling Load')
 plt.title('Heating and Cooling Load Profile', fontsize=12, pad=10)
 plt.xlabel('Hour of Year')
 plt.ylabel('Load (kWh)')
@@ -189,10 +152,10 @@ plt.legend()
 
 # 4. 구성요소별 열부하 그래프
 plt.subplot(4, 1, 4)
-plt.plot(range(len(hour)), qRoof, 'r-', label='Roof Load', alpha=0.7)
-plt.plot(range(len(hour)), qFloor, 'g-', label='Floor Load', alpha=0.7)
-plt.plot(range(len(hour)), qSideWall, 'b-', label='Wall Load', alpha=0.7)
-plt.plot(range(len(hour)), qRad, 'y-', label='Solar Load', alpha=0.7)
+plt.plot(range(len(Toutdoor)), qRoof, 'r-', label='Roof Load', alpha=0.7)
+plt.plot(range(len(Toutdoor)), qFloor, 'g-', label='Floor Load', alpha=0.7)
+plt.plot(range(len(Toutdoor)), qSideWall, 'b-', label='Wall Load', alpha=0.7)
+plt.plot(range(len(Toutdoor)), qRad, 'y-', label='Solar Load', alpha=0.7)
 plt.title('Component-wise Heat Load Profile', fontsize=12, pad=10)
 plt.xlabel('Hour of Year')
 plt.ylabel('Load (kWh)')
@@ -0,0 +1,69 @@
+## 강릉 단동 온실 열부하 계산 패키지
+
+from greenhouse.cache import ResultCache
+from greenhouse.design_day import DesignDayResult, design_day, validate_design_day
+from greenhouse.fleet import FleetResult, simulate_fleet
+from greenhouse.heat_balance import DEFAULT_PARAMS, build_heat_balance
+from greenhouse.incremental import IncrementalSimulation
+from greenhouse.model import GreenhouseModel, SimulationResult
+from greenhouse.optimize import OptimizeResult, optimize
+from greenhouse.profiling import Profiler, profiling
+from greenhouse.results import CHANNELS, ResultSet
+from greenhouse.render import render, render_sweep
+from greenhouse.sensitivity import SensitivityResult, sensitivity
+from greenhouse.server import SimulationServer, serve
+from greenhouse.sites import SiteTable, load_sites, run_sites
+from greenhouse.solair import SOLAIR_MODELS, Tsolair2_from_weather, calculate_Tsolair2
+from greenhouse.solver import Trajectory, solve_troom
+from greenhouse.store import open_result, save_result
+from greenhouse.stream import RunningSummary, repeat_weather, simulate_stream, split_weather
+from greenhouse.sweep import SweepResult, grid, sweep, sweep_series
+from greenhouse.weather import Weather, load_tmy, resample_weather, weather_hash
+
+__all__ = [
+    'ResultCache',
+    'DesignDayResult',
+    'design_day',
+    'validate_design_day',
+    'FleetResult',
+    'simulate_fleet',
+    'DEFAULT_PARAMS',
+    'build_heat_balance',
+    'IncrementalSimulation',
+    'GreenhouseModel',
+    'SimulationResult',
+    'OptimizeResult',
+    'optimize',
+    'Profiler',
+    'profiling',
+    'CHANNELS',
+    'ResultSet',
+    'render',
+    'render_sweep',
+    'SensitivityResult',
+    'sensitivity',
+    'SimulationServer',
+    'serve',
+    'SiteTable',
+    'load_sites',
+    'run_sites',
+    'SOLAIR_MODELS',
+    'Tsolair2_from_weather',
+    'calculate_Tsolair2',
+    'Trajectory',
+    'solve_troom',
+    'open_result',
+    'save_result',
+    'RunningSummary',
+    'repeat_weather',
+    'simulate_stream',
+    'split_weather',
+    'SweepResult',
+    'grid',
+    'sweep',
+    'sweep_series',
+    'Weather',
+    'load_tmy',
+    'resample_weather',
+    'weather_hash',
+]
@@ -0,0 +1,7 @@
+## python -m greenhouse : 설정 파일 일괄 실행 (greenhouse.cli)
+
+import sys
+
+from greenhouse.cli import main
+
+sys.exit(main())
@@ -0,0 +1,105 @@
+## 결과 분석 (월 x 시간대 집계)
+#
+# 8760시간 계열을 (365일, 24시간) 보기로 한 번 바꾼 뒤 실제 월별 일수로 묶는다.
+# 평균/합/최대는 reduceat으로 월 경계에서 한 번에 줄이고, 백분위수는 달마다
+# 길이가 다르므로 (12, 31, 24) 크기로 NaN을 채운 배열에서 한 번에 계산한다.
+# sub-hourly 계열 (8760의 배수 길이)은 먼저 시간 평균으로 줄인다.
+
+import numpy as np
+
+from greenhouse.profiling import stage
+
+HOURS_PER_DAY = 24
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)  # TMY 기준 (윤년 없음)
+N_DAYS = sum(DAYS_IN_MONTH)
+
+MONTH_START_DAY = np.cumsum((0,) + DAYS_IN_MONTH[:-1])  # 월별 시작 일 (0부터)
+MONTH_OF_DAY = np.repeat(np.arange(1, 13), DAYS_IN_MONTH)  # 일별 월 (1~12)
+
+STATS = ('mean', 'sum', 'max')
+
+# (12, 31) 월/일 -> 연중 일 인덱스, 없는 날짜는 마지막 날(N_DAYS) 자리로 보내 NaN을 읽는다
+_DAY_INDEX = np.where(np.arange(31) < np.array(DAYS_IN_MONTH)[:, None],
+                      MONTH_START_DAY[:, None] + np.arange(31), N_DAYS)
+
+
+def hourly_mean(data):
+    """
+    (..., 8760 * n) 스텝별 계열을 (..., 8760) 시간 평균으로 (n = 1이면 그대로)
+    """
+    data = np.asarray(data)
+    n_hours = N_DAYS * HOURS_PER_DAY
+    steps, rest = divmod(data.shape[-1], n_hours)
+    if rest or not steps:
+        raise ValueError(f"expected a multiple of {n_hours} values, got {data.shape[-1]}")
+    if steps == 1:
+        return data
+    return data.reshape(data.shape[:-1] + (n_hours, steps)).mean(axis=-1)
+
+
+def day_hour_view(data):
+    """
+    (..., 8760) 계열을 (..., 365, 24) 보기로 변환 (복사하지 않음)
+    """
+    data = np.asarray(data)
+    if data.shape[-1] != N_DAYS * HOURS_PER_DAY:
+        raise ValueError(f"expected {N_DAYS * HOURS_PER_DAY} hourly values, got {data.shape[-1]}")
+    return data.reshape(data.shape[:-1] + (N_DAYS, HOURS_PER_DAY))
+
+
+def month_hour_cube(data):
+    """
+    (..., 12, 31, 24) 월 x 일 x 시간 배열 (짧은 달의 빈 날짜는 NaN)
+    """
+    days = day_hour_view(np.asarray(data, dtype=float))
+    pad = np.full(days.shape[:-2] + (1, HOURS_PER_DAY), np.nan)
+    return np.concatenate([days, pad], axis=-2)[..., _DAY_INDEX, :]
+
+
+def monthly_hourly(data, stats=STATS, percentiles=()):
+    """
+    월 x 시간대 통계 (통계 이름 -> (..., 12, 24) 배열)
+
+    data        : (..., 8760) 시간별 계열 (여러 계열을 쌓아 한 번에 계산 가능, sub-hourly는 시간 평균)
+    stats       : 'mean', 'sum', 'max', 'min' 중 선택
+    percentiles : 백분위수 목록 (예: (50, 95) -> 'p50', 'p95')
+    """
+    with stage('aggregation'):
+        data = hourly_mean(data)
+        days = day_hour_view(np.asarray(data, dtype=float))
+        out = {}
+        total = None
+        for stat in stats:
+            if stat in ('sum', 'mean'):
+                if total is None:
+                    total = np.add.reduceat(days, MONTH_START_DAY, axis=-2)
+                out[stat] = total if stat == 'sum' else total / np.array(DAYS_IN_MONTH)[:, None]
+            elif stat == 'max':
+                out[stat] = np.maximum.reduceat(days, MONTH_START_DAY, axis=-2)
+            elif stat == 'min':
+                out[stat] = np.minimum.reduceat(days, MONTH_START_DAY, axis=-2)
+            else:
+                raise ValueError(f"unknown statistic {stat!r}, expected one of 'mean', 'sum', 'max', 'min'")
+        if len(percentiles):
+            # 일 축으로 정렬하면 NaN(빈 날짜)은 뒤로 가므로 달마다 앞쪽 일수만큼에서 선형 보간
+            # (np.percentile 기본 방식과 동일, np.nanpercentile보다 수십 배 빠름)
+            ordered = np.sort(month_hour_cube(data), axis=-2)
+            n_days = np.array(DAYS_IN_MONTH)[:, None, None]
+            for q in percentiles:
+                pos = (n_days - 1) * (q / 100)
+                lo = np.floor(pos).astype(np.intp)
+                hi = np.minimum(lo + 1, n_days - 1)
+                shape = ordered.shape[:-3] + (12, 1, HOURS_PER_DAY)
+                v_lo = np.take_along_axis(ordered, np.broadcast_to(lo, shape), axis=-2)
+                v_hi = np.take_along_axis(ordered, np.broadcast_to(hi, shape), axis=-2)
+                out[f'p{q:g}'] = (v_lo + (pos - lo) * (v_hi - v_lo))[..., 0, :]
+        return out
+
+
+def result_profiles(result, series=('qTotalHouse', 'qHeating', 'qCooling'), stats=STATS, percentiles=()):
+    """
+    SimulationResult 계열별 월 x 시간대 통계 (계열 이름 -> 통계 이름 -> (12, 24))
+    """
+    stacked = np.stack([getattr(result, name) for name in series])
+    out = monthly_hourly(stacked, stats, percentiles)
+    return {name: {stat: v[i] for stat, v in out.items()} for i, name in enumerate(series)}
@@ -0,0 +1,225 @@
+## 단계별 벤치마크 (합성 TMY 기상데이터 사용)
+#
+#   python -m greenhouse.benchmark -o bench.json
+#   python -m greenhouse.benchmark -o new.json --compare bench.json
+#
+# 모델 변형(greenhouse.variants)마다 일사 등가온도, 열수지 해석, 월 x 시간 집계,
+# 그래프 렌더링을 따로 재고, 엑셀 읽기/캐시 읽기는 한 번 잰다. --scripts를 주면
+# 원래 gangnung_dandong*.py 스크립트 전체 실행 시간도 잰다 (정적 스크립트 포함).
+# 결과는 JSON으로 저장하며 --compare로 이전 결과와 단계별 비율을 출력한다.
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from greenhouse.analysis import monthly_hourly
+from greenhouse.heat_balance import solve_heat_balance
+from greenhouse.solair import calculate_Tsolair2
+from greenhouse.solver import has_numba
+from greenhouse.variants import VARIANTS, variant_params
+from greenhouse.weather import N_HOURS, Weather, load_tmy, read_tmy_xlsx
+
+BENCHMARK_VERSION = 1
+REPEAT = 5
+TMY_FILENAME = 'TMY3_Gangnung.xlsx'  # 스크립트가 읽는 파일 이름
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def synthetic_weather(n_hours=N_HOURS, seed=0):
+    """
+    강릉 기후를 흉내 낸 합성 시간별 기상데이터 (연/일 주기 + 잡음)
+    """
+    h = np.arange(n_hours)
+    rng = np.random.default_rng(seed)
+    Toutdoor = (273.15 + 12 - 12 * np.cos(2 * np.pi * (h - 400) / 8760)
+                - 4 * np.cos(2 * np.pi * (h % 24 - 3) / 24) + rng.normal(0, 1.5, n_hours))
+    Vwind = np.abs(rng.normal(2.5, 1.2, n_hours))
+    PW = 1200 + 800 * np.sin(2 * np.pi * h / 8760)
+    radSolar = (np.clip(np.sin(np.pi * ((h % 24) - 6) / 12), 0, None)
+                * (500 + 300 * np.sin(2 * np.pi * (h - 2000) / 8760)))
+    return Weather(Toutdoor, Vwind, PW, radSolar)
+
+
+def write_tmy_xlsx(path, weather):
+    """
+    스크립트와 load_tmy가 읽는 배치(A=시간, B~E=기상값)로 엑셀 파일 작성
+    """
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for i, row in enumerate(np.stack(weather).T.tolist()):
+        ws.append([i + 1] + row)
+    wb.save(path)
+
+
+def _time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'min': min(times), 'median': statistics.median(times), 'repeat': repeat}
+
+
+def _render_all(result):
+    import io
+
+    from matplotlib import pyplot as plt
+
+    from greenhouse.plotting import FIGURES, make_figures
+
+    for name in FIGURES:
+        for _, fig in make_figures(result, name):
+            fig.savefig(io.BytesIO(), format='png')
+            plt.close(fig)
+
+
+def bench_variant(name, weather, repeat=REPEAT, plots=True):
+    """
+    모델 변형 하나의 단계별 시간 [s]
+    """
+    from greenhouse.model import GreenhouseModel
+
+    p = variant_params(name)
+    coeffs = {'alpha_roof': p['alpha_roof']}
+    if p['solair'] == 'wind':
+        coeffs['epsilon'] = p['epsilon']
+    solve_heat_balance(p, weather)  # numba 컴파일, 물성치 준비 등은 측정에서 제외
+    _, traj = solve_heat_balance(p, weather)
+    stacked = np.stack([traj.qTotalHouse, traj.qHeating, traj.qCooling])
+
+    stages = {
+        'solair': _time(lambda: calculate_Tsolair2(weather.Toutdoor, weather.radSolar, weather.Vwind,
+                                                   model=p['solair'], **coeffs), repeat),
+        'heat_balance': _time(lambda: solve_heat_balance(p, weather), repeat),
+        'aggregation': _time(lambda: monthly_hourly(stacked, percentiles=(50, 95)), repeat),
+    }
+    if plots:
+        import matplotlib
+
+        matplotlib.use('Agg')
+        result = GreenhouseModel(**VARIANTS[name]).simulate(weather)
+        stages['plotting'] = _time(lambda: _render_all(result), max(1, repeat // 5))
+    return stages
+
+
+def bench_load(tmy_path, repeat=REPEAT):
+    """
+    엑셀 직접 읽기와 .npy 캐시 읽기 시간 [s]
+    """
+    cache_dir = os.path.join(os.path.dirname(tmy_path), '.bench_cache')
+    load_tmy(tmy_path, cache_dir=cache_dir)  # 캐시 생성
+    return {
+        'excel_load': _time(lambda: read_tmy_xlsx(tmy_path), max(1, repeat // 2)),
+        'cache_load': _time(lambda: load_tmy(tmy_path, cache_dir=cache_dir), repeat),
+    }
+
+
+def bench_scripts(work_dir, pattern='gangnung_dandong*.py', timeout=1800):
+    """
+    원래 스크립트를 Agg 백엔드로 한 번씩 실행한 전체 시간 [s] (work_dir에 TMY 파일 필요)
+    """
+    env = dict(os.environ, MPLBACKEND='Agg',
+               PYTHONPATH=os.pathsep.join(filter(None, [REPO_DIR, os.environ.get('PYTHONPATH')])))
+    out = {}
+    for script in sorted(glob.glob(os.path.join(REPO_DIR, pattern))):
+        name = os.path.splitext(os.path.basename(script))[0]
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, script], cwd=work_dir, env=env, timeout=timeout,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode:
+            out[name] = {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed'}
+        else:
+            out[name] = {'wall': elapsed}
+    return out
+
+
+def run(variants=None, repeat=REPEAT, plots=True, scripts=False, seed=0):
+    """
+    전체 벤치마크 실행, JSON으로 저장할 dict 반환
+    """
+    weather = synthetic_weather(seed=seed)
+    report = {
+        'version': BENCHMARK_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'numba': has_numba(),
+        'machine': platform.machine(),
+        'n_hours': len(weather.Toutdoor),
+        'seed': seed,
+        'repeat': repeat,
+    }
+    with tempfile.TemporaryDirectory() as work_dir:
+        tmy_path = os.path.join(work_dir, TMY_FILENAME)
+        write_tmy_xlsx(tmy_path, weather)
+        report['load'] = bench_load(tmy_path, repeat)
+        report['variants'] = {name: bench_variant(name, weather, repeat, plots)
+                              for name in (variants or VARIANTS)}
+        if scripts:
+            report['scripts'] = bench_scripts(work_dir)
+    return report
+
+
+def _flatten(report):
+    # (구역, 이름, 단계) -> 시간 [s]
+    out = {}
+    for stage, t in report.get('load', {}).items():
+        out[('load', '', stage)] = t['min']
+    for name, stages in report.get('variants', {}).items():
+        for stage, t in stages.items():
+            out[('variant', name, stage)] = t['min']
+    for name, t in report.get('scripts', {}).items():
+        if 'wall' in t:
+            out[('script', name, 'wall')] = t['wall']
+    return out
+
+
+def compare(new, old):
+    """
+    단계별 (이전 [s], 현재 [s], 현재/이전) 목록
+    """
+    a, b = _flatten(old), _flatten(new)
+    return [(key, a[key], b[key], b[key] / a[key] if a[key] else float('nan')) for key in b if key in a]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='greenhouse 단계별 벤치마크')
+    parser.add_argument('-o', '--output', help='결과 JSON 파일')
+    parser.add_argument('--variant', action='append', choices=sorted(VARIANTS), help='측정할 모델 변형 (반복 가능)')
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--no-plots', action='store_true', help='그래프 렌더링 단계 제외')
+    parser.add_argument('--scripts', action='store_true', help='원래 스크립트 전체 실행 시간도 측정')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    args = parser.parse_args(argv)
+
+    report = run(args.variant, args.repeat, not args.no_plots, args.scripts)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+    for (section, name, stage), t in _flatten(report).items():
+        print(f"{section:8s} {name:28s} {stage:14s} {t * 1000:10.3f} ms")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            old = json.load(f)
+        print("\n=== 이전 결과 대비 (현재/이전) ===")
+        for (section, name, stage), t_old, t_new, ratio in compare(report, old):
+            flag = '  <-- slower' if ratio > 1.2 else ''
+            print(f"{section:8s} {name:28s} {stage:14s} {t_old * 1000:10.3f} -> {t_new * 1000:10.3f} ms  x{ratio:.2f}{flag}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
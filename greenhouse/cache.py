@@ -0,0 +1,215 @@
+## 내용 주소 결과 캐시 (설계 변수 + 기상데이터 해시 키, 크기 제한 LRU)
+#
+# 키는 전체 설계 변수 (모델 선택 CHOICE_PARAMS와 모든 계수, 설정온도, Troom_initial 등),
+# 기상데이터 내용 해시 (greenhouse.weather.weather_hash), 저장 채널/dtype의 sha1이다.
+# 숫자는 float로 맞춘 뒤 해시하므로 291과 291.0, np.float64(291)은 같은 키가 된다.
+#
+# 연간 계산 결과는 greenhouse.store 저장소 형식 (<키>/ 디렉터리, 채널별 .npy)으로,
+# 스윕은 시나리오 하나씩 <키>.json (연간 집계)으로 저장한다. 그래서 일부가 겹치는
+# 스윕은 캐시에 없는 시나리오만 계산한다. 항목은 임시 이름으로 다 쓴 뒤 이름을 바꿔
+# 넣으므로 동시에 실행해도 반쯤 쓴 항목이 보이지 않는다.
+#
+# 마지막 사용 시각은 항목의 수정시각으로 기록하고 (적중할 때마다 갱신), 전체 크기가
+# max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 지운다.
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from greenhouse.heat_balance import DEFAULT_PARAMS
+from greenhouse.results import check_channels
+from greenhouse.store import META_FILE, open_result, save_result
+from greenhouse.sweep import CHUNK_SIZE, SweepResult, as_table, sweep
+from greenhouse.weather import weather_hash
+
+CACHE_VERSION = 1
+CACHE_DIRNAME = '.result_cache'
+MAX_BYTES = 2 ** 30  # 기본 크기 제한 1 GiB
+SWEEP_FIELDS = SweepResult._fields[1:]
+
+
+def _normalize(value):
+    # 해시용 값 (숫자는 float, numpy 스칼라는 파이썬 값)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def result_key(params, weather, kind='simulation', **extra):
+    """
+    설계 변수 (DEFAULT_PARAMS와 합친 전체), 기상데이터 내용, 결과 종류로 정한 캐시 키 (sha1)
+
+    weather : 기상데이터 또는 미리 계산한 weather_hash 문자열
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(params)
+    content = {
+        'version': CACHE_VERSION,
+        'kind': kind,
+        'params': {name: _normalize(value) for name, value in sorted(p.items())},
+        'weather': weather if isinstance(weather, str) else weather_hash(weather),
+        **{name: _normalize(value) for name, value in extra.items()},
+    }
+    return hashlib.sha1(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _entry_size(path):
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    return os.path.getsize(path)
+
+
+class ResultCache:
+    """
+    디스크 결과 캐시
+
+    cache = ResultCache()  # 현재 디렉터리의 .result_cache, 1 GiB
+    result = cache.simulate(GreenhouseModel(fr=0.4), weather)  # 두 번째부터는 디스크에서 바로
+    table = cache.sweep(grid(fr=[0.2, 0.3, 0.4]), weather)  # 이미 계산한 시나리오는 건너뜀
+    """
+
+    def __init__(self, path=None, max_bytes=MAX_BYTES):
+        self.path = os.path.abspath(CACHE_DIRNAME if path is None else path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.path!r}, max_bytes={self.max_bytes})"
+
+    def _entries(self):
+        # (마지막 사용 시각, 크기, 경로) 목록 (임시 항목 제외)
+        entries = []
+        for entry in os.scandir(self.path):
+            if '.tmp' in entry.name:
+                continue
+            try:
+                used = os.stat(os.path.join(entry.path, META_FILE) if entry.is_dir() else entry.path).st_mtime
+                entries.append((used, _entry_size(entry.path), entry.path))
+            except OSError:  # 다른 프로세스가 지우는 중
+                continue
+        return entries
+
+    def __len__(self):
+        return len(self._entries())
+
+    @property
+    def nbytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def evict(self, max_bytes=None):
+        """
+        전체 크기가 max_bytes 이하가 될 때까지 가장 오래 쓰지 않은 항목 삭제 (삭제한 항목 수 반환)
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        return self.evict(0)
+
+    def simulate(self, model, weather, method='auto', channels=None, dtype=np.float64):
+        """
+        GreenhouseModel.simulate와 같지만 같은 키의 결과가 있으면 저장소를 메모리 맵으로 열어 반환
+        """
+        from greenhouse.model import GreenhouseModel
+
+        if not isinstance(model, GreenhouseModel):
+            model = GreenhouseModel(**model)
+        key = result_key(model.params, weather, 'simulation', channels=list(check_channels(channels)),
+                         dtype=np.dtype(dtype).str)
+        entry = os.path.join(self.path, key)
+        if os.path.exists(os.path.join(entry, META_FILE)):
+            try:
+                result = open_result(entry, channels=channels)
+            except (OSError, ValueError, KeyError):  # 지워지는 중이거나 깨진 항목은 다시 계산
+                pass
+            else:
+                self._touch(os.path.join(entry, META_FILE))
+                self.hits += 1
+                return result
+        self.misses += 1
+        result = model.simulate(weather, method=method, channels=channels, dtype=dtype)
+        tmp = f"{entry}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+        save_result(result, tmp, weather)
+        if os.path.isdir(entry):  # meta.json이 없는 미완성 항목
+            shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.replace(tmp, entry)
+        except OSError:  # 다른 프로세스가 먼저 넣음
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+        return result
+
+    def sweep(self, scenarios, weather, base=None, chunk_size=CHUNK_SIZE, method='auto'):
+        """
+        greenhouse.sweep.sweep과 같지만 시나리오별로 캐시를 찾고 없는 시나리오만 계산
+        """
+        table = as_table(scenarios)
+        n = len(next(iter(table.values()))) if table else 1
+        params = dict(DEFAULT_PARAMS)
+        params.update(base or {})
+        digest = weather_hash(weather)
+        keys = []
+        for i in range(n):
+            p = dict(params)
+            p.update({name: values[i] for name, values in table.items()})
+            keys.append(result_key(p, digest, 'sweep'))
+
+        out = {name: np.empty(n, dtype=np.int64 if name.endswith('_hour') else float) for name in SWEEP_FIELDS}
+        missing = []
+        for i, key in enumerate(keys):
+            entry = os.path.join(self.path, f'{key}.json')
+            try:
+                with open(entry, encoding='utf-8') as f:
+                    row = json.load(f)
+            except (OSError, ValueError):
+                missing.append(i)
+                continue
+            self._touch(entry)
+            for name in SWEEP_FIELDS:
+                out[name][i] = row[name]
+        self.hits += n - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            computed = sweep({name: values[missing] for name, values in table.items()}, weather, base=base,
+                             chunk_size=chunk_size, method=method)
+            for j, i in enumerate(missing):
+                row = {name: getattr(computed, name)[j].item() for name in SWEEP_FIELDS}
+                for name, value in row.items():
+                    out[name][i] = value
+                entry = os.path.join(self.path, f'{keys[i]}.json')
+                tmp = f"{entry}.{os.getpid()}.tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(row, f)
+                os.replace(tmp, entry)
+            self.evict()
+        return SweepResult(params=table, **out)
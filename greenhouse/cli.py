@@ -0,0 +1,240 @@
+## 설정 파일 기반 일괄 실행 (스크립트 사본 대신 TOML/YAML 실행 설정)
+#
+#   python -m greenhouse 'configs/*.toml' -o runs --workers 8
+#
+# 설정 파일 하나가 실행 하나이며, 스크립트별 상수/수식 선택은 variant (greenhouse.variants,
+# 정적 스크립트 gangnung_dandong4.py, 5.py, _v1.py, _v2.py 포함 9개)와 params로 표현한다.
+#
+#   name = "final2-fr04"                  # 결과 디렉터리 이름 (기본: 파일 이름)
+#   variant = "gangnung_dandong_final2"   # 기본 gangnung_dandong5_test
+#   weather = "TMY3_Gangnung.xlsx"        # 설정 파일 기준 상대 경로
+#   figures = true                        # true (전체), false, 또는 그래프 이름 목록 (greenhouse.plotting.FIGURES)
+#   store = false                         # 시간별 결과 저장소 (greenhouse.store) 기록 여부
+#   [params]
+#   fr = 0.4
+#   [sweep]                               # 값 목록의 모든 조합 (greenhouse.sweep.grid)
+#   Tset_heating = [288, 291, 293]
+#
+# 결과는 <출력>/<name>/ 아래에 config.json (최종 변수), summary.json, summary.txt,
+# sweep.csv, figures/, result/ 로 저장하고, 전체 실행 목록은 <출력>/index.csv에 남긴다.
+# 설정들은 프로세스 풀에서 동시에 실행하며, 한 설정의 오류 (설정 파일을 읽지 못한 경우 포함)는
+# index.csv에 기록하고 나머지 실행은 계속한다.
+
+import argparse
+import csv
+import glob
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+CONFIG_KEYS = ('name', 'variant', 'weather', 'params', 'sweep', 'figures', 'formats', 'store')
+DEFAULT_VARIANT = 'gangnung_dandong5_test'
+DEFAULT_WEATHER = 'TMY3_Gangnung.xlsx'
+DEFAULT_OUTPUT = 'runs'
+INDEX_FILE = 'index.csv'
+INDEX_METRICS = ('annual_heating', 'annual_cooling', 'peak_heating', 'peak_heating_hour', 'Troom_min')
+
+
+def load_config(path):
+    """
+    TOML (.toml) 또는 YAML (.yaml, .yml) 실행 설정을 dict로 읽고 검증
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.toml':
+        try:
+            import tomllib
+        except ImportError:  # Python 3.10 이하
+            import tomli as tomllib
+        with open(path, 'rb') as f:
+            config = tomllib.load(f)
+    elif ext in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError(f"{path}: YAML configs require the PyYAML package") from None
+        with open(path, encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    else:
+        raise ValueError(f"{path}: unsupported config format {ext!r}, expected .toml, .yaml or .yml")
+    if not isinstance(config, dict):
+        raise ValueError(f"{path}: config must be a mapping")
+    unknown = sorted(set(config) - set(CONFIG_KEYS))
+    if unknown:
+        raise ValueError(f"{path}: unknown config key(s) {', '.join(map(repr, unknown))}, "
+                         f"expected some of {list(CONFIG_KEYS)}")
+    figures = config.get('figures', True)
+    if not isinstance(figures, bool):
+        from greenhouse.plotting import FIGURES
+
+        if not isinstance(figures, list):
+            raise ValueError(f"{path}: figures must be true, false or a list of figure names")
+        unknown = [name for name in figures if name not in FIGURES]
+        if unknown:
+            raise ValueError(f"{path}: unknown figure(s) {', '.join(map(repr, unknown))}, "
+                             f"expected some of {list(FIGURES)}")
+    config.setdefault('name', os.path.splitext(os.path.basename(path))[0])
+    config.setdefault('variant', DEFAULT_VARIANT)
+    weather = config.get('weather', DEFAULT_WEATHER)
+    config['weather'] = os.path.join(os.path.dirname(os.path.abspath(path)), weather)
+    return config
+
+
+def config_files(patterns):
+    """
+    경로/glob 패턴 목록을 설정 파일 목록으로 (입력 순서, 중복 제거)
+    """
+    if isinstance(patterns, (str, os.PathLike)):
+        patterns = [patterns]
+    files = []
+    for pattern in map(os.fspath, patterns):
+        matches = sorted(glob.glob(pattern, recursive=True))
+        if not matches:
+            raise FileNotFoundError(f"no config files match {pattern!r}")
+        files.extend(matches)
+    return list(dict.fromkeys(files))
+
+
+def run_config(path, out_dir, figures=True, cache_dir=None):
+    """
+    설정 하나를 실행하고 <out_dir>/<name>/ 에 결과를 기록 (index.csv 행 dict 반환)
+    """
+    from greenhouse.model import GreenhouseModel
+    from greenhouse.variants import variant_params
+    from greenhouse.weather import load_tmy
+
+    config = load_config(path)
+    params = variant_params(config['variant'])
+    params.update(config.get('params') or {})
+    model = GreenhouseModel(**params)
+    weather = load_tmy(config['weather'])
+    run_dir = os.path.join(out_dir, config['name'])
+    os.makedirs(run_dir, exist_ok=True)
+
+    if cache_dir is None:
+        result = model.simulate(weather)
+    else:
+        from greenhouse.cache import ResultCache
+
+        result = ResultCache(cache_dir).simulate(model, weather)
+    summary = result.summary()
+    with open(os.path.join(run_dir, 'config.json'), 'w', encoding='utf-8') as f:
+        json.dump({'config': os.path.abspath(path), 'variant': config['variant'], 'weather': config['weather'],
+                   'params': model.params, 'sweep': config.get('sweep')}, f, ensure_ascii=False, indent=1)
+    with open(os.path.join(run_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=1)
+    text = io.StringIO()
+    result.print_summary(file=text)
+    with open(os.path.join(run_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+        f.write(text.getvalue())
+
+    if config.get('sweep'):
+        from greenhouse.sweep import grid, sweep
+
+        table = sweep(grid(**config['sweep']), weather, base=model.params)
+        rows = table.rows()
+        with open(os.path.join(run_dir, 'sweep.csv'), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    if config.get('store'):
+        result.save(os.path.join(run_dir, 'result'), weather)
+    selected = config.get('figures', True) if figures else False
+    if selected:
+        from greenhouse.render import render
+
+        render({'figures': result}, run_dir, figures=None if selected is True else selected,
+               formats=config.get('formats', ('png',)), max_workers=0)
+    return {'name': config['name'], **{name: summary[name] for name in INDEX_METRICS}}
+
+
+def _run_job(job):
+    # 작업자: 오류도 결과 행으로 돌려줌 (다른 설정 실행은 계속)
+    path, out_dir, figures, cache_dir = job
+    start = time.perf_counter()
+    try:
+        row = run_config(path, out_dir, figures, cache_dir)
+        row['status'] = 'ok'
+        row['error'] = ''
+    except Exception as e:
+        traceback.print_exc(file=sys.stderr)
+        return _error_row(path, e, time.perf_counter() - start)
+    row['config'] = path
+    row['elapsed'] = time.perf_counter() - start
+    return row
+
+
+def _error_row(path, error, elapsed=0.0):
+    return {'name': os.path.splitext(os.path.basename(path))[0], 'status': 'error',
+            'error': f"{type(error).__name__}: {error}", 'config': path, 'elapsed': elapsed}
+
+
+def run_batch(patterns, out_dir=DEFAULT_OUTPUT, max_workers=None, figures=True, cache_dir=None, progress=None):
+    """
+    설정 파일들을 동시에 실행하고 <out_dir>/index.csv 기록 (설정 순서의 결과 행 목록 반환)
+
+    max_workers : 프로세스 수 (0이면 현재 프로세스에서 순서대로 실행)
+    progress    : 실행이 끝날 때마다 결과 행으로 호출할 함수
+    """
+    files = config_files(patterns)
+    names = {}
+    rows = {}  # 설정 경로 -> 결과 행 (읽지 못한 설정은 실행하지 않고 오류 행)
+    for path in files:
+        try:
+            name = load_config(path)['name']
+        except Exception as e:
+            rows[path] = _error_row(path, e)
+            continue
+        if name in names:
+            raise ValueError(f"configs {names[name]!r} and {path!r} both write to run name {name!r}")
+        names[name] = path
+    os.makedirs(out_dir, exist_ok=True)
+    if progress:
+        for row in rows.values():
+            progress(row)
+    jobs = [(path, out_dir, figures, cache_dir) for path in files if path not in rows]
+    if max_workers == 0:
+        for job in jobs:
+            rows[job[0]] = _run_job(job)
+            if progress:
+                progress(rows[job[0]])
+    else:
+        with ProcessPoolExecutor(max_workers) as pool:
+            futures = {pool.submit(_run_job, job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                rows[futures[future]] = future.result()
+                if progress:
+                    progress(rows[futures[future]])
+    rows = [rows[path] for path in files]
+    with open(os.path.join(out_dir, INDEX_FILE), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['name', 'config', 'status', 'elapsed', *INDEX_METRICS, 'error'],
+                                restval='')
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m greenhouse', description='greenhouse 설정 파일 일괄 실행')
+    parser.add_argument('configs', nargs='+', help='설정 파일 또는 glob 패턴 (.toml, .yaml, .yml)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help='결과 디렉터리')
+    parser.add_argument('--workers', type=int, help='동시 실행 프로세스 수 (0이면 순서대로)')
+    parser.add_argument('--no-figures', action='store_true', help='그래프 저장 생략')
+    parser.add_argument('--cache', help='결과 캐시 디렉터리 (greenhouse.cache)')
+    args = parser.parse_args(argv)
+
+    def report(row):
+        status = 'ok' if row['status'] == 'ok' else f"ERROR {row['error']}"
+        print(f"{row['name']:32s} {row['elapsed']:8.2f} s  {status}", flush=True)
+
+    rows = run_batch(args.configs, args.output, args.workers, not args.no_figures, args.cache, progress=report)
+    failed = sum(row['status'] != 'ok' for row in rows)
+    print(f"{len(rows) - failed}/{len(rows)} runs succeeded, index: {os.path.join(args.output, INDEX_FILE)}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
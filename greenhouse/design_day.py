@@ -0,0 +1,261 @@
+## 설계일 (최대 난방부하) 빠른 계산
+#
+# 연간 계산 없이 난방부하가 클 것으로 보이는 구간 몇 개와 연초 구간만 계산해서
+# 최대 난방부하와 발생 시간을 구한다.
+#
+# - 연초 구간: 0시부터 실제 Troom_initial로 예열 구간 길이만큼 계산한다. 초기값이
+#   설정온도보다 낮으면 첫 시간에 최대 부하가 나오므로 항상 포함한다.
+# - 구간 선택: 시간별 난방부하를 추정해서 (heating_estimate) 추정 부하가 큰 시점을 중심으로
+#   겹치지 않는 구간을 고른다. 되먹임이 없는 실내온도를 스텝 점화식으로 계산하고, 되먹임이
+#   있으면 난방 중 실내온도를 hvac_rule에 따라 설정온도 근처에 묶어 두고 같은 부하식을 쓴다.
+# - 예열 구간: 구간 앞에 붙여 추정 실내온도에서 시작하며, 초기값 오차가 사라질 만큼
+#   길어야 하므로 가장 느린 운전 모드의 시정수 (time_constant)의 LEAD_TIME_CONSTANTS 배로 잡는다.
+#   겹치는 구간은 하나로 합친다.
+#
+# 부하 추정의 시간별 실내온도 점화식도 예열 구간 길이보다 오래된 항은 버린다 (같은 e^-10 배
+# 기준). 고른 구간은 보간한 기상데이터를 시나리오 축으로 쌓아 한 번에 계산한다.
+# 부하 추정은 매시 실내온도 점화식 (연간 시간별 계산 한 번)과 난방 가능 시간의 스텝별 부하
+# 계산이라 시간별 스텝에서는 연간 계산과 비슷하게 걸리고 스텝이 짧을수록 이득이 크다 (1분
+# 스텝은 연간 계산의 10% 안팎, 연간 계산이 빠른 numba 되먹임 계산은 25% 정도).
+# 계산할 시간이 연간의 MAX_FRACTION을 넘으면 (스크립트의 dt = 1초처럼 시정수가 수백 시간인 경우, 되먹임이 있는
+# absolute 규칙처럼 초기값 오차가 줄지 않는 경우) 구간 계산 없이 연간 계산을 그대로 한다.
+# 실내온도를 고정하는 정적 계산 (room='fixed', 'open_loop')도 연간 계산을 한다.
+# 구간 계산 결과는 예열 끝의 실내온도 오차만큼 연간 계산과 다를 수 있고, 추정 부하 순위가
+# 실제와 다르면 최대 부하 구간을 놓칠 수 있다 (validate_design_day로 확인).
+
+import math
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from greenhouse.heat_balance import DEFAULT_PARAMS, build_heat_balance, hvac_gain, solve_heat_balance, step_seconds
+from greenhouse.solver import HVAC_RULES, _hvac_loads, linear_recurrence
+from greenhouse.weather import Weather, resample_weather, steps_per_hour
+
+N_WINDOWS = 3  # 계산할 구간 수 (연초 구간 제외)
+WINDOW_HOURS = 24  # 구간 길이 [hr]
+MIN_LEAD_HOURS = 24  # 최소 예열 구간 [hr]
+LEAD_TIME_CONSTANTS = 10  # 예열 구간 = 시정수 x 10 (초기값 오차 e^-10 배로 감소)
+MAX_FRACTION = 0.5  # 구간 계산량이 연간 대비 이보다 크면 연간 계산
+
+
+class DesignDayResult(NamedTuple):
+    """
+    설계일 계산 결과 (최대 부하 [kW], 발생 시간은 연중 시간 인덱스 0부터)
+    """
+    peak_heating: float
+    peak_heating_hour: int
+    windows: list  # 계산한 (시작 시간, 예열 끝 시간, 끝 시간) 목록
+    n_hours: int  # 계산한 시간 수 (예열 포함)
+    fraction: float  # 연간 시간 수 대비 계산량
+
+
+def critical_windows(load, n_windows=N_WINDOWS, window=WINDOW_HOURS, smooth=1):
+    """
+    load (시간별 추정 난방부하)의 smooth 개 이동평균이 가장 큰 시점을 중심으로 한
+    서로 겹치지 않는 길이 window 구간의 시작 인덱스 목록
+    """
+    load = np.asarray(load, dtype=float)
+    window = min(window, len(load))
+    smooth = max(1, min(int(smooth), len(load)))
+    csum = np.concatenate([[0.0], np.cumsum(load)])
+    score = np.full(len(load), np.nan)
+    score[smooth - 1:] = (csum[smooth:] - csum[:-smooth]) / smooth  # score[i] = load[i - smooth + 1:i + 1] 평균
+    starts = []
+    for _ in range(n_windows):
+        if not np.isfinite(score).any():
+            break
+        i = int(np.nanargmax(score))
+        start = min(max(0, i - smooth // 2 - window // 2), len(load) - window)
+        starts.append(start)
+        score[max(0, start - window // 2):start + window + window // 2] = np.nan  # 겹치는 구간 제외
+    return sorted(starts)
+
+
+def _mode_conductances(p, G, K):
+    # 운전 모드별 점화식 실효 컨덕턴스 (greenhouse.solver.feedback_conductance)
+    if not p['feedback']:
+        return (G,)
+    rule = HVAC_RULES[p['hvac_rule']]
+    if rule == 0:
+        return G, G + K
+    if rule == 1:
+        return G, K
+    return G, 0.0, 2 * G
+
+
+def time_constant(params, hb):
+    """
+    실내온도 초기값 오차가 1/e로 줄어드는 시간 [hr] (운전 모드 중 가장 느린 값)
+
+    되먹임이 없으면 C / (G dt) 스텝, 있으면 hvac_rule에 따라 난방 중 컨덕턴스가 G + K
+    (setpoint), K (load_following), 0 (absolute)로 바뀐다. dt = 1초이면 수백 시간이다.
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(params)
+    C = float(np.max(hb.C))
+    s = step_seconds(p) / C
+    G = float(np.min(hb.G))
+    K = float(np.min(hvac_gain(p, hb.C)))
+    if p['integrator'] == 'exponential':
+        decay = max(math.exp(-B * s) for B in _mode_conductances(p, G, K))
+    else:
+        decay = max(abs(1 - B * s) for B in _mode_conductances(p, G, K))
+    if decay >= 1:
+        return math.inf
+    if decay == 0:
+        return 0.0
+    return -1 / math.log(decay) / steps_per_hour(p['timestep'])
+
+
+def heating_estimate(params, hb, memory=None):
+    """
+    구간 선택용 시간별 난방부하 추정 [W]와 매시 시작 실내온도 추정 [K]
+
+    hb     : 시간별 기상데이터의 HeatBalance
+    memory : 실내온도 추정에 남기는 과거 시간 수 [hr] (None이면 0시부터 전부,
+             greenhouse.solver.linear_recurrence)
+    되먹임이 없는 실내온도를 스텝 점화식 (보간 기상데이터처럼 매시 사이 이득은 직선)으로
+    매시 시작 값만 prefix scan으로 구하고 (0시 값 Troom_initial), 난방 가능성이 있는 시간만
+    스텝별로 진행하며 hvac_rule 부하의 시간별 최댓값을 구한다. 되먹임이 있으면 난방 중
+    실내온도를 설정온도 (setpoint 규칙은 정상상태 (S + K Th) / (G + K))로 놓는다.
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(params)
+    rule = HVAC_RULES[p['hvac_rule']]
+    steps = steps_per_hour(p['timestep'])
+    Th, Tc = p['Tset_heating'], p['Tset_cooling']
+    S = np.asarray(hb.S, dtype=float)
+    Gs = hb.G * step_seconds(p) / hb.C
+    decay = np.exp(-Gs) if p['integrator'] == 'exponential' else 1 - Gs  # 스텝당 감쇠 (스칼라 또는 시간별)
+    # 매시 안의 스텝 j (평형온도 T_eq[h] + j / steps * dT_eq)가 다음 매시 값에 주는 가중치
+    d = decay[:-1, None] if np.ndim(decay) else decay
+    w = (1 - d) * d ** (steps - 1 - np.arange(steps))
+    T_eq = S / hb.G
+    b = w.sum(axis=-1) * T_eq[:-1] + (w @ (np.arange(steps) / steps)) * np.diff(T_eq)
+    T = linear_recurrence((decay[:-1] if np.ndim(decay) else decay) ** steps, b, p['Troom_initial'], memory)
+
+    # 난방 가능성이 있는 시간 (매시 양 끝 중 하나가 난방 설정온도 아래)만 스텝별로 계산
+    hours = np.flatnonzero(np.minimum(T, np.append(T[1:], T[-1])) < Th)
+    G, K, decay = (np.broadcast_to(v, S.shape)[hours] for v in (hb.G, hvac_gain(p, hb.C), decay))
+    Tk, Sk, dS = T[hours], S[hours], np.diff(S, append=S[-1])[hours] / steps
+    gain = (1 - decay) / G
+    no_cooling = np.zeros(len(hours), dtype=bool)
+    peak = np.zeros(len(hours))
+    for k in range(steps):
+        if k:
+            Tk = decay * Tk + gain * Sk
+            Sk = Sk + dS
+        heating = Tk < Th
+        Tr = Tk
+        if p['feedback']:
+            Tr = np.where(heating, (Sk + K * Th) / (G + K) if rule == 0 else Th, Tk)
+        qHeating, _ = _hvac_loads(heating, no_cooling, Tr, Sk - G * Tr, Th, Tc, K, rule)
+        np.maximum(peak, qHeating, out=peak)
+    load = np.zeros(len(S))
+    load[hours] = peak
+    if p['feedback']:
+        T = np.clip(T, Th, Tc)  # 온도 조절 범위 안에 머묾
+    return load, T
+
+
+def _merge(windows):
+    # 겹치거나 맞닿은 (시작, 예열 끝, 끝) 구간을 합침 (앞 구간부터 이어서 계산하면 예열이 필요 없음)
+    merged = []
+    for begin, start, stop in sorted(windows):
+        if merged and begin <= merged[-1][2]:
+            prev = merged[-1]
+            merged[-1] = (prev[0], min(prev[1], start), max(prev[2], stop))
+        else:
+            merged.append((begin, start, stop))
+    return merged
+
+
+def _full_run(model, weather, method):
+    # 구간 계산이 연간 계산보다 크게 싸지 않을 때: 난방부하만 저장하는 연간 계산
+    result = model.simulate(weather, method=method, channels=('qHeating',))
+    k = int(np.argmax(result.qHeating))
+    n_hours = len(weather.Toutdoor)
+    return DesignDayResult(float(result.qHeating[k] / 1000), k // result.steps_per_hour, [(0, 0, n_hours)], n_hours, 1.0)
+
+
+def design_day(params, weather, n_windows=N_WINDOWS, window_hours=WINDOW_HOURS, lead_hours=None, method='auto'):
+    """
+    연초 구간과 난방부하가 큰 구간만 계산한 최대 난방부하
+
+    params     : 설계 변수 (스칼라 값) 또는 GreenhouseModel
+    weather    : 시간별 greenhouse.weather.Weather
+    lead_hours : 예열 구간 [hr] (None이면 시정수로 자동 결정)
+    """
+    from greenhouse.model import GreenhouseModel
+
+    model = params if isinstance(params, GreenhouseModel) else GreenhouseModel(**params)
+    p = model.params
+    steps = steps_per_hour(p['timestep'])
+    n_hours = len(weather.Toutdoor)
+    if p['room'] != 'dynamic':
+        return _full_run(model, weather, method)
+    if lead_hours is None:
+        # G, C는 기상데이터와 무관하므로 한 시간만으로 시정수 계산
+        hb = build_heat_balance(p, *(np.asarray(v)[:1] for v in (weather.Toutdoor, weather.radSolar, weather.Vwind)))
+        tau = time_constant(p, hb)
+        lead_hours = max(MIN_LEAD_HOURS, math.ceil(LEAD_TIME_CONSTANTS * tau)) if math.isfinite(tau) else n_hours
+    lead_hours = min(lead_hours, n_hours)
+    if (n_windows + 1) * lead_hours + n_windows * window_hours > MAX_FRACTION * n_hours:
+        return _full_run(model, weather, method)
+
+    hb = build_heat_balance(p, weather.Toutdoor, weather.radSolar, weather.Vwind)  # 시간별 (구간 선택용)
+    load, T_est = heating_estimate(p, hb, memory=lead_hours)
+    windows = [(0, 0, lead_hours)]
+    for start in critical_windows(load, n_windows, window_hours):
+        windows.append((max(0, start - lead_hours), start, min(n_hours, start + window_hours)))
+    windows = _merge(windows)
+
+    # 구간별 기상데이터를 가장 긴 구간 길이로 늘려 (마지막 값 유지) 시나리오 축으로 쌓음
+    length = max(stop - begin for begin, _, stop in windows) * steps
+    segments = Weather(*(np.empty((len(windows), length)) for _ in weather))
+    for i, (begin, start, stop) in enumerate(windows):
+        # 다음 한 시간까지 잘라 보간해야 연간 보간 계열과 같은 값이 된다
+        hourly = Weather(*(np.asarray(v)[begin:stop + 1] for v in weather))
+        n = (stop - begin) * steps
+        for row, v in zip(segments, resample_weather(hourly, p['timestep'])):
+            row[i, :n] = v[:n]
+            row[i, n:] = v[n - 1]
+    q = dict(p)
+    q['Troom_initial'] = np.array([p['Troom_initial'] if begin == 0 else T_est[begin] for begin, _, _ in windows])
+    _, traj = solve_heat_balance(q, segments, lead=(len(windows),), method=method)
+
+    best = (-math.inf, 0)
+    for heating, (begin, start, stop) in zip(traj.qHeating, windows):
+        heating = heating[(start - begin) * steps:(stop - begin) * steps]
+        k = int(np.argmax(heating))
+        if heating[k] > best[0]:
+            best = (float(heating[k]), start * steps + k)
+    n_computed = sum(stop - begin for begin, _, stop in windows)
+    return DesignDayResult(best[0] / 1000, best[1] // steps, windows, n_computed, n_computed / n_hours)
+
+
+def validate_design_day(params, weather, method='auto', **kwargs):
+    """
+    설계일 결과를 연간 계산과 비교 (최대 부하 [kW], 상대 오차, 계산량/시간 비율)
+    """
+    from greenhouse.model import GreenhouseModel
+
+    model = GreenhouseModel(**params)
+    start = time.perf_counter()
+    full = model.simulate(weather, method=method, channels=('qHeating',))
+    full_time = time.perf_counter() - start
+    start = time.perf_counter()
+    fast = design_day(model, weather, method=method, **kwargs)
+    fast_time = time.perf_counter() - start
+    peak = float(full.qHeating.max() / 1000)
+    return {
+        'peak_heating': fast.peak_heating,
+        'peak_heating_hour': fast.peak_heating_hour,
+        'full_peak_heating': peak,
+        'full_peak_heating_hour': int(np.argmax(full.qHeating)) // full.steps_per_hour,
+        'relative_error': (fast.peak_heating - peak) / peak if peak else float('nan'),
+        'fraction': fast.fraction,
+        'time_ratio': fast_time / full_time,
+    }
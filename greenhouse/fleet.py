@@ -0,0 +1,107 @@
+## 단지(여러 온실) 일괄 계산 (같은 기상데이터, 온실별 형상/피복 설정)
+#
+# 온실 정의 표는 스윕 시나리오 표와 같은 형식이다 (열 이름 -> 온실별 값).
+# 온실 축을 시나리오 축으로 써서 청크 단위로 한 번에 해석하고, 온실별 시간별
+# 난방/냉방 부하와 단지 합계를 함께 돌려준다. 합계는 float64로 누적한다.
+# envelope='ht'의 외피 면적 (areaRoof 등)은 형상에서 계산하지 않는 입력값이므로, 온실마다
+# 형상 (HT_GEOMETRY)이 다르면 면적 열 (HT_AREAS)도 표에 있어야 한다.
+
+from typing import NamedTuple
+
+import numpy as np
+
+from greenhouse.heat_balance import DEFAULT_PARAMS, solve_heat_balance
+from greenhouse.sweep import CHUNK_SIZE, as_table
+from greenhouse.weather import resample_weather, steps_per_hour
+
+HT_GEOMETRY = ('lengthHouse', 'widthHouse', 'heightHouse')  # envelope='ht' 면적이 따라 바뀌어야 하는 치수
+HT_AREAS = ('areaRoof', 'areaSideWall', 'areaFrontBack')
+
+
+class FleetResult(NamedTuple):
+    """
+    온실별/단지 합계 시간별 부하 [W] (스텝 간격은 timestep)
+    """
+    params: dict  # 온실별 설계 변수 (열 이름 -> 배열)
+    counts: np.ndarray  # 온실 정의별 동수
+    qHeating: np.ndarray  # (온실, 스텝) 난방부하 (1동 기준)
+    qCooling: np.ndarray  # (온실, 스텝) 냉방부하 (1동 기준)
+    heating: np.ndarray  # (스텝,) 단지 전체 난방부하
+    cooling: np.ndarray  # (스텝,) 단지 전체 냉방부하
+    steps_per_hour: int
+
+    def __len__(self):
+        return len(self.counts)
+
+    def summary(self):
+        """
+        단지 연간 부하 [kWh], 최대 부하 [kW] 및 발생 시간(0부터), 부등률
+        (부등률 = 온실별 최대 난방부하 합 / 단지 최대 난방부하)
+        """
+        n = self.steps_per_hour
+        peak_heating = float(self.heating.max() / 1000)
+        house_peaks = self.qHeating.max(axis=-1).astype(float) / 1000
+        return {
+            'n_houses': int(self.counts.sum()),
+            'annual_heating': float(self.heating.sum() / 1000 / n),
+            'annual_cooling': float(self.cooling.sum() / 1000 / n),
+            'peak_heating': peak_heating,
+            'peak_heating_hour': int(np.argmax(self.heating)) // n,
+            'peak_cooling': float(self.cooling.max() / 1000),
+            'peak_cooling_hour': int(np.argmax(self.cooling)) // n,
+            'diversity_factor': float(self.counts @ house_peaks / peak_heating) if peak_heating > 0 else float('nan'),
+        }
+
+    def rows(self):
+        # 온실 정의별 dict 목록 (연간 부하 [kWh], 최대 부하 [kW], 1동 기준)
+        n = self.steps_per_hour
+        columns = dict(self.params)
+        columns['count'] = self.counts
+        columns['annual_heating'] = self.qHeating.sum(axis=-1, dtype=float) / 1000 / n
+        columns['annual_cooling'] = self.qCooling.sum(axis=-1, dtype=float) / 1000 / n
+        columns['peak_heating'] = self.qHeating.max(axis=-1).astype(float) / 1000
+        columns['peak_heating_hour'] = np.argmax(self.qHeating, axis=-1) // n
+        return [{name: np.asarray(c)[i].item() for name, c in columns.items()} for i in range(len(self))]
+
+
+def simulate_fleet(houses, weather, counts=None, base=None, dtype=np.float32, chunk_size=CHUNK_SIZE,
+                   method='auto'):
+    """
+    온실 정의 표의 모든 온실을 같은 기상데이터로 계산
+
+    houses : 온실별 설계 변수 (예: {'lengthHouse': [...], 'widthHouse': [...], 'fr': [...]},
+             dict 목록 또는 pandas.DataFrame도 가능, envelope='ht'에서 형상을 바꾸면 HT_AREAS 열도 필요)
+    counts : 정의별 동수 (같은 온실이 여러 동이면 합계에 곱함, 기본 1)
+    base   : 나머지 변수의 기준값 (기본값 DEFAULT_PARAMS, timestep/integrator 등 모델 선택 포함)
+    dtype  : 온실별 계열 저장 dtype (단지 합계는 항상 float64)
+    """
+    table = as_table(houses)
+    n = len(next(iter(table.values()))) if table else 1
+    counts = np.ones(n) if counts is None else np.asarray(counts, dtype=float)
+    if counts.shape != (n,):
+        raise ValueError(f"counts must have one entry per house definition ({n}), got shape {counts.shape}")
+    params = dict(DEFAULT_PARAMS)
+    params.update(base or {})
+    if params['envelope'] == 'ht' and any(name in table for name in HT_GEOMETRY):
+        missing = [name for name in HT_AREAS if name not in table]
+        if missing:
+            varied = [name for name in HT_GEOMETRY if name in table]
+            raise ValueError(f"envelope='ht' uses fixed areas: houses that vary {', '.join(varied)} "
+                             f"also need per-house {', '.join(missing)}")
+    weather = resample_weather(weather, params['timestep'])
+    n_steps = len(weather.Toutdoor)
+
+    qHeating = np.empty((n, n_steps), dtype=dtype)
+    qCooling = np.empty((n, n_steps), dtype=dtype)
+    heating = np.zeros(n_steps)
+    cooling = np.zeros(n_steps)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        chunk = dict(params)
+        chunk.update({name: values[start:stop] for name, values in table.items()})
+        _, traj = solve_heat_balance(chunk, weather, lead=(stop - start,), method=method)
+        qHeating[start:stop] = traj.qHeating
+        qCooling[start:stop] = traj.qCooling
+        heating += counts[start:stop] @ traj.qHeating
+        cooling += counts[start:stop] @ traj.qCooling
+    return FleetResult(table, counts, qHeating, qCooling, heating, cooling, steps_per_hour(params['timestep']))
@@ -0,0 +1,319 @@
+## 온실 열수지 계수 조립
+#
+# 스크립트의 열부하 항은 모두 U * (T_drive - Troom) 형태이므로
+# 시간별 이득 S = sum U * T_drive + qRad 와 총 컨덕턴스 G = sum U 로 묶어
+# greenhouse.solver.solve_troom 에 넘긴다. 모든 계수는 스칼라 또는
+# (시나리오,) 배열이 가능하며, 배열이면 결과는 (시나리오, 시간) 형태가 된다.
+#
+# air_properties='table'이면 공기 밀도/비열을 실내온도로 시간마다 보간하므로
+# C (와 'ach' 환기 컨덕턴스)가 실내온도에 의존한다. 이 경우 solve_heat_balance가
+# 직전 해의 실내온도로 물성치를 다시 찾아 실내온도가 수렴할 때까지 반복한다.
+#
+# timestep [분]이 60보다 작으면 기상데이터를 그 간격으로 보간한 계열
+# (greenhouse.weather.resample_weather)을 넘겨야 하며, 점화식과 결과는 스텝 단위가 된다.
+#
+# room은 실내온도 계산 방식이다. 'dynamic'은 위 점화식, 'fixed'는 실내온도를 Troom_fixed로
+# 고정한 정적 계산 (gangnung_dandong4.py, 5.py, _v1.py), 'open_loop'는 Troom_fixed에서 계산한
+# 열부하를 되먹임 없이 Euler로 누적한 실내온도로 운전 모드와 난방/냉방 부하를 정한다
+# (gangnung_dandong_v2.py, 열부하와 성분 열전달량은 Troom_fixed 기준). 두 정적 방식은
+# feedback과 integrator를 쓰지 않는다. control='outdoor'이면 운전 모드를 외기온도로 정한다.
+
+from typing import NamedTuple
+
+import numpy as np
+
+from greenhouse.profiling import stage
+from greenhouse.properties import air_properties_at, reference_properties
+from greenhouse.solair import calculate_Tsolair2
+from greenhouse.solver import _steps, apply_thermostat, next_troom, solve_troom
+from greenhouse.weather import MINUTES_PER_HOUR
+
+AIR_PROPERTY_TOL = 1e-6  # 물성치 반복 수렴 기준 (실내온도 변화 [K])
+AIR_PROPERTY_MAX_ITER = 20
+
+# 기본 설계값 (gangnung_dandong5_test.py)
+DEFAULT_PARAMS = {
+    # 온실 크기
+    'lengthHouse': 70,  # [m]
+    'widthHouse': 8.6,  # [m]
+    'heightHouse': 4.6,  # [m]
+    'nFloor': 1,
+    'areaRoof': 696.36,  # [m2]
+    'areaSideWall': 604.8,  # [m2]
+    'areaFrontBack': 64.5,  # [m2]
+    # 일사
+    'fracSolarWindow': 0.85,
+    'transGlass': 0.85,
+    'alpha_roof': 0.2,  # 지붕 표면 일사흡수율 [-]
+    'epsilon': 0.9,  # 지붕 표면 방사율 [-]
+    # 열관류 ('ht' 외피)
+    'ht': 5.7,  # 열 관류율
+    'hs': 0.244,  # 지표면 전열 계수
+    'fr': 0.3,  # 보온 피복재의 열 절감율
+    'hv': 0.2,  # 환기 전열 계수
+    'Agh': 1365.66,  # 환기 기준 면적 [m2]
+    # 열저항 ('r' 외피) [m2K/W]
+    'rRoof': 2.0,
+    'rFloor': 2.0,
+    'rSideWall': 2.0,
+    'ACH': 0.5,  # Air Changes per Hour (시간당 환기횟수)
+    # 창문/문 (면적이 0이면 없음, 외기온도 구동)
+    'areaWindow': 0,  # [m2]
+    'rWindow': 0.8,  # [m2K/W]
+    'areaDoor': 0,  # [m2]
+    'rDoor': 1.5,  # [m2K/W]
+    # 공기 물성치 (None이면 CoolProp 기준값, air_properties='table'이면 사용하지 않음)
+    'rhoAir': None,  # [kg/m3]
+    'cAir': None,  # [kJ/kgK]
+    # 온도 [K]
+    'Troom_initial': 7 + 273,
+    'Tground': 10 + 273,
+    'Tset_heating': 15 + 273,
+    'Tset_cooling': 20 + 273,
+    'Troom_fixed': 27 + 273,  # room='fixed'/'open_loop'의 부하 계산 실내온도
+    # 난방/냉방
+    'hvac_recovery': 1.0,  # 설정온도 복귀 시간 [s] (None이면 복귀 열량 없음)
+    'dt': 1.0,  # 점화식 시간 간격 [s] (스크립트는 dT = q / (m c) 로 1초를 가정, None이면 timestep * 60)
+    'timestep': 60,  # 기상데이터/결과 스텝 간격 [분] (60의 약수, 예: 1, 5, 15)
+    # 모델 선택 (시나리오 간에 공통이어야 함)
+    'envelope': 'ht',  # 'ht': ht * area * (1 - fr), 'r': area / r
+    'vent': 'hv',  # 'hv': hv * Agh, 'ach': ACH * m * c / 3600, 'none'
+    'vent_drive': 'solair',  # 환기 구동 온도: 'solair' 또는 'outdoor'
+    'solair': 'fixed',  # 등가 외기온도 모델 (greenhouse.solair.SOLAIR_MODELS)
+    'hvac_rule': 'setpoint',  # greenhouse.solver.HVAC_RULES
+    'control': 'room',  # 운전 모드 판정 온도: 'room' (실내온도) 또는 'outdoor' (외기온도, 정적 스크립트)
+    'room': 'dynamic',  # 'dynamic': 점화식, 'fixed': Troom_fixed로 고정, 'open_loop': 고정 실내온도 부하의 누적
+    'feedback': False,  # 난방/냉방 열량의 실내온도 반영 여부
+    'integrator': 'euler',  # 'euler': 스크립트와 같은 명시적 Euler, 'exponential': 해석적 1절점 적분 (greenhouse.solver)
+    'air_properties': 'constant',  # 'constant': T_mean 기준값, 'table': 실내온도별 보간표
+}
+
+CHOICE_PARAMS = ('envelope', 'vent', 'vent_drive', 'solair', 'hvac_rule', 'control', 'room', 'feedback',
+                 'air_properties', 'timestep', 'integrator')
+
+ROOM_MODELS = ('dynamic', 'fixed', 'open_loop')
+CONTROLS = ('room', 'outdoor')
+
+
+class HeatBalance(NamedTuple):
+    """
+    solve_troom 입력 계수와 성분별 열컨덕턴스
+    """
+    S: np.ndarray  # 시간별 이득 [W]
+    G: np.ndarray  # 총 열컨덕턴스 [W/K] (시간별 물성치이면 (..., 시간))
+    C: np.ndarray  # 실내 공기 열용량 [J/K] (시간별 물성치이면 (..., 시간))
+    Tsolair2: np.ndarray  # 등가 외기온도 [K]
+    qRad: np.ndarray  # 일사 열획득 [W]
+    components: dict  # 이름 -> (U [W/K], 구동 온도 [K])
+    Troom_load: np.ndarray = None  # 성분 열전달량의 실내온도 [K] (room='open_loop'만, 아니면 궤적의 실내온도)
+
+
+def _col(v):
+    # 시나리오 배열은 (N, 1)로 바꿔 시간 축과 브로드캐스팅
+    v = np.asarray(v, dtype=float)
+    return v[..., None] if v.ndim else v
+
+
+def _value(p, name):
+    return _col(p[name])
+
+
+def house_geometry(p, rhoAir):
+    """
+    바닥면적, 외피면적, 체적, 공기질량
+    """
+    lengthHouse = _value(p, 'lengthHouse')
+    widthHouse = _value(p, 'widthHouse')
+    heightHouse = _value(p, 'heightHouse')
+    areaHouse = lengthHouse * widthHouse
+    surfaceHouse = (widthHouse * heightHouse + lengthHouse * heightHouse) * 2
+    volumeHouse = areaHouse * heightHouse * _value(p, 'nFloor')
+    mHouse = volumeHouse * rhoAir
+    return areaHouse, surfaceHouse, volumeHouse, mHouse
+
+
+def air_properties(p, Tair=None):
+    """
+    공기 밀도 [kg/m3], 비열 [kJ/kgK] (지정하지 않으면 CoolProp 기준값)
+
+    air_properties='table'이고 Tair [K]가 주어지면 보간표에서 시간별 값을 찾는다.
+    """
+    if p.get('air_properties', 'constant') == 'table' and Tair is not None:
+        return air_properties_at(Tair)
+    rhoAir, cAir = p.get('rhoAir'), p.get('cAir')
+    if rhoAir is None or cAir is None:
+        ref_rhoAir, _, ref_cAir, _ = reference_properties()
+        rhoAir = ref_rhoAir if rhoAir is None else rhoAir
+        cAir = ref_cAir if cAir is None else cAir
+    return _col(rhoAir), _col(cAir)
+
+
+def _squeeze(v):
+    # (N, 1) 시나리오 계수는 (N,)로, 시간별 계수는 그대로
+    v = np.asarray(v, dtype=float)
+    return v[..., 0] if v.ndim and v.shape[-1] == 1 else v
+
+
+def build_heat_balance(params, Toutdoor, radSolar, Vwind=None, Tair=None):
+    """
+    설계 변수와 기상데이터로 S, G, C 및 성분별 컨덕턴스를 계산
+
+    Tair : 시간별 공기 물성치를 찾을 실내온도 [K] (air_properties='table'일 때만 사용)
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(params)
+    for name in CHOICE_PARAMS:
+        if np.ndim(p[name]):
+            raise ValueError(f"{name!r} selects a model variant and cannot vary across scenarios")
+    if p['air_properties'] not in ('constant', 'table'):
+        raise ValueError(f"unknown air_properties {p['air_properties']!r}")
+    if p['room'] not in ROOM_MODELS:
+        raise ValueError(f"unknown room {p['room']!r}, expected one of {list(ROOM_MODELS)}")
+    if p['control'] not in CONTROLS:
+        raise ValueError(f"unknown control {p['control']!r}, expected one of {list(CONTROLS)}")
+    with stage('properties'):
+        rhoAir, cAir = air_properties(p, Tair)
+
+    areaHouse, surfaceHouse, volumeHouse, mHouse = house_geometry(p, rhoAir)
+    C = mHouse * cAir * 1000
+
+    Toutdoor = np.asarray(Toutdoor, dtype=float)
+    radSolar = np.asarray(radSolar, dtype=float)
+    coeffs = {} if p['solair'] == 'constant' else {'alpha_roof': _value(p, 'alpha_roof')}
+    if p['solair'] == 'wind':
+        coeffs['epsilon'] = _value(p, 'epsilon')
+    with stage('solair'):
+        Tsolair2 = calculate_Tsolair2(Toutdoor, radSolar, Vwind, model=p['solair'], **coeffs)
+    Tground = _value(p, 'Tground')
+
+    if p['envelope'] == 'ht':
+        loss = _value(p, 'ht') * (1 - _value(p, 'fr'))
+        components = {
+            'qRoof': (loss * _value(p, 'areaRoof'), Tsolair2),
+            'qFloor': (_value(p, 'hs') * areaHouse, Tground),
+            'qSideWall': (loss * _value(p, 'areaSideWall'), Tsolair2),
+            'qFrontBack': (loss * _value(p, 'areaFrontBack'), Tsolair2),
+        }
+    elif p['envelope'] == 'r':
+        components = {
+            'qRoof': (areaHouse / _value(p, 'rRoof'), Tsolair2),
+            'qFloor': (areaHouse / _value(p, 'rFloor'), Tground),
+            'qSideWall': (surfaceHouse / _value(p, 'rSideWall'), Tsolair2),
+        }
+    else:
+        raise ValueError(f"unknown envelope {p['envelope']!r}")
+    for name, area, r in (('qWindow', 'areaWindow', 'rWindow'), ('qDoor', 'areaDoor', 'rDoor')):
+        if np.any(_value(p, area)):
+            components[name] = (_value(p, area) / _value(p, r), Toutdoor)
+
+    Tvent = Tsolair2 if p['vent_drive'] == 'solair' else Toutdoor
+    if p['vent'] == 'hv':
+        components['qVent'] = (_value(p, 'hv') * _value(p, 'Agh'), Tvent)
+    elif p['vent'] == 'ach':
+        components['qVent'] = (_value(p, 'ACH') * mHouse * cAir * 1000 / 3600, Tvent)
+    elif p['vent'] != 'none':
+        raise ValueError(f"unknown vent {p['vent']!r}")
+
+    qRad = _value(p, 'fracSolarWindow') * _value(p, 'transGlass') * areaHouse * radSolar
+    S = qRad
+    G = 0.0
+    for U, Tdrive in components.values():
+        S = S + U * Tdrive
+        G = G + U
+    Troom_load = _value(p, 'Troom_fixed') if p['room'] == 'open_loop' else None
+    return HeatBalance(S, _squeeze(G), _squeeze(C), Tsolair2, qRad, components, Troom_load)
+
+
+def hvac_gain(params, C):
+    """
+    설정온도 복귀 열량 계수 [W/K] = C / hvac_recovery
+    """
+    recovery = params.get('hvac_recovery', DEFAULT_PARAMS['hvac_recovery'])
+    if recovery is None:
+        return np.zeros_like(np.asarray(C, dtype=float))
+    recovery = np.asarray(recovery, dtype=float)
+    if 0 < recovery.ndim < np.ndim(C):
+        recovery = _col(recovery)  # 시간별 열용량
+    return C / recovery
+
+
+def step_seconds(params):
+    """
+    점화식 시간 간격 [s] (dt=None이면 실제 스텝 길이 timestep * 60)
+    """
+    dt = params.get('dt', DEFAULT_PARAMS['dt'])
+    if dt is None:
+        return params.get('timestep', DEFAULT_PARAMS['timestep']) * MINUTES_PER_HOUR
+    return dt
+
+
+def next_troom_initial(params, heat_balance, trajectory):
+    """
+    마지막 스텝 다음 시간의 실내온도 (다음 구간의 Troom_initial, greenhouse.solver.next_troom)
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(params)
+    if p['room'] == 'fixed':
+        return np.broadcast_to(np.asarray(p['Troom_fixed'], dtype=float), trajectory.Troom.shape[:-1])
+    dynamic = p['room'] == 'dynamic'
+    hb = heat_balance
+    return next_troom(trajectory, hb.C, step_seconds(p), p['feedback'] and dynamic, G=hb.G,
+                      hvac_gain=hvac_gain(p, hb.C), hvac_rule=p['hvac_rule'],
+                      integrator=p['integrator'] if dynamic else 'euler', Tset_heating=p['Tset_heating'],
+                      Tset_cooling=p['Tset_cooling'])
+
+
+def _open_loop(p, traj, C, lead, Tcontrol):
+    # 고정 실내온도의 열부하를 누적한 실내온도 (Troom[k+1] = Troom[k] + dt / C * qTotalHouse[k])
+    ndim = traj.Troom.ndim
+    dT = np.broadcast_to(_steps(step_seconds(p), ndim) / _steps(C, ndim) * traj.qTotalHouse, traj.Troom.shape)
+    T0 = np.broadcast_to(np.asarray(p['Troom_initial'], dtype=float), lead)[..., None]
+    Troom = np.cumsum(np.concatenate([T0, dT[..., :-1]], axis=-1), axis=-1)
+    qHeating, qCooling, mode = apply_thermostat(Troom, traj.qTotalHouse, p['Tset_heating'], p['Tset_cooling'],
+                                                p['hvac_rule'], hvac_gain(p, C), Tcontrol)
+    return traj._replace(Troom=Troom, qHeating=qHeating, qCooling=qCooling, mode=mode)
+
+
+def _solve_once(p, weather, lead, Tair, method):
+    hb = build_heat_balance(p, weather.Toutdoor, weather.radSolar, weather.Vwind, Tair=Tair)
+    shape = lead + (np.shape(weather.Toutdoor)[-1],)
+
+    def coef(v):
+        return v if np.ndim(v) == len(shape) else np.broadcast_to(v, lead)
+
+    C = coef(hb.C)
+    dynamic = p['room'] == 'dynamic'
+    Tcontrol = weather.Toutdoor if p['control'] == 'outdoor' else None
+    with stage('integration'):
+        traj = solve_troom(np.broadcast_to(hb.S, shape), coef(hb.G), C,
+                           np.broadcast_to(p['Troom_initial' if dynamic else 'Troom_fixed'], lead),
+                           *(np.broadcast_to(p[name], lead) for name in ('Tset_heating', 'Tset_cooling')),
+                           dt=np.broadcast_to(step_seconds(p), lead), hvac_rule=p['hvac_rule'],
+                           hvac_gain=hvac_gain(p, C), feedback=p['feedback'], Tcontrol=Tcontrol, dynamic=dynamic,
+                           method=method, integrator=p['integrator'])
+        if p['room'] == 'open_loop':
+            traj = _open_loop(p, traj, C, lead, Tcontrol)
+    return hb, traj
+
+
+def solve_heat_balance(params, weather, lead=(), method='auto'):
+    """
+    열수지 계수 조립과 실내온도 해석 (HeatBalance, Trajectory)
+
+    weather : timestep 간격의 기상데이터 (greenhouse.weather.resample_weather,
+              시나리오별로 다르면 lead + (스텝 수,) 형태)
+    lead    : 시나리오 축 형태 (스윕은 (시나리오 수,), 단일 모델은 ())
+    air_properties='table'이면 기준 물성치 해에서 시작해 직전 실내온도로 물성치를
+    다시 찾는 고정점 반복을 수행한다 (보통 3~4회 안에 AIR_PROPERTY_TOL 이내로 수렴).
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(params)
+    hb, traj = _solve_once(p, weather, lead, None, method)
+    if p['air_properties'] != 'table':
+        return hb, traj
+    for _ in range(AIR_PROPERTY_MAX_ITER):
+        Troom = traj.Troom
+        hb, traj = _solve_once(p, weather, lead, Troom, method)
+        if np.all(np.abs(traj.Troom - Troom) <= AIR_PROPERTY_TOL):
+            break
+    return hb, traj
@@ -0,0 +1,173 @@
+## 체크포인트 기반 부분 재계산 (연중 일부 구간의 설정/기상데이터 수정)
+#
+# 1절점 점화식의 상태는 실내온도 하나뿐이다 (운전 모드는 매 스텝 실내온도로 다시 정해짐).
+# 그래서 CHECKPOINT_HOURS마다 실내온도를 float64로 보관해 두면, 수정한 첫 스텝 직전
+# 체크포인트부터 다시 계산하면 된다. 수정 구간이 끝난 뒤에는 체크포인트 간격 블록 단위로
+# 진행하며, 블록 끝의 실내온도가 이전 계산과 RECONVERGE_TOL 이내로 다시 만나면 멈추고
+# 나머지는 이전 결과를 그대로 쓴다 (같은 상태와 입력이면 이후 궤적도 같음).
+#
+# 구간별 변수 변경은 (시작 스텝, 끝 스텝, 변경 dict) 목록으로 보관하고, 계산 구간을 변경
+# 경계에서 나눠 구간마다 solve_heat_balance를 호출하며 실내온도를 이어 준다
+# (greenhouse.stream.iter_chunks와 같은 방식). 모델 선택 (CHOICE_PARAMS)은 바꿀 수 없다.
+# air_properties='table'이면 물성치 고정점 반복을 계산 구간마다 하므로 연간 계산과
+# AIR_PROPERTY_TOL 정도 차이가 날 수 있다.
+
+from typing import NamedTuple
+
+import numpy as np
+
+from greenhouse.heat_balance import CHOICE_PARAMS, DEFAULT_PARAMS, next_troom_initial, solve_heat_balance
+from greenhouse.results import collect
+from greenhouse.weather import Weather, resample_weather, steps_per_hour
+
+CHECKPOINT_HOURS = 168  # 체크포인트 간격 (1주) [hr]
+RECONVERGE_TOL = 1e-6  # 이전 계산과 같은 궤적으로 보는 실내온도 차이 [K]
+
+
+class UpdateReport(NamedTuple):
+    """
+    부분 재계산 범위 (스텝 인덱스, stop은 포함하지 않음)
+    """
+    start: int  # 다시 계산을 시작한 체크포인트 스텝
+    stop: int  # 다시 계산한 마지막 스텝 + 1
+    n_steps: int
+    fraction: float  # 전체 스텝 수 대비 계산량
+    reconverged: bool  # 끝까지 가기 전에 이전 궤적과 다시 만났는지
+
+
+class IncrementalSimulation:
+    """
+    연간 계산 결과와 체크포인트를 보관하고 수정된 구간만 다시 계산
+
+    sim = IncrementalSimulation(GreenhouseModel(feedback=True), weather)
+    sim.set_params(2000, 2200, Tset_heating=290)  # 2000~2199시만 설정온도 변경
+    sim.patch_weather(5000, Toutdoor=[263.0, 262.5])  # 5000, 5001시 외기온도 수정
+    sim.result().summary()
+    """
+
+    def __init__(self, model, weather, checkpoint_hours=CHECKPOINT_HOURS, tol=RECONVERGE_TOL, method='auto'):
+        from greenhouse.model import GreenhouseModel
+
+        self.model = model if isinstance(model, GreenhouseModel) else GreenhouseModel(**model)
+        self.steps_per_hour = steps_per_hour(self.model.timestep)
+        self.interval = checkpoint_hours * self.steps_per_hour
+        self.tol = tol
+        self.method = method
+        self.hourly = Weather(*(np.array(v, dtype=float) for v in weather))  # patch_weather가 수정하므로 복사
+        self.weather = self._resample()
+        self.changes = []  # (시작 스텝, 끝 스텝, 변경 dict)
+        n_steps = len(self.weather.Toutdoor)
+        self.data = {}
+        self._solve(0, n_steps, self.model.params['Troom_initial'])
+        self.checkpoints = np.array(self.data['Troom'][::self.interval], dtype=float)
+
+    @property
+    def n_steps(self):
+        return len(self.weather.Toutdoor)
+
+    def result(self):
+        from greenhouse.model import SimulationResult
+
+        return SimulationResult(self.model, {name: values.copy() for name, values in self.data.items()})
+
+    def _resample(self):
+        # 스텝 간격 기상데이터 (60분이면 시간별 배열과 메모리를 공유하지 않도록 복사)
+        weather = resample_weather(self.hourly, self.model.timestep)
+        return Weather(*(v.copy() for v in weather)) if weather is self.hourly else weather
+
+    def _params(self, step):
+        # step에서 적용되는 변수 (나중에 준 변경이 우선)
+        p = dict(self.model.params)
+        for start, stop, changes in self.changes:
+            if start <= step < stop:
+                p.update(changes)
+        return p
+
+    def _solve(self, start, stop, Troom_initial):
+        # start~stop 스텝을 변경 경계에서 나눠 계산하고 self.data에 기록, stop 스텝의 실내온도 반환
+        bounds = {start, stop}
+        bounds.update(b for change in self.changes for b in change[:2] if start < b < stop)
+        bounds = sorted(bounds)
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            p = self._params(a)
+            p['Troom_initial'] = Troom_initial
+            weather = Weather(*(v[a:b] for v in self.weather))
+            hb, traj = solve_heat_balance(p, weather, method=self.method)
+            if not self.data:
+                # 브로드캐스팅 보기(읽기 전용)가 아닌 쓰기 가능한 배열로 보관
+                self.data = {name: np.array(v) for name, v in collect(hb, traj, weather.Toutdoor).items()}
+            else:
+                collect(hb, traj, weather.Toutdoor, tuple(self.data), out=self.data, index=slice(a, b))
+            Troom_initial = float(next_troom_initial(p, hb, traj))
+        return Troom_initial
+
+    def update(self, first, last):
+        """
+        first~last 스텝 (last 포함하지 않음)의 입력이 바뀌었을 때 직전 체크포인트부터 다시 계산
+        """
+        n_steps = self.n_steps
+        first = max(0, min(first, n_steps))
+        last = max(first, min(last, n_steps))
+        if first == last:
+            return UpdateReport(first, first, 0, 0.0, True)
+        j = first // self.interval
+        start = j * self.interval
+        T = float(self.checkpoints[j])
+        # 수정 구간 끝까지는 무조건, 그 뒤는 체크포인트 경계마다 이전 궤적과 비교
+        stop = min(n_steps, -(-last // self.interval) * self.interval)
+        reconverged = False
+        a = start
+        while True:
+            T = self._solve(a, stop, T)
+            for k in range(-(-a // self.interval), (stop - 1) // self.interval + 1):
+                self.checkpoints[k] = self.data['Troom'][k * self.interval]
+            if stop >= n_steps:
+                break
+            if abs(T - float(self.data['Troom'][stop])) <= self.tol:
+                reconverged = True
+                break
+            a, stop = stop, min(n_steps, stop + self.interval)
+        n = stop - start
+        return UpdateReport(start, stop, n, n / n_steps, reconverged)
+
+    def set_params(self, start_hour, stop_hour=None, **changes):
+        """
+        start_hour~stop_hour 시간 (stop_hour 포함하지 않음, None이면 끝까지)에만 변수 변경 후 다시 계산
+        """
+        for name, value in changes.items():
+            if name not in DEFAULT_PARAMS:
+                raise ValueError(f"unknown parameter {name!r}")
+            if name in CHOICE_PARAMS:
+                raise ValueError(f"{name!r} selects the model variant and cannot change mid-run")
+            if np.ndim(value):
+                raise ValueError(f"{name!r} must be a scalar")
+        if 'Troom_initial' in changes:
+            raise ValueError("'Troom_initial' is the state at hour 0, pass it to the model instead")
+        n = self.steps_per_hour
+        start = start_hour * n
+        stop = self.n_steps if stop_hour is None else min(stop_hour * n, self.n_steps)
+        if start >= stop:
+            return UpdateReport(start, start, 0, 0.0, True)
+        self.changes.append((start, stop, dict(changes)))
+        return self.update(start, stop)
+
+    def patch_weather(self, start_hour, **columns):
+        """
+        start_hour부터 기상데이터 열 값 교체 (예: Toutdoor=[...], radSolar=[...]) 후 바뀐 스텝만 다시 계산
+        """
+        unknown = [name for name in columns if name not in Weather._fields]
+        if unknown:
+            raise ValueError(f"unknown weather column(s) {', '.join(map(repr, unknown))}, "
+                             f"expected some of {list(Weather._fields)}")
+        columns = {name: np.asarray(values, dtype=float).ravel() for name, values in columns.items()}
+        for name, values in columns.items():
+            if start_hour < 0 or start_hour + len(values) > len(self.hourly.Toutdoor):
+                raise ValueError(f"{name!r} patch of {len(values)} hours at hour {start_hour} is out of range")
+        for name, values in columns.items():
+            getattr(self.hourly, name)[start_hour:start_hour + len(values)] = values
+        weather = self._resample()
+        changed = np.flatnonzero(np.any(np.stack(weather) != np.stack(self.weather), axis=0))
+        self.weather = weather
+        if not len(changed):
+            return UpdateReport(0, 0, 0, 0.0, True)
+        return self.update(int(changed[0]), int(changed[-1]) + 1)
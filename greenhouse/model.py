@@ -0,0 +1,190 @@
+## 온실 모델 객체 (import 시 파일 읽기/계산/그래프 없음)
+
+import sys
+
+import numpy as np
+
+from greenhouse.heat_balance import (CHOICE_PARAMS, DEFAULT_PARAMS, air_properties, build_heat_balance,
+                                     house_geometry, solve_heat_balance)
+from greenhouse.profiling import stage
+from greenhouse.results import COMPONENT_CHANNELS, ResultSet, collect
+from greenhouse.stream import iter_chunks
+from greenhouse.weather import resample_weather, steps_per_hour
+
+
+class GreenhouseModel:
+    """
+    온실 형상/열관류 계수를 보관하고 기상데이터로 연간 계산을 수행
+
+    model = GreenhouseModel(fr=0.4, Tset_heating=291)
+    result = model.simulate(load_tmy('TMY3_Gangnung.xlsx'))
+    """
+
+    def __init__(self, **params):
+        unknown = sorted(set(params) - set(DEFAULT_PARAMS))
+        if unknown:
+            raise ValueError(f"unknown parameter(s) {', '.join(map(repr, unknown))}")
+        for name, value in params.items():
+            if np.ndim(value):
+                raise ValueError(f"{name!r} must be a scalar (use greenhouse.sweep for scenario arrays)")
+        p = dict(DEFAULT_PARAMS)
+        p.update(params)
+        self.params = p
+
+    def __getattr__(self, name):
+        params = self.__dict__.get('params', {})
+        if name in params:
+            return params[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __repr__(self):
+        changed = {k: v for k, v in self.params.items() if v != DEFAULT_PARAMS[k]}
+        args = ', '.join(f"{k}={v!r}" for k, v in changed.items())
+        return f"{type(self).__name__}({args})"
+
+    def replace(self, **changes):
+        # 일부 변수만 바꾼 새 모델
+        p = {k: v for k, v in self.params.items() if v != DEFAULT_PARAMS[k] or k in CHOICE_PARAMS}
+        p.update(changes)
+        return type(self)(**p)
+
+    def geometry(self):
+        # (바닥면적 [m2], 외피면적 [m2], 체적 [m3], 공기질량 [kg])
+        rhoAir, _ = air_properties(self.params)
+        return tuple(float(v) for v in house_geometry(self.params, rhoAir))
+
+    @property
+    def areaHouse(self):
+        return self.geometry()[0]
+
+    @property
+    def surfaceHouse(self):
+        return self.geometry()[1]
+
+    @property
+    def volumeHouse(self):
+        return self.geometry()[2]
+
+    @property
+    def mHouse(self):
+        return self.geometry()[3]
+
+    def heat_balance(self, weather):
+        return build_heat_balance(self.params, weather.Toutdoor, weather.radSolar, weather.Vwind)
+
+    def simulate(self, weather, method='auto', channels=None, dtype=np.float64):
+        """
+        연간(기상데이터 길이) 실내온도와 난방/냉방 부하 계산
+
+        weather  : 시간별 greenhouse.weather.Weather (timestep이 60분보다 작으면 보간해서 계산)
+        channels : 저장할 채널 (greenhouse.results.CHANNELS, None이면 전체)
+        dtype    : 저장 dtype (예: np.float32)
+        """
+        weather = resample_weather(weather, self.timestep)
+        hb, traj = solve_heat_balance(self.params, weather, method=method)
+        return SimulationResult(self, collect(hb, traj, weather.Toutdoor, channels, dtype))
+
+    def stream(self, chunks, method='auto', channels=None, dtype=np.float64):
+        """
+        기상데이터 구간별 SimulationResult 생성 (구간 사이에 실내온도 상태를 이어감)
+
+        chunks : Weather 구간의 iterable (greenhouse.stream.repeat_weather 등)
+        """
+        for _, weather, hb, traj in iter_chunks(self.params, chunks, method=method):
+            yield SimulationResult(self, collect(hb, traj, weather.Toutdoor, channels, dtype))
+
+
+class SimulationResult(ResultSet):
+    """
+    GreenhouseModel.simulate 결과 (열량 [W], 온도 [K], 스텝별 채널, 스텝 간격은 model.timestep [분])
+    """
+
+    def __init__(self, model, data):
+        super().__init__(data, model.params)
+        self.model = model
+
+    def __len__(self):
+        return self.n_steps
+
+    @property
+    def steps_per_hour(self):
+        return steps_per_hour(self.model.timestep)
+
+    @property
+    def n_hours(self):
+        return self.n_steps // self.steps_per_hour
+
+    def components(self):
+        # 성분별 열전달량 [W] (COMPONENT_CHANNELS 중 계산해서 저장된 것)
+        return {name: self.data[name] for name in COMPONENT_CHANNELS if name in self.data}
+
+    def summary(self):
+        """
+        연간 부하 [kWh], 최대 부하 [kW] 및 발생 시간(0부터), 실내온도 통계 [°C]
+
+        *_step은 발생 스텝 인덱스 (timestep이 60분이면 *_hour와 같음).
+        """
+        with stage('reporting'):
+            n = self.steps_per_hour
+            Troom_C = self.Troom - 273.15
+            steps = {
+                'peak_heating_step': int(np.argmax(self.qHeating)),
+                'peak_cooling_step': int(np.argmax(self.qCooling)),
+                'min_Tsolair2_step': int(np.argmin(self.Tsolair2)),
+                'Troom_min_step': int(np.argmin(self.Troom)),
+            }
+            return {
+                'annual_total': float(np.abs(self.qTotalHouse).sum(dtype=float) / 1000 / n),
+                'annual_heating': float(self.qHeating.sum(dtype=float) / 1000 / n),
+                'annual_cooling': float(self.qCooling.sum(dtype=float) / 1000 / n),
+                'peak_heating': float(self.qHeating.max() / 1000),
+                'peak_heating_hour': steps['peak_heating_step'] // n,
+                'peak_cooling': float(self.qCooling.max() / 1000),
+                'peak_cooling_hour': steps['peak_cooling_step'] // n,
+                'min_Tsolair2': float(self.Tsolair2.min() - 273.15),
+                'min_Tsolair2_hour': steps['min_Tsolair2_step'] // n,
+                'Troom_mean': float(Troom_C.mean(dtype=float)),
+                'Troom_max': float(Troom_C.max()),
+                'Troom_min': float(Troom_C.min()),
+                'Troom_min_hour': steps['Troom_min_step'] // n,
+                **steps,
+            }
+
+    def print_summary(self, file=None):
+        # gangnung_dandong5_test.py 와 같은 형식의 결과 출력
+        file = sys.stdout if file is None else file
+        with stage('reporting'):
+            self._print_summary(file)
+
+    def _print_summary(self, file):
+        s = self.summary()
+
+        def out(text=''):
+            print(text, file=file)
+
+        out(f"Annual Total Heat Load: {s['annual_total']:.2f} kWh")
+        out(f"Annual Heating Load: {s['annual_heating']:.2f} kWh")
+        out(f"Annual Cooling Load: {s['annual_cooling']:.2f} kWh")
+        out(f"\nMaximum Heating Load: {s['peak_heating']:.2f} kW (Hour {s['peak_heating_hour'] + 1})")
+        out(f"Minimum Outdoor Temperature: {s['min_Tsolair2']:.2f}°C (Hour {s['min_Tsolair2_hour'] + 1})")
+        out("\n=== 실내온도 ===")
+        out(f"평균: {s['Troom_mean']:.2f}°C")
+        out(f"최대: {s['Troom_max']:.2f}°C")
+        out(f"최소: {s['Troom_min']:.2f}°C")
+        for title, key in (('최대 난방부하', 'peak_heating'), ('최저 실내온도', 'Troom_min')):
+            idx = s[f'{key}_step']
+            out(f"\n=== {title} 발생 시점 분석 ===")
+            out(f"시간: {s[f'{key}_hour']}")
+            out(f"실내온도: {self.Troom[idx] - 273.15:.2f}°C")
+            out(f"외기온도: {self.Tsolair2[idx] - 273.15:.2f}°C")
+            out(f"난방부하: {self.qHeating[idx] / 1000:.2f}kW")
+
+    def save(self, path, weather=None):
+        # 메모리 맵 저장소로 기록 (greenhouse.store.open_result로 다시 열기)
+        from greenhouse.store import save_result
+        return save_result(self, path, weather)
+
+    def plot(self, show=False):
+        # 그래프 생성 (matplotlib은 이때 처음 import)
+        from greenhouse.plotting import plot_all
+        return plot_all(self, show=show)
@@ -0,0 +1,169 @@
+## 보온/단열 설계와 설정온도 최적화
+#
+# 후보 설계를 현재 탐색 상자 안에서 무작위로 뽑아 시나리오 축으로 한 번에 계산하고,
+# 가장 좋은 설계를 중심으로 상자를 줄여 가며 반복한다 (미분 없는 상자 축소 탐색).
+# 후보는 변수 범위의 RESOLUTION 배 격자에 맞춰 반올림하고, 이미 계산한 격자점은
+# 캐시에서 꺼내 다시 계산하지 않는다. 캐시는 기상데이터와 기준 설계가 같을 때만 재사용된다.
+#
+# 제약은 계산 결과 지표의 (하한, 상한)이다 (예: {'Troom_min': (5, None)} [°C]).
+# feedback=False 이면 실내온도는 설정온도와 무관한 자연 실내온도이므로 설정온도에 대한
+# 실내온도 제약은 feedback=True 모델에서 의미가 있다. Troom_min/Troom_max는 SimulationResult.summary와
+# 같이 초기값 (Troom_initial)을 포함한다.
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from greenhouse.heat_balance import CHOICE_PARAMS, DEFAULT_PARAMS, solve_heat_balance
+from greenhouse.sweep import CHUNK_SIZE
+from greenhouse.weather import resample_weather, steps_per_hour, weather_hash
+
+# 변수 이름 -> 기본 탐색 범위
+VARIABLES = {
+    'fr': (0.0, 0.6),
+    'rRoof': (0.5, 5.0),  # [m2K/W]
+    'rSideWall': (0.5, 5.0),  # [m2K/W]
+    'Tset_heating': (283.15, 293.15),  # [K]
+    'Tset_cooling': (295.15, 308.15),  # [K]
+}
+# 외피 모델에서만 쓰는 변수 (기본 VARIABLES에서 다른 외피 모델의 변수는 뺌)
+ENVELOPE_VARIABLES = {
+    'ht': ('fr',),
+    'r': ('rRoof', 'rSideWall'),
+}
+OBJECTIVE = ('annual_heating', 'annual_cooling')  # 합을 최소화할 지표
+METRICS = ('annual_heating', 'annual_cooling', 'peak_heating', 'peak_cooling', 'Troom_min', 'Troom_max',
+           'Troom_mean')
+POPULATION = 64  # 반복당 후보 수
+N_ITER = 12
+SHRINK = 0.6  # 반복마다 탐색 상자 폭 축소 비율
+RESOLUTION = 1e-3  # 격자 간격 (변수 범위 대비)
+
+
+class OptimizeResult(NamedTuple):
+    """
+    최적 설계와 지표 (열량 [kWh], 부하 [kW], 온도 [°C])
+    """
+    params: dict  # 최적 변수 값
+    objective: float
+    metrics: dict
+    feasible: bool
+    n_evaluations: int  # 실제 계산한 설계 수 (캐시 적중 제외)
+    n_requests: int  # 요청한 설계 수 (캐시 적중 포함)
+    history: list  # 반복별 (목적함수, 제약 위반량)
+
+
+def batch_metrics(table, weather, base=None, chunk_size=CHUNK_SIZE, method='auto'):
+    """
+    시나리오 표의 설계별 지표 (지표 이름 -> (시나리오 수,) 배열)
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(base or {})
+    steps = steps_per_hour(p['timestep'])
+    weather = resample_weather(weather, p['timestep'])
+    n = len(next(iter(table.values())))
+    out = {name: np.empty(n) for name in METRICS}
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        chunk = dict(p)
+        chunk.update({name: values[start:stop] for name, values in table.items()})
+        _, traj = solve_heat_balance(chunk, weather, lead=(stop - start,), method=method)
+        Troom_C = traj.Troom - 273.15
+        out['annual_heating'][start:stop] = traj.qHeating.sum(axis=-1) / 1000 / steps
+        out['annual_cooling'][start:stop] = traj.qCooling.sum(axis=-1) / 1000 / steps
+        out['peak_heating'][start:stop] = traj.qHeating.max(axis=-1) / 1000
+        out['peak_cooling'][start:stop] = traj.qCooling.max(axis=-1) / 1000
+        out['Troom_min'][start:stop] = Troom_C.min(axis=-1)
+        out['Troom_max'][start:stop] = Troom_C.max(axis=-1)
+        out['Troom_mean'][start:stop] = Troom_C.mean(axis=-1)
+    return out
+
+
+def _violation(metrics, constraints, values):
+    # 제약 위반량 합 (설정온도 순서: 난방 설정온도 < 냉방 설정온도)
+    total = 0.0
+    for name, (lo, hi) in constraints.items():
+        if lo is not None:
+            total += max(0.0, lo - metrics[name])
+        if hi is not None:
+            total += max(0.0, metrics[name] - hi)
+    if 'Tset_heating' in values and 'Tset_cooling' in values:
+        total += max(0.0, values['Tset_heating'] - values['Tset_cooling'])
+    return total
+
+
+def optimize(weather, base=None, variables=None, constraints=None, objective=OBJECTIVE, population=POPULATION,
+             n_iter=N_ITER, shrink=SHRINK, seed=0, cache=None, chunk_size=CHUNK_SIZE, method='auto'):
+    """
+    제약을 만족하면서 objective 지표의 합이 최소인 설계 탐색
+
+    weather     : 시간별 greenhouse.weather.Weather
+    base        : 고정할 설계와 모델 선택 (예: {'envelope': 'r', 'feedback': True})
+    variables   : 변수 이름 -> (하한, 상한) (기본 VARIABLES 중 base의 외피 모델에서 쓰는 변수)
+    constraints : 지표 이름 -> (하한, 상한), None이면 제한 없음 (지표는 METRICS)
+    cache       : 이전 optimize 호출의 캐시 dict (같은 기상데이터/기준 설계에서 재사용)
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(base or {})
+    if variables is None:
+        unused = {name for envelope, names in ENVELOPE_VARIABLES.items() if envelope != p['envelope']
+                  for name in names}
+        variables = {name: bounds for name, bounds in VARIABLES.items() if name not in unused}
+    variables = dict(variables)
+    constraints = dict(constraints or {})
+    for name in variables:
+        if name not in DEFAULT_PARAMS or name in CHOICE_PARAMS:
+            raise ValueError(f"{name!r} is not a numeric design parameter")
+    for name in list(constraints) + list(objective):
+        if name not in METRICS:
+            raise ValueError(f"unknown metric {name!r}, expected one of {list(METRICS)}")
+
+    names = tuple(variables)
+    lo, hi = np.array([variables[name] for name in names], dtype=float).T
+    res = (hi - lo) * RESOLUTION
+    cache = {} if cache is None else cache
+    context = (weather_hash(weather), repr(sorted((k, v) for k, v in p.items() if k not in variables)), names)
+    rng = np.random.default_rng(seed)
+    n_evaluations = n_requests = 0
+
+    def snap(X):
+        return np.clip(lo + np.round((X - lo) / res) * res, lo, hi)
+
+    def evaluate(X):
+        nonlocal n_evaluations, n_requests
+        keys = [(context, tuple(np.round((x - lo) / res).astype(np.int64).tolist())) for x in X]
+        n_requests += len(keys)
+        todo = list({key: i for i, key in enumerate(keys) if key not in cache}.values())  # 같은 격자점은 한 번만
+        if todo:
+            table = {name: X[todo, j] for j, name in enumerate(names)}
+            metrics = batch_metrics(table, weather, p, chunk_size, method)
+            for m, i in enumerate(todo):
+                cache[keys[i]] = {name: float(v[m]) for name, v in metrics.items()}
+            n_evaluations += len(todo)
+        return [cache[key] for key in keys]
+
+    def score(x, metrics):
+        values = dict(zip(names, x.tolist()))
+        return _violation(metrics, constraints, values), sum(metrics[name] for name in objective)
+
+    best_x, best_score = None, (math.inf, math.inf)
+    box_lo, box_hi = lo.copy(), hi.copy()
+    history = []
+    for _ in range(n_iter):
+        X = snap(box_lo + (box_hi - box_lo) * rng.random((population, len(names))))
+        if best_x is not None:
+            X[0] = best_x
+        for x, metrics in zip(X, evaluate(X)):
+            s = score(x, metrics)
+            if s < best_score:
+                best_x, best_score = x, s
+        history.append((best_score[1], best_score[0]))
+        half = (box_hi - box_lo) / 2 * shrink
+        box_lo, box_hi = np.maximum(lo, best_x - half), np.minimum(hi, best_x + half)
+        if np.all(box_hi - box_lo <= res):
+            break
+
+    metrics = evaluate(best_x[None])[0]
+    return OptimizeResult(dict(zip(names, best_x.tolist())), best_score[1], metrics, best_score[0] == 0,
+                          n_evaluations, n_requests, history)
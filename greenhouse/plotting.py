@@ -0,0 +1,166 @@
+## 결과 그래프 (matplotlib은 그래프를 그릴 때만 불러온다)
+
+import numpy as np
+
+from greenhouse.analysis import monthly_hourly
+from greenhouse.profiling import stage
+
+
+def _pyplot():
+    from matplotlib import pyplot as plt
+    return plt
+
+
+def plot_monthly_profiles(result, ylim=(-800, 400)):
+    # 1월, 4월, 7월, 10월의 시간별 평균 부하 [W/m2]
+    plt = _pyplot()
+    fig = plt.figure(figsize=(12, 8))
+    hours = range(24)
+    areaHouse = result.model.areaHouse
+    profile = monthly_hourly(result.qTotalHouse, stats=('mean',))['mean']
+    for month, style, label in ((1, 'r-s', 'Jan.'), (4, 'y-d', 'Apr.'), (7, 'g-^', 'Jul.'), (10, 'b-o', 'Oct.')):
+        plt.plot(hours, profile[month - 1] / areaHouse, style, label=label, markersize=8)
+    plt.xlabel('Time (hr)', fontsize=12)
+    plt.ylabel('Heating load (W/m²)', fontsize=12)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend(fontsize=12)
+    plt.xlim(0, 24)
+    plt.xticks(range(0, 25, 2))
+    plt.ylim(*ylim)
+    plt.tight_layout()
+    return fig
+
+
+def _hours(result):
+    # 스텝별 시간 축 [hr] (timestep이 60분보다 작으면 소수 시간)
+    return np.arange(result.n_steps) / result.steps_per_hour
+
+
+def _annual_axes(ax, n_hours, ylabel, title):
+    ax.set_xlabel('Time (hours)', fontsize=12)
+    ax.set_ylabel(ylabel, fontsize=12)
+    ax.set_title(title, fontsize=14)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.set_xticks(np.arange(0, n_hours + 1, 1000))
+
+
+def plot_total_load(result):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(15, 6))
+    time = _hours(result)
+    ax.plot(time, result.qTotalHouse / 1000, 'b-', label='Total Heat Load', linewidth=1)
+    _annual_axes(ax, result.n_hours, 'Heat Load (kW)', 'Annual Total Heat Load Variation')
+    ax.legend(fontsize=12)
+    fig.tight_layout()
+    return fig
+
+
+def plot_heating_cooling(result):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(15, 6))
+    time = _hours(result)
+    ax.plot(time, result.qTotalHouse / 1000, 'gray', label='Total Heat Load', alpha=0.5, linewidth=1)
+    ax.plot(time, result.qHeating / 1000, 'r-', label='Heating Load', linewidth=1)
+    ax.plot(time, result.qCooling / 1000, 'b-', label='Cooling Load', linewidth=1)
+    _annual_axes(ax, result.n_hours, 'Heat Load (kW)', 'Annual Heating and Cooling Load Variation')
+    ax.legend(fontsize=12)
+    fig.tight_layout()
+    return fig
+
+
+def plot_room_temperature(result):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(15, 6))
+    time = _hours(result)
+    ax.plot(time, result.Troom - 273.15, 'g-', label='Room Temperature', linewidth=1)
+    ax.axhline(y=result.model.Tset_heating - 273.15, color='r', linestyle='--', label='Heating Setpoint')
+    ax.axhline(y=result.model.Tset_cooling - 273.15, color='b', linestyle='--', label='Cooling Setpoint')
+    _annual_axes(ax, result.n_hours, 'Temperature (°C)', 'Annual Room Temperature Variation')
+    ax.legend(fontsize=12)
+    fig.tight_layout()
+    return fig
+
+
+def plot_heating_cooling_split(result):
+    plt = _pyplot()
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10))
+    time = _hours(result)
+    ax1.plot(time, result.qHeating / 1000, 'r-', label='Heating Load', linewidth=1)
+    _annual_axes(ax1, result.n_hours, 'Heating Load (kW)', 'Annual Heating Load Variation')
+    ax1.legend(fontsize=12)
+    ax2.plot(time, result.qCooling / 1000, 'b-', label='Cooling Load', linewidth=1)
+    _annual_axes(ax2, result.n_hours, 'Cooling Load (kW)', 'Annual Cooling Load Variation')
+    ax2.legend(fontsize=12)
+    fig.tight_layout()
+    return fig
+
+
+def plot_temperature_comparison(result):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(15, 6))
+    time = _hours(result)
+    Tsolair2_C = result.Tsolair2 - 273.15
+    Toutdoor_C = result.Toutdoor - 273.15
+    ax.plot(time, Tsolair2_C, 'r-', label='Equivalent Outdoor Temperature (Tsolair2)', linewidth=1)
+    ax.plot(time, result.Troom - 273.15, 'g-', label='Room Temperature', linewidth=1)
+    _annual_axes(ax, result.n_hours, 'Temperature (°C)', 'Annual Temperature Variation Comparison')
+    ax.legend(fontsize=10, loc='best')
+    ax.set_ylim(min(Tsolair2_C.min(), Toutdoor_C.min()) - 5, max(Tsolair2_C.max(), Toutdoor_C.max()) + 5)
+    fig.tight_layout()
+    return fig
+
+
+def plot_components(result):
+    # 성분별 열전달량 (gangnung_dandong_final2.py)
+    plt = _pyplot()
+    figs = []
+    styles = {'qRad': 'r-', 'qRoof': 'b-', 'qFloor': 'g-', 'qSideWall': 'purple', 'qFrontBack': 'brown', 'qVent': 'orange'}
+    for name, data in result.components().items():
+        fig, ax = plt.subplots(figsize=(15, 5))
+        time = _hours(result)
+        ax.plot(time, data / 1000, styles.get(name, 'k-'), label=name, linewidth=1)
+        ax.set_xlabel('Time (hours)')
+        ax.set_ylabel('Heat Transfer Rate (kW)')
+        ax.set_title(f'Annual Heat Transfer ({name})')
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.legend()
+        ax.set_xticks(np.arange(0, result.n_hours + 1, 1000))
+        fig.tight_layout()
+        fig.set_label(name)
+        figs.append(fig)
+    return figs
+
+
+# 그래프 이름 -> 생성 함수 (gangnung_dandong5_test.py 순서, 이어서 final2.py 성분별 그래프)
+FIGURES = {
+    'monthly_profiles': plot_monthly_profiles,
+    'total_load': plot_total_load,
+    'heating_cooling': plot_heating_cooling,
+    'room_temperature': plot_room_temperature,
+    'heating_cooling_split': plot_heating_cooling_split,
+    'temperature_comparison': plot_temperature_comparison,
+    'components': plot_components,
+}
+
+
+def make_figures(result, name):
+    """
+    이름으로 그래프 생성, (파일 이름, Figure) 목록 반환
+    """
+    with stage('plotting'):
+        out = FIGURES[name](result)
+    if isinstance(out, list):
+        return [(f'{name}_{fig.get_label()}', fig) for fig in out]
+    return [(name, out)]
+
+
+def plot_all(result, figures=None, show=False):
+    """
+    결과 그래프를 모두 생성 (show=True일 때만 plt.show() 호출)
+    """
+    figs = []
+    for name in (FIGURES if figures is None else figures):
+        figs.extend(fig for _, fig in make_figures(result, name))
+    if show:
+        _pyplot().show()
+    return figs
@@ -0,0 +1,204 @@
+## 단계별 계측 (벽시계/CPU 시간, 최대 메모리)
+#
+#   with profiling() as prof:
+#       result = GreenhouseModel().simulate(load_tmy('TMY3_Gangnung.xlsx'))
+#       result.print_summary()
+#   prof.write('profile.json')
+#
+# 환경변수 GREENHOUSE_PROFILE=<경로.json>을 주면 import 시 계측을 켜고 종료할 때
+# 보고서를 그 경로에 기록하고 단계별 표를 stderr로 출력한다 (스크립트 수정 없이 사용).
+# 꺼져 있을 때 stage()는 전역 변수 하나를 확인하고 공용 빈 컨텍스트를 돌려줄 뿐이다.
+# 단계 시간은 안쪽 단계를 포함한다 (예: plotting 안의 aggregation).
+# 여러 스레드에서 계측하면 단계 중첩은 스레드별로 따지고 시간은 스레드별 값을 합산한다.
+# tracemalloc은 프로세스 전체 값이므로 단계의 최대 메모리에는 동시에 실행 중인 다른
+# 스레드의 할당도 포함된다.
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_ENV = 'GREENHOUSE_PROFILE'
+
+# 계측하는 단계 이름
+STAGES = ('weather', 'properties', 'solair', 'integration', 'results', 'aggregation', 'plotting', 'reporting')
+
+_active = None
+
+
+class _NullStage:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'wall', 'cpu', 'base', 'peak')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter(self)
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        self.profiler._exit(self, wall, cpu)
+        return False
+
+
+class Profiler:
+    """
+    단계별 누적 시간과 최대 메모리 기록 (memory=True이면 tracemalloc 사용)
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.stats = {}
+        self._stacks = {}  # 스레드 id -> 열린 단계 목록
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self._wall = None
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._wall = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self._wall is not None:
+            self.total_wall = time.perf_counter() - self._wall
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def _enter(self, frame):
+        with self._lock:
+            if self.memory and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                self._raise_peaks(peak)
+                tracemalloc.reset_peak()
+                frame.base = current
+            else:
+                frame.base = 0
+            frame.peak = 0
+            self._stacks.setdefault(threading.get_ident(), []).append(frame)
+
+    def _raise_peaks(self, peak):
+        # 열린 단계 모두 (바깥 단계, 다른 스레드 단계 포함) 최대 메모리를 갱신 (reset_peak 전에 호출)
+        for stack in self._stacks.values():
+            for open_frame in stack:
+                open_frame.peak = max(open_frame.peak, peak - open_frame.base)
+
+    def _exit(self, frame, wall, cpu):
+        with self._lock:
+            if self.memory and tracemalloc.is_tracing():
+                self._raise_peaks(tracemalloc.get_traced_memory()[1])
+            ident = threading.get_ident()
+            stack = self._stacks[ident]
+            stack.pop()
+            if not stack:
+                del self._stacks[ident]
+            if any(open_frame.name == frame.name for open_frame in stack):
+                return  # 같은 이름의 바깥 단계에 이미 포함됨 (중복 집계 방지)
+            s = self.stats.setdefault(frame.name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'peak_memory': 0})
+            s['calls'] += 1
+            s['wall'] += wall
+            s['cpu'] += cpu
+            s['peak_memory'] = max(s['peak_memory'], frame.peak)
+
+    def report(self):
+        """
+        JSON으로 저장할 dict (시간 [s], 메모리 [byte], 단계는 처음 실행된 순서)
+        """
+        return {
+            'total_wall': getattr(self, 'total_wall', None),
+            'memory_traced': self.memory,
+            'stages': {name: dict(s) for name, s in self.stats.items()},
+        }
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=1)
+
+    def format(self):
+        lines = [f"{'stage':12s} {'calls':>6s} {'wall [ms]':>11s} {'cpu [ms]':>11s} {'peak [MB]':>10s}"]
+        for name, s in self.stats.items():
+            lines.append(f"{name:12s} {s['calls']:6d} {s['wall'] * 1000:11.3f} {s['cpu'] * 1000:11.3f} "
+                         f"{s['peak_memory'] / 1e6:10.2f}")
+        return '\n'.join(lines)
+
+
+def stage(name):
+    """
+    계측 구간 (계측이 꺼져 있으면 아무 일도 하지 않음)
+    """
+    profiler = _active
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(name)
+
+
+def enable(memory=True):
+    global _active
+    if _active is None:
+        _active = Profiler(memory).start()
+    return _active
+
+
+def disable():
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def active():
+    return _active
+
+
+@contextmanager
+def profiling(memory=True):
+    """
+    with 블록 안에서만 계측 (블록이 끝나면 Profiler에 결과가 남음)
+    """
+    global _active
+    previous = _active
+    profiler = _active = Profiler(memory).start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active = previous
+
+
+def _write_at_exit(path):
+    profiler = disable()
+    if profiler is not None:
+        profiler.write(path)
+        print(profiler.format(), file=sys.stderr)
+
+
+if os.environ.get(PROFILE_ENV):
+    enable()
+    atexit.register(_write_at_exit, os.environ[PROFILE_ENV])
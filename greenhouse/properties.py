@@ -0,0 +1,82 @@
+## 공기/물 물성치 (CoolProp)
+#
+# 스크립트가 쓰는 기준 물성치는 CoolProp으로 미리 계산해 REFERENCE_TABLE에 두고,
+# 표에 없는 온도/압력을 요청할 때만 CoolProp을 불러온다 (CoolProp import가 시작 시간의 대부분).
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+P_atm = 101325  # 대기압 [Pa]
+T_mean = 300  # 기준 온도 [K]
+
+# 온도별 공기 물성치 표 범위 [K] (-30 ~ 70 °C, 1 K 간격)
+AIR_TABLE_T_MIN = 243.15
+AIR_TABLE_T_MAX = 343.15
+AIR_TABLE_STEP = 1.0
+
+# (T [K], P [Pa]) -> (rhoAir [kg/m3], rhoWater [kg/m3], cAir [kJ/kgK], cWater [kJ/kgK])
+# PropsSI("D"/"C", "T", T, "P", P, "air"/"water") 값 (CoolProp 6.x)
+REFERENCE_TABLE = {
+    (300, 101325): (1.1769955883877592, 996.5569352651672, 1.0063739076641027, 4.180635776557353),
+}
+
+
+@lru_cache(maxsize=None)
+def coolprop_properties(T, P):
+    """
+    CoolProp으로 직접 계산한 물성치 (REFERENCE_TABLE 과 같은 순서)
+    """
+    from CoolProp.CoolProp import PropsSI
+
+    rhoAir = PropsSI("D", "T", T, "P", P, "air")
+    rhoWater = PropsSI("D", "T", T, "P", P, "water")
+    cAir = PropsSI("C", "T", T, "P", P, "air") / 1000
+    cWater = PropsSI("C", "T", T, "P", P, "water") / 1000
+    return rhoAir, rhoWater, cAir, cWater
+
+
+def reference_properties(T=T_mean, P=P_atm):
+    """
+    기준 온도/압력에서의 물성치
+    (rhoAir [kg/m3], rhoWater [kg/m3], cAir [kJ/kgK], cWater [kJ/kgK])
+    """
+    try:
+        return REFERENCE_TABLE[(T, P)]
+    except KeyError:
+        return coolprop_properties(T, P)
+
+
+class AirTable(NamedTuple):
+    """
+    온도별 공기 물성치 보간표
+    """
+    T: np.ndarray  # [K]
+    rhoAir: np.ndarray  # [kg/m3]
+    cAir: np.ndarray  # [kJ/kgK]
+
+
+@lru_cache(maxsize=None)
+def air_property_table(T_min=AIR_TABLE_T_MIN, T_max=AIR_TABLE_T_MAX, step=AIR_TABLE_STEP, P=P_atm):
+    """
+    운전 온도 범위의 공기 밀도/비열 표 (CoolProp 배열 호출 1회, 프로세스당 한 번만 계산)
+    """
+    from CoolProp.CoolProp import PropsSI
+
+    T = np.arange(T_min, T_max + step / 2, step)
+    rhoAir = np.asarray(PropsSI("D", "T", T, "P", P, "air"), dtype=float)
+    cAir = np.asarray(PropsSI("C", "T", T, "P", P, "air"), dtype=float) / 1000
+    for v in (T, rhoAir, cAir):
+        v.flags.writeable = False
+    return AirTable(T, rhoAir, cAir)
+
+
+def air_properties_at(T, table=None):
+    """
+    임의 형태의 온도 배열 [K]에 대한 (rhoAir [kg/m3], cAir [kJ/kgK]) 선형 보간
+    (표 범위 밖은 양 끝 값 사용)
+    """
+    table = air_property_table() if table is None else table
+    T = np.asarray(T, dtype=float)
+    return np.interp(T, table.T, table.rhoAir), np.interp(T, table.T, table.cAir)
@@ -0,0 +1,123 @@
+## 그래프 파일 일괄 저장 (비대화형 Agg 백엔드, 프로세스 풀 병렬 렌더링)
+#
+# 그래프 하나(결과 x 그래프 종류)를 작업 단위로 나눠 프로세스 풀에 분배한다.
+# 스윕 보고서는 시나리오 하나가 작업 단위이며, 작업자가 시나리오를 한 번 시뮬레이션한 뒤
+# 그 결과로 모든 그래프를 그리므로 시계열 배열을 주고받지 않는다
+# (기상데이터는 작업자 초기화 때 한 번만 전달).
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from greenhouse.plotting import FIGURES, make_figures
+from greenhouse.profiling import stage
+
+FORMATS = ('png',)
+DPI = 100
+
+_worker_weather = None
+
+
+def _use_agg():
+    import matplotlib
+
+    matplotlib.use('Agg')
+
+
+def _init_worker(weather):
+    global _worker_weather
+    _use_agg()
+    _worker_weather = weather
+
+
+def _save(result, name, path_base, formats, dpi):
+    # 그래프 하나를 만들어 형식별로 저장하고 닫음
+    from matplotlib import pyplot as plt
+
+    paths = []
+    for stem, fig in make_figures(result, name):
+        with stage('plotting'):
+            for fmt in formats:
+                path = os.path.join(path_base, f'{stem}.{fmt}')
+                fig.savefig(path, dpi=dpi, format=fmt)
+                paths.append(path)
+            plt.close(fig)
+    return paths
+
+
+def _render_result(job):
+    result, name, path_base, formats, dpi = job
+    return _save(result, name, path_base, formats, dpi)
+
+
+def _render_params(job):
+    from greenhouse.model import GreenhouseModel
+
+    # 시나리오 하나를 한 번만 계산하고 모든 그래프를 저장
+    params, figures, path_base, formats, dpi = job
+    result = GreenhouseModel(**params).simulate(_worker_weather)
+    return [path for name in figures for path in _save(result, name, path_base, formats, dpi)]
+
+
+def _run(worker, jobs, max_workers, weather=None):
+    # max_workers=0 이면 현재 프로세스에서 순서대로 렌더링 (현재 프로세스도 Agg 백엔드로 바뀜)
+    if max_workers == 0:
+        _init_worker(weather)
+        results = [worker(job) for job in jobs]
+    else:
+        n_workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (4 * n_workers))
+        with ProcessPoolExecutor(n_workers, initializer=_init_worker, initargs=(weather,)) as pool:
+            results = list(pool.map(worker, jobs, chunksize=chunksize))
+    return [path for paths in results for path in paths]
+
+
+def _named(items, default):
+    # 결과 하나, 목록, dict(이름 -> 결과) 모두 (이름, 결과) 목록으로
+    if isinstance(items, dict):
+        return list(items.items())
+    if isinstance(items, (list, tuple)):
+        return [(f'{i:03d}', item) for i, item in enumerate(items)]
+    return [(default, items)]
+
+
+def _jobs(named, out_dir, figures, formats, dpi):
+    jobs = []
+    for run_name, item in named:
+        path_base = os.path.join(out_dir, run_name)
+        os.makedirs(path_base, exist_ok=True)
+        jobs.extend((item, name, path_base, tuple(formats), dpi) for name in figures)
+    return jobs
+
+
+def render(results, out_dir, figures=None, formats=FORMATS, dpi=DPI, max_workers=None):
+    """
+    SimulationResult (하나, 목록 또는 이름 -> 결과 dict)의 그래프를 파일로 저장
+
+    out_dir/<실행 이름>/<그래프 이름>.<형식> 으로 저장하고 경로 목록을 반환한다.
+    formats : 'png', 'svg' 등 matplotlib 저장 형식
+    """
+    figures = list(FIGURES if figures is None else figures)
+    jobs = _jobs(_named(results, 'run'), out_dir, figures, formats, dpi)
+    return _run(_render_result, jobs, max_workers)
+
+
+def render_sweep(scenarios, weather, out_dir, base=None, figures=None, formats=FORMATS, dpi=DPI,
+                 max_workers=None):
+    """
+    스윕 시나리오별 그래프를 저장 (작업자가 시나리오를 직접 시뮬레이션)
+
+    scenarios : greenhouse.sweep.sweep 과 같은 시나리오 표
+    out_dir/<시나리오 번호>/<그래프 이름>.<형식>
+    """
+    from greenhouse.sweep import as_table
+
+    table = as_table(scenarios)
+    n = len(next(iter(table.values()))) if table else 1
+    rows = [dict(base or {}, **{name: values[i].item() for name, values in table.items()}) for i in range(n)]
+    figures = tuple(FIGURES if figures is None else figures)
+    jobs = []
+    for run_name, params in _named(rows, 'run'):
+        path_base = os.path.join(out_dir, run_name)
+        os.makedirs(path_base, exist_ok=True)
+        jobs.append((params, figures, path_base, tuple(formats), dpi))
+    return _run(_render_params, jobs, max_workers, weather)
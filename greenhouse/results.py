@@ -0,0 +1,137 @@
+## 시간별 결과 컨테이너 (선언된 채널 중 필요한 것만, 지정한 dtype으로 보관)
+#
+# 스크립트는 실행마다 15개 이상의 float64 계열을 만들지만 대부분의 분석은
+# Troom, qHeating, qCooling 정도만 쓴다. 채널을 골라 float32로 저장하면
+# 시나리오당 메모리가 채널 수와 dtype 크기에 비례해 줄어든다.
+
+import numpy as np
+
+from greenhouse.profiling import stage
+
+# 채널 이름 -> (단위, 설명)
+CHANNELS = {
+    'Troom': ('K', '실내온도'),
+    'qTotalHouse': ('W', '총 열부하'),
+    'qHeating': ('W', '난방부하'),
+    'qCooling': ('W', '냉방부하'),
+    'mode': ('-', '운전 모드 (0 중립, 1 난방, 2 냉방)'),
+    'Tsolair2': ('K', '등가 외기온도'),
+    'Toutdoor': ('K', '외기온도'),
+    'qRad': ('W', '일사 열획득'),
+    'qRoof': ('W', '지붕 열전달'),
+    'qFloor': ('W', '바닥 열전달'),
+    'qSideWall': ('W', '측벽 열전달'),
+    'qFrontBack': ('W', '전후면 열전달'),
+    'qVent': ('W', '환기 열전달'),
+    'qWindow': ('W', '창문 열전달'),
+    'qDoor': ('W', '문 열전달'),
+}
+
+COMPONENT_CHANNELS = ('qRad', 'qRoof', 'qFloor', 'qSideWall', 'qFrontBack', 'qVent', 'qWindow', 'qDoor')
+TRAJECTORY_CHANNELS = ('Troom', 'qTotalHouse', 'qHeating', 'qCooling', 'mode')
+
+MODE_DTYPE = np.int8  # mode 채널은 dtype 지정과 무관하게 int8
+
+
+def check_channels(channels):
+    """
+    채널 목록 검증 (None이면 전체 채널)
+    """
+    if channels is None:
+        return tuple(CHANNELS)
+    channels = tuple(channels)
+    unknown = [name for name in channels if name not in CHANNELS]
+    if unknown:
+        raise ValueError(f"unknown channel(s) {', '.join(map(repr, unknown))}, expected some of {list(CHANNELS)}")
+    return channels
+
+
+def channel_values(name, heat_balance, trajectory, Toutdoor):
+    """
+    HeatBalance/Trajectory에서 채널 하나를 계산 (성분 열전달량은 요청할 때만 계산)
+    """
+    if name in TRAJECTORY_CHANNELS:
+        return getattr(trajectory, name)
+    shape = trajectory.Troom.shape
+    if name == 'Tsolair2':
+        return np.broadcast_to(heat_balance.Tsolair2, shape)
+    if name == 'Toutdoor':
+        return np.broadcast_to(Toutdoor, shape)
+    if name == 'qRad':
+        return np.broadcast_to(heat_balance.qRad, shape)
+    if name in heat_balance.components:
+        U, Tdrive = heat_balance.components[name]
+        if heat_balance.Troom_load is not None:  # room='open_loop'
+            return np.broadcast_to(U * (Tdrive - heat_balance.Troom_load), shape)
+        return U * (Tdrive - trajectory.Troom)
+    return None  # 현재 외피/환기 모델에 없는 성분 (예: 'r' 외피의 qFrontBack)
+
+
+def collect(heat_balance, trajectory, Toutdoor, channels=None, dtype=np.float64, out=None, index=()):
+    """
+    요청한 채널만 dtype 배열로 모음
+
+    out이 주어지면 out[name][index]에 채워 넣는다 (스윕 결과를 미리 할당해 둘 때).
+    """
+    channels = check_channels(channels)
+    data = {} if out is None else out
+    with stage('results'):
+        for name in channels:
+            values = channel_values(name, heat_balance, trajectory, Toutdoor)
+            if values is None:
+                continue
+            if out is None:
+                data[name] = np.asarray(values, dtype=MODE_DTYPE if name == 'mode' else dtype)
+            else:
+                data[name][index] = values
+    return data
+
+
+class ResultSet:
+    """
+    채널 이름 -> (..., 시간) 배열 모음
+
+    채널은 속성으로도 읽을 수 있다 (result.Troom). 저장하지 않은 채널을 읽으면 AttributeError.
+    스윕이면 params는 시나리오 표, base는 시나리오 공통 설계 변수이다.
+    """
+
+    def __init__(self, data, params=None, base=None):
+        self.data = dict(data)
+        self.params = {} if params is None else params
+        self.base = {} if base is None else base
+
+    def __getattr__(self, name):
+        data = self.__dict__.get('data', {})
+        if name in data:
+            return data[name]
+        if name in CHANNELS:
+            raise AttributeError(f"channel {name!r} was not stored (stored: {list(data)})")
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __contains__(self, name):
+        return name in self.data
+
+    @property
+    def channels(self):
+        return tuple(self.data)
+
+    @property
+    def n_steps(self):
+        return next(iter(self.data.values())).shape[-1]
+
+    @property
+    def n_hours(self):
+        return self.n_steps
+
+    @property
+    def nbytes(self):
+        return sum(v.nbytes for v in self.data.values())
+
+    @classmethod
+    def allocate(cls, shape, channels=None, dtype=np.float64, params=None, available=None, base=None):
+        """
+        채널별 빈 배열 할당 (available: 실제로 계산되는 채널만 남길 때 사용)
+        """
+        channels = [name for name in check_channels(channels) if available is None or name in available]
+        data = {name: np.empty(shape, dtype=MODE_DTYPE if name == 'mode' else dtype) for name in channels}
+        return cls(data, params, base)
@@ -0,0 +1,178 @@
+## 설계 변수 민감도 분석 (one-at-a-time + 분산 기반 Sobol 지수)
+#
+# 표본 설계를 모두 시나리오 표로 만든 뒤 greenhouse.sweep.sweep 으로 청크 단위
+# 벡터 계산을 하고, 청크는 프로세스 풀에 나눠 보낸다 (기상데이터는 작업자 초기화 때 한 번).
+# Sobol 지수는 Saltelli 표본 (A, B, AB_i 행렬, N (k + 2)회 계산)과 Jansen 추정식을 쓴다.
+# 선택한 외피 모델에서 쓰지 않는 변수 (예: 'ht' 외피의 rRoof)는 지수가 0이다.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from greenhouse.heat_balance import DEFAULT_PARAMS
+from greenhouse.sweep import CHUNK_SIZE, sweep
+
+FACTORS = ('ht', 'hs', 'fr', 'hv', 'Agh', 'transGlass', 'fracSolarWindow', 'alpha_roof', 'rRoof', 'rSideWall')
+OUTPUTS = ('annual_heating', 'annual_cooling', 'peak_heating')  # greenhouse.sweep.SweepResult 필드
+RELATIVE_RANGE = 0.2  # 범위를 주지 않은 변수는 기준값 +-20%
+FRACTION_PARAMS = ('fr', 'transGlass', 'fracSolarWindow', 'alpha_roof', 'epsilon')  # 0~1 사이로 제한
+N_SAMPLES = 256
+
+_worker_weather = None
+
+
+class SensitivityResult(NamedTuple):
+    """
+    변수별 민감도 (각 dict는 출력 이름 -> (변수 수,) 배열)
+    """
+    factors: tuple
+    bounds: dict  # 변수 이름 -> (하한, 상한)
+    baseline: dict  # 출력 이름 -> 기준 설계 값
+    oat: dict  # one-at-a-time 탄성도 (출력 변화율 / 변수 변화율, 범위 양 끝 차분)
+    S1: dict  # 1차 Sobol 지수
+    ST: dict  # 전체 Sobol 지수
+    n_evaluations: int
+
+    def ranking(self, output, index='ST'):
+        """
+        지수가 큰 순서의 (변수, 값) 목록 (index: 'ST', 'S1', 'oat' — oat는 절댓값 기준)
+        """
+        values = getattr(self, index)[output]
+        order = np.argsort(-np.abs(values) if index == 'oat' else -values, kind='stable')
+        return [(self.factors[i], float(values[i])) for i in order]
+
+    def format(self, index='ST'):
+        lines = []
+        for output in self.baseline:
+            lines.append(f"=== {output} ({index}) ===")
+            for name, value in self.ranking(output, index):
+                lines.append(f"{name:16s} {value:10.4f}")
+        return '\n'.join(lines)
+
+
+def factor_bounds(base=None, factors=FACTORS, bounds=None, relative=RELATIVE_RANGE):
+    """
+    변수별 (하한, 상한) (bounds에 없는 변수는 기준값 x (1 +- relative), 비율 변수는 0~1로 제한)
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(base or {})
+    bounds = dict(bounds or {})
+    out = {}
+    for name in factors:
+        if name not in DEFAULT_PARAMS:
+            raise ValueError(f"unknown parameter {name!r}")
+        if name in bounds:
+            lo, hi = bounds[name]
+        else:
+            lo, hi = p[name] * (1 - relative), p[name] * (1 + relative)
+            if name in FRACTION_PARAMS:
+                lo, hi = max(lo, 0.0), min(hi, 1.0)
+        if not lo < hi:
+            raise ValueError(f"{name!r}: lower bound {lo!r} must be below upper bound {hi!r}")
+        out[name] = (float(lo), float(hi))
+    return out
+
+
+def _init_worker(weather):
+    global _worker_weather
+    _worker_weather = weather
+
+
+def _evaluate_chunk(job):
+    table, base, method = job
+    result = sweep(table, _worker_weather, base=base, chunk_size=len(next(iter(table.values()))), method=method)
+    return np.stack([getattr(result, name) for name in OUTPUTS])
+
+
+def evaluate(table, weather, base=None, chunk_size=CHUNK_SIZE, max_workers=None, method='auto'):
+    """
+    시나리오 표 전체를 청크로 나눠 계산한 출력 (출력 이름 -> (시나리오 수,) 배열)
+
+    max_workers : 프로세스 수 (0이면 현재 프로세스에서 순서대로 계산)
+    """
+    n = len(next(iter(table.values())))
+    jobs = [({name: values[start:start + chunk_size] for name, values in table.items()}, base, method)
+            for start in range(0, n, chunk_size)]
+    if max_workers == 0 or len(jobs) == 1:
+        _init_worker(weather)
+        parts = [_evaluate_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers or os.cpu_count() or 1, initializer=_init_worker,
+                                 initargs=(weather,)) as pool:
+            parts = list(pool.map(_evaluate_chunk, jobs))
+    values = np.concatenate(parts, axis=1)
+    return {name: values[i] for i, name in enumerate(OUTPUTS)}
+
+
+def saltelli_samples(bounds, n_samples=N_SAMPLES, seed=0):
+    """
+    Saltelli 표본 (A, B, AB) — A, B는 (N, k), AB는 (k, N, k) (AB[i]는 A의 i열을 B로 바꾼 것)
+    """
+    lo, hi = np.array(list(bounds.values())).T
+    rng = np.random.default_rng(seed)
+    A = lo + (hi - lo) * rng.random((n_samples, len(lo)))
+    B = lo + (hi - lo) * rng.random((n_samples, len(lo)))
+    AB = np.repeat(A[None], len(lo), axis=0)
+    for i in range(len(lo)):
+        AB[i, :, i] = B[:, i]
+    return A, B, AB
+
+
+def sobol_indices(f_A, f_B, f_AB):
+    """
+    1차/전체 Sobol 지수 (Saltelli 2010 1차 추정식, Jansen 전체 추정식)
+
+    f_A, f_B : (N,) 출력, f_AB : (k, N) 출력
+    평균이 분산에 비해 큰 출력(최대 부하 등)에서 추정 오차가 커지지 않도록 평균을 빼고 계산한다.
+    """
+    mean = np.mean(np.concatenate([f_A, f_B]))
+    f_A, f_B, f_AB = f_A - mean, f_B - mean, f_AB - mean
+    V = np.var(np.concatenate([f_A, f_B]))
+    if V == 0:
+        return np.zeros(len(f_AB)), np.zeros(len(f_AB))
+    S1 = np.mean(f_B * (f_AB - f_A), axis=-1) / V
+    ST = 0.5 * np.mean((f_A - f_AB) ** 2, axis=-1) / V
+    return S1, ST
+
+
+def sensitivity(weather, base=None, factors=FACTORS, bounds=None, n_samples=N_SAMPLES, seed=0,
+                chunk_size=CHUNK_SIZE, max_workers=None, method='auto'):
+    """
+    one-at-a-time 탄성도와 Sobol 지수를 한 번에 계산
+
+    weather   : 시간별 greenhouse.weather.Weather
+    base      : 기준 설계 (나머지 변수와 모델 선택, 예: {'envelope': 'r'})
+    bounds    : 변수 이름 -> (하한, 상한) (없으면 기준값 +-20%)
+    n_samples : Saltelli 기본 표본 수 N (총 계산 횟수는 N (k + 2) + 2k + 1)
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(base or {})
+    factors = tuple(factors)
+    bounds = factor_bounds(p, factors, bounds)
+    k = len(factors)
+    x0 = np.array([float(p[name]) for name in factors])
+    lo, hi = np.array([bounds[name] for name in factors]).T
+
+    # 기준 설계, 변수별 하한/상한 (2k + 1), Saltelli 표본 (N (k + 2))을 한 표로 모아 계산
+    oat = np.repeat(x0[None], 2 * k + 1, axis=0)
+    oat[1 + np.arange(k), np.arange(k)] = lo
+    oat[1 + k + np.arange(k), np.arange(k)] = hi
+    A, B, AB = saltelli_samples(bounds, n_samples, seed)
+    X = np.concatenate([oat, A, B, AB.reshape(-1, k)])
+    outputs = evaluate({name: X[:, i] for i, name in enumerate(factors)}, weather, p, chunk_size, max_workers,
+                       method)
+
+    N = n_samples
+    baseline, elasticity, S1, ST = {}, {}, {}, {}
+    for name, y in outputs.items():
+        y0 = y[0]
+        y_lo, y_hi = y[1:1 + k], y[1 + k:1 + 2 * k]
+        f_A, f_B = y[2 * k + 1:2 * k + 1 + N], y[2 * k + 1 + N:2 * k + 1 + 2 * N]
+        f_AB = y[2 * k + 1 + 2 * N:].reshape(k, N)
+        baseline[name] = float(y0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            elasticity[name] = np.where(y0 != 0, (y_hi - y_lo) / y0 / ((hi - lo) / np.where(x0 != 0, x0, 1)), 0.0)
+        S1[name], ST[name] = sobol_indices(f_A, f_B, f_AB)
+    return SensitivityResult(factors, bounds, baseline, elasticity, S1, ST, len(X))
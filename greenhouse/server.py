@@ -0,0 +1,278 @@
+## 로컬 시뮬레이션 서버 (asyncio, 줄 단위 JSON)
+#
+#   python -m greenhouse.server --port 8765 --preload TMY3_Gangnung.xlsx
+#   python -m greenhouse.server --socket /tmp/greenhouse.sock
+#
+# 요청과 응답은 한 줄에 JSON 객체 하나이며, 한 연결로 여러 요청을 차례로 보낼 수 있다.
+#
+#   {"id": 1, "op": "simulate", "weather": "TMY3_Gangnung.xlsx", "params": {"fr": 0.4}}
+#   -> {"id": 1, "ok": true, "result": {"summary": {...}}}
+#   -> {"id": 1, "ok": false, "error": "ValueError: ..."}
+#
+# op: ping, weather (읽어서 보관), simulate (summary, channels를 주면 시간별 계열도),
+#     sweep (시나리오별 연간 집계 rows), stats, shutdown
+#
+# 기상데이터는 서버 프로세스가 경로별로 한 번 읽어 보관하고 (파일 수정시각이 바뀌면 다시 읽음)
+# 요청마다 배열을 작업자에 넘긴다. CPU 계산은 프로세스 풀에서 하며, 작업자는 시작할 때
+# 짧은 계산을 한 번 돌려 import, 공기 물성치 (CoolProp), numba JIT 컴파일을 미리 끝내고
+# 설계 변수별 GreenhouseModel 객체를 보관한다.
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from greenhouse.weather import Weather, load_tmy, weather_hash
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_LINE = 2 ** 26  # 요청 한 줄 최대 크기 (큰 시나리오 표)
+MAX_MODELS = 256  # 작업자가 보관하는 모델 수
+WARMUP_HOURS = 48
+OPS = ('ping', 'weather', 'simulate', 'sweep', 'stats', 'shutdown')
+
+_models = {}
+
+
+def _warm_up():
+    # 작업자 초기화: 첫 요청에서 컴파일/물성치 계산을 하지 않도록 짧은 기상데이터로 한 번씩 계산
+    from greenhouse.model import GreenhouseModel
+
+    weather = Weather(*(np.full(WARMUP_HOURS, v) for v in (273.15, 2.0, 1000.0, 100.0)))
+    try:
+        for params in ({}, {'feedback': True}, {'feedback': True, 'integrator': 'exponential'},
+                       {'air_properties': 'table'}):
+            GreenhouseModel(**params).simulate(weather, channels=('qHeating',))
+    except Exception:  # 같은 오류는 실제 요청에서 다시 보고된다
+        pass
+
+
+def _model(params):
+    from greenhouse.model import GreenhouseModel
+
+    key = json.dumps(params, sort_keys=True)
+    model = _models.pop(key, None)
+    if model is None:
+        model = GreenhouseModel(**params)
+        if len(_models) >= MAX_MODELS:
+            _models.pop(next(iter(_models)))  # 가장 오래 쓰지 않은 모델
+    _models[key] = model
+    return model
+
+
+def _simulate_job(weather, params, channels=None, method='auto'):
+    from greenhouse.sites import SUMMARY_CHANNELS
+
+    stored = SUMMARY_CHANNELS if channels is None else tuple(dict.fromkeys(SUMMARY_CHANNELS + tuple(channels)))
+    result = _model(params).simulate(weather, method=method, channels=stored)
+    out = {'summary': result.summary()}
+    if channels is not None:
+        out['series'] = {name: result.data[name].tolist() for name in channels if name in result.data}
+    return out
+
+
+def _sweep_job(weather, scenarios, base=None, method='auto'):
+    from greenhouse.sweep import sweep
+
+    return {'rows': sweep(scenarios, weather, base=base, method=method).rows()}
+
+
+class SimulationServer:
+    """
+    기상데이터와 작업자 프로세스를 유지하는 요청 처리기
+
+    max_workers : 작업자 프로세스 수 (0이면 서버 프로세스에서 순서대로 계산)
+    preload     : 시작할 때 읽어 둘 기상데이터 경로 목록
+    """
+
+    def __init__(self, max_workers=None, preload=()):
+        self.max_workers = max_workers
+        self.preload = list(preload)
+        self.weathers = {}  # 절대 경로 -> (수정시각, Weather, sha1)
+        self.pool = None
+        self.requests = 0
+        self.errors = 0
+        self.started = None
+        self._stop = None
+        self._connections = {}  # 연결 처리 작업 -> (StreamReader, StreamWriter)
+
+    async def _weather(self, path):
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        entry = self.weathers.get(path)
+        if entry is None or entry[0] != mtime:
+            loop = asyncio.get_running_loop()
+            weather = await loop.run_in_executor(None, load_tmy, path)
+            entry = (mtime, weather, weather_hash(weather))
+            self.weathers[path] = entry
+        return entry
+
+    async def _run(self, func, *args):
+        if self.pool is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    async def dispatch(self, request):
+        op = request.get('op')
+        if op == 'ping':
+            return {'pid': os.getpid()}
+        if op == 'weather':
+            _, weather, sha1 = await self._weather(request['weather'])
+            return {'n_hours': weather.n_hours, 'sha1': sha1}
+        if op == 'simulate':
+            _, weather, _ = await self._weather(request['weather'])
+            return await self._run(_simulate_job, weather, request.get('params') or {}, request.get('channels'),
+                                   request.get('method', 'auto'))
+        if op == 'sweep':
+            _, weather, _ = await self._weather(request['weather'])
+            scenarios = {name: np.asarray(values) for name, values in request['scenarios'].items()}
+            return await self._run(_sweep_job, weather, scenarios, request.get('base'),
+                                   request.get('method', 'auto'))
+        if op == 'stats':
+            return {'requests': self.requests, 'errors': self.errors, 'uptime': time.monotonic() - self.started,
+                    'weather': sorted(self.weathers), 'workers': self.max_workers}
+        if op == 'shutdown':
+            self._stop.set()
+            return {}
+        raise ValueError(f"unknown op {op!r}, expected one of {list(OPS)}")
+
+    async def handle(self, reader, writer):
+        self._connections[asyncio.current_task()] = (reader, writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # MAX_LINE보다 긴 줄 (asyncio.LimitOverrunError): 줄 경계를 잃었으므로 오류 응답 후 연결 종료
+                    self.requests += 1
+                    self.errors += 1
+                    await self._respond(writer, {'id': None, 'ok': False,
+                                                 'error': f"ValueError: request line exceeds {MAX_LINE} bytes"})
+                    break
+                if not line:
+                    break
+                self.requests += 1
+                request = {}
+                try:
+                    request = json.loads(line)
+                    response = {'id': request.get('id'), 'ok': True, 'result': await self.dispatch(request)}
+                except Exception as e:  # 요청 오류는 응답으로 돌려주고 연결은 유지
+                    self.errors += 1
+                    response = {'id': request.get('id') if isinstance(request, dict) else None, 'ok': False,
+                                'error': f"{type(e).__name__}: {e}"}
+                await self._respond(writer, response)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # 이벤트 루프 종료 (Ctrl-C 등): 취소된 채로 끝나면 asyncio가 연결마다 traceback을 출력
+            pass
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def _respond(self, writer, response):
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """
+        path를 주면 Unix 소켓, 아니면 host:port에서 shutdown 요청이 올 때까지 실행
+        """
+        self.started = time.monotonic()
+        self._stop = asyncio.Event()
+        if self.max_workers != 0:
+            n = self.max_workers or os.cpu_count() or 1
+            self.pool = ProcessPoolExecutor(n, initializer=_warm_up)
+            # 작업자는 첫 작업 때 시작되므로 연결을 받기 전에 모두 띄워 데워 둠
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid) for _ in range(n)))
+        else:
+            _warm_up()
+        try:
+            for weather_path in self.preload:
+                await self._weather(weather_path)
+            if path is not None:
+                server = await asyncio.start_unix_server(self.handle, path, limit=MAX_LINE)
+            else:
+                server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+            async with server:
+                await self._stop.wait()
+                # 열린 연결은 취소하지 않고 EOF를 넣어 처리 중인 요청의 응답을 보낸 뒤 끝나게 함
+                for reader, writer in self._connections.values():
+                    writer.transport.pause_reading()  # EOF 뒤에 받은 데이터는 읽지 않음
+                    reader.feed_eof()
+                await asyncio.gather(*self._connections, return_exceptions=True)
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown(cancel_futures=True)
+                self.pool = None
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, max_workers=None, preload=()):
+    asyncio.run(SimulationServer(max_workers, preload).serve(host, port, path))
+
+
+class Client:
+    """
+    서버 연결 (동기, 연결 하나로 여러 요청)
+
+    with Client(port=8765) as client:
+        summary = client.call('simulate', weather='TMY3_Gangnung.xlsx', params={'fr': 0.4})['summary']
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, timeout=None):
+        if path is not None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(path)
+        else:
+            self.sock = socket.create_connection((host, port), timeout)
+        self.file = self.sock.makefile('rb')
+        self._id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def call(self, op, **payload):
+        """
+        요청 하나를 보내고 result를 반환 (서버 오류는 RuntimeError)
+        """
+        self._id += 1
+        self.sock.sendall(json.dumps({'id': self._id, 'op': op, **payload}).encode('utf-8') + b'\n')
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        response = json.loads(line)
+        if not response['ok']:
+            raise RuntimeError(response['error'])
+        return response['result']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='greenhouse 로컬 시뮬레이션 서버')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--socket', help='Unix 소켓 경로 (주면 host/port 대신 사용)')
+    parser.add_argument('--workers', type=int, help='작업자 프로세스 수 (0이면 서버 프로세스에서 계산)')
+    parser.add_argument('--preload', action='append', default=[], help='미리 읽어 둘 TMY 파일 (반복 가능)')
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.socket, args.workers, args.preload)
+
+
+if __name__ == '__main__':
+    main()
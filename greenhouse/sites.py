@@ -0,0 +1,119 @@
+## 여러 관측소(TMY 파일) 일괄 계산
+#
+# 엑셀 파싱은 파일 읽기와 파서 대기가 대부분이므로 스레드 풀에서 동시에 읽고,
+# 읽기가 끝난 관측소부터 바로 프로세스 풀에 시뮬레이션을 넘긴다.
+# 결과는 관측소 x 지표 표 (SiteTable)로 모은다.
+
+import csv
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import NamedTuple
+
+import numpy as np
+
+from greenhouse.weather import load_tmy
+
+# 기본 지표 (SimulationResult.summary 키)
+SITE_METRICS = ('annual_heating', 'annual_cooling', 'peak_heating', 'peak_heating_hour', 'peak_cooling',
+                'Troom_mean', 'Troom_min')
+SUMMARY_CHANNELS = ('Troom', 'qTotalHouse', 'qHeating', 'qCooling', 'Tsolair2')  # summary에 필요한 채널
+TMY_PATTERN = '*.xlsx'
+
+
+class SiteTable(NamedTuple):
+    """
+    관측소 x 지표 표 (values[i, j] = sites[i]의 metrics[j])
+    """
+    sites: tuple  # 관측소 이름 (파일 이름에서 확장자를 뺀 것)
+    metrics: tuple
+    values: np.ndarray
+
+    def __len__(self):
+        return len(self.sites)
+
+    def column(self, metric):
+        return self.values[:, self.metrics.index(metric)]
+
+    def rows(self):
+        # 관측소별 dict 목록 (출력/저장용)
+        return [dict(site=site, **dict(zip(self.metrics, row.tolist()))) for site, row in zip(self.sites, self.values)]
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(('site',) + self.metrics)
+            for site, row in zip(self.sites, self.values):
+                writer.writerow([site] + row.tolist())
+
+
+def tmy_files(paths, pattern=TMY_PATTERN):
+    """
+    디렉터리(안의 pattern 파일) 또는 파일 경로 목록을 (관측소 이름, 경로) 목록으로
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, pattern))))
+        else:
+            files.append(os.fspath(path))
+    named = [(os.path.splitext(os.path.basename(path))[0], path) for path in files]
+    names = [name for name, _ in named]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate site name(s) {', '.join(duplicates)}, pass files with distinct names")
+    return named
+
+
+def load_sites(paths, max_workers=None, **load_kwargs):
+    """
+    TMY 파일들을 스레드 풀에서 동시에 읽어 관측소 이름 -> Weather dict로 반환 (입력 순서 유지)
+    """
+    named = tmy_files(paths)
+    with ThreadPoolExecutor(max_workers) as pool:
+        loaded = list(pool.map(lambda item: load_tmy(item[1], **load_kwargs), named))
+    return {name: weather for (name, _), weather in zip(named, loaded)}
+
+
+def _simulate_site(job):
+    from greenhouse.model import GreenhouseModel
+
+    params, weather, metrics = job
+    summary = GreenhouseModel(**params).simulate(weather, channels=SUMMARY_CHANNELS).summary()
+    unknown = [name for name in metrics if name not in summary]
+    if unknown:
+        raise ValueError(f"unknown metric(s) {', '.join(map(repr, unknown))}, expected some of {list(summary)}")
+    return [summary[name] for name in metrics]
+
+
+def run_sites(paths, params=None, metrics=SITE_METRICS, load_workers=None, max_workers=None, **load_kwargs):
+    """
+    관측소별로 같은 설계(params)를 계산한 관측소 x 지표 표
+
+    paths        : TMY 파일이 든 디렉터리 또는 파일 경로 목록
+    load_workers : 엑셀 읽기 스레드 수
+    max_workers  : 시뮬레이션 프로세스 수 (0이면 현재 프로세스에서 순서대로 계산)
+    """
+    from greenhouse.model import GreenhouseModel
+
+    params = dict(params or {})
+    GreenhouseModel(**params)  # 작업자로 보내기 전에 변수 이름/값 검증
+    metrics = tuple(metrics)
+    named = tmy_files(paths)
+    values = np.empty((len(named), len(metrics)))
+    index = {name: i for i, (name, _) in enumerate(named)}
+    with ThreadPoolExecutor(load_workers) as loader:
+        loads = {loader.submit(load_tmy, path, **load_kwargs): name for name, path in named}
+        if max_workers == 0:
+            for future in as_completed(loads):
+                values[index[loads[future]]] = _simulate_site((params, future.result(), metrics))
+        else:
+            with ProcessPoolExecutor(max_workers) as pool:
+                # 읽기가 끝난 관측소부터 시뮬레이션 제출
+                runs = {pool.submit(_simulate_site, (params, future.result(), metrics)): loads[future]
+                        for future in as_completed(loads)}
+                for future in as_completed(runs):
+                    values[index[runs[future]]] = future.result()
+    return SiteTable(tuple(name for name, _ in named), metrics, values)
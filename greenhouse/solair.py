@@ -0,0 +1,71 @@
+## 등가 외기온도(sol-air temperature) 계산
+
+import numpy as np
+
+from greenhouse.properties import T_mean
+
+H_OUT_FIXED = 17  # 고정 외표면 열전달계수 [W/m2K]
+DR_LONGWAVE = 63  # 장파장 복사 손실 [W/m2]
+
+
+def solair_fixed(Toutdoor, radSolar, Vwind=None, alpha_roof=0.2, h_out=H_OUT_FIXED):
+    """
+    고정 열전달계수(/17) 등가 외기온도 [K]
+    (gangnung_dandong5_test.py, gangnung_dandong_final.py 방식)
+    """
+    Toutdoor = np.asarray(Toutdoor, dtype=float)
+    radSolar = np.asarray(radSolar, dtype=float)
+    return Toutdoor + (alpha_roof * radSolar) / h_out
+
+
+def solair_wind(Toutdoor, radSolar, Vwind, alpha_roof=0.2, epsilon=0.9):
+    """
+    풍속 보정 + 장파장 복사 보정 등가 외기온도 [K]
+    (gangnung_dandong5_2.py, gangnung_dandong_v1.py 방식)
+    """
+    if Vwind is None:
+        raise ValueError("the 'wind' sol-air model needs Vwind")
+    Toutdoor = np.asarray(Toutdoor, dtype=float)
+    radSolar = np.asarray(radSolar, dtype=float)
+    h_out_corrected = 5.7 + 3.8 * np.asarray(Vwind, dtype=float)  # 풍속 보정된 열전달계수 [W/m2K]
+    dT_longwave = (epsilon * DR_LONGWAVE) / h_out_corrected  # 장파장 복사 보정항 [K]
+    return Toutdoor + (alpha_roof * radSolar) / h_out_corrected - dT_longwave
+
+
+def solair_constant(Toutdoor, radSolar=None, Vwind=None, Tsolair=T_mean):
+    """
+    기상데이터와 무관한 고정 등가 외기온도 [K]
+    (gangnung_dandong4.py 방식)
+    """
+    return np.full(np.shape(Toutdoor), float(Tsolair))
+
+
+SOLAIR_MODELS = {
+    'fixed': solair_fixed,
+    'wind': solair_wind,
+    'constant': solair_constant,
+}
+
+
+def calculate_Tsolair2(Toutdoor, radSolar, Vwind=None, model='fixed', **coeffs):
+    """
+    등가 외기온도 배열 계산
+
+    입력 배열은 (시간,) 또는 (연도/지점, ..., 시간) 형태 모두 가능하며
+    NumPy 브로드캐스팅으로 한 번에 계산한다.
+    """
+    try:
+        func = SOLAIR_MODELS[model]
+    except KeyError:
+        raise ValueError(f"unknown sol-air model {model!r}, expected one of {sorted(SOLAIR_MODELS)}") from None
+    return func(Toutdoor, radSolar, Vwind, **coeffs)
+
+
+def Tsolair2_from_weather(weather, model='fixed', **coeffs):
+    """
+    Weather 또는 (..., 4, 시간) 기상 배열 묶음에서 등가 외기온도 계산
+    (열 순서: Toutdoor, Vwind, PW, radSolar)
+    """
+    data = np.asarray(weather, dtype=float)
+    Toutdoor, Vwind, _, radSolar = np.moveaxis(data, -2, 0)
+    return calculate_Tsolair2(Toutdoor, radSolar, Vwind, model=model, **coeffs)
@@ -0,0 +1,563 @@
+## 실내온도(Troom) 점화식 고속 해석기
+#
+# 스크립트의 시간 루프는 모두 다음 형태의 1절점 에너지 수지로 정리된다 (단위 W, K).
+#
+#   qTotalHouse[k] = S[k] - G * Troom[k]
+#   Troom[k+1]     = Troom[k] + dt / C * (qTotalHouse[k] + fb * (qHeating[k] - qCooling[k]))
+#
+# S  : 외피/환기/일사 이득의 시간별 합 (sum U_j * T_j[k] + qRad[k]) [W]
+# G  : 외피/환기 총 열컨덕턴스 (sum U_j) [W/K]
+# C  : 실내 공기 열용량 (mHouse * cAir * 1000) [J/K]
+# fb : 난방/냉방 열량이 다음 시간 실내온도에 반영되는지 여부
+#      (gangnung_dandong5_2.py 만 해당 — 나머지 스크립트는 qHeating[k]를
+#       계산하기 전에 qTotalHouse[k]에 더하므로 항상 0이 더해진다)
+#
+# fb = 0 이면 Troom은 난방/냉방 분기와 무관한 선형 점화식이므로 prefix scan으로
+# 한 번에 풀고, 분기(mode, qHeating, qCooling)는 벡터 연산으로 계산한다.
+# fb = 1 이면 모드 전환마다 점화식 계수가 바뀌므로 numba JIT 커널(설치된 경우),
+# 없으면 float 리스트 기반 파이썬 루프 또는 시나리오 축으로 벡터화한 시간 루프를 사용한다.
+#
+# G, C (및 hvac_gain)는 S와 차원 수가 같으면 시간별 계수로 본다
+# (온도 의존 공기 물성치처럼 열용량이 시간마다 바뀌는 경우). 이때 k번째 스텝은
+# G[k], C[k], hvac_gain[k]를 사용한다.
+#
+# integrator='exponential'이면 스텝 동안 이득을 고정한 1절점 방정식
+# C dT/dt = A - B T 를 해석적으로 적분한다. 스텝 시작의 순 열량을 dq = A - B T[k]라 하면
+#
+#   Troom[k+1] = Troom[k] + phi * dq,   phi = (1 - exp(-B dt / C)) / B
+#
+# 로 Euler 식의 dt / C 를 phi로 바꾼 것과 같다. phi * B < 1 이므로 dt가 아무리 커도
+# 평형온도를 넘어가지 않는다. B는 되먹임이 없으면 G, 있으면 운전 모드와
+# hvac_rule에 따른 실효 컨덕턴스 (feedback_conductance)이다.
+#
+# 되먹임이 있으면 스텝 도중 실내온도가 설정온도를 지날 때 운전 모드가 바뀐다.
+# 스텝 시작 모드로 스텝 전체를 적분하면 (예: 중립 모드로 한 시간 동안 일사를 받아
+# 냉방 설정온도를 크게 넘김) 큰 스텝에서 실내온도와 부하가 크게 틀리므로, 지수 해로
+# 설정온도에 닿는 시각을 구해 스텝을 나누고 나머지 시간은 바뀐 모드로 적분한다
+# (스텝당 최대 MAX_SWITCHES번). 기록하는 qHeating/qCooling/mode는 Euler와 같이 스텝
+# 시작 값이며, load_following/absolute처럼 설정온도에 닿은 뒤 그 온도에 머무는 경우를
+# 위해 실내온도가 설정온도와 같으면 운전 중으로 본다. 운전 모드를 Tcontrol로 정하면
+# 스텝 도중 바뀌지 않으므로 나누지 않는다.
+
+import importlib.util
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+# 난방/냉방 부하 산정 방식
+HVAC_RULES = {
+    'setpoint': 0,  # 설정온도까지 되돌리는 열량: hvac_gain * (Tset - Troom)
+    'load_following': 1,  # 위 열량 + 손실(획득) 열량, 손실(획득)일 때만 운전
+    'absolute': 2,  # |qTotalHouse|
+}
+
+INTEGRATORS = ('euler', 'exponential')
+
+MODE_NEUTRAL = 0  # 중립 모드
+MODE_HEATING = 1  # 난방 모드
+MODE_COOLING = 2  # 냉방 모드
+
+MAX_SWITCHES = 4  # 지수 적분 스텝 하나에서 나누는 최대 모드 전환 횟수
+
+
+class Trajectory(NamedTuple):
+    """
+    시간별 해석 결과 (단위: K, W)
+    """
+    Troom: np.ndarray
+    qTotalHouse: np.ndarray
+    qHeating: np.ndarray
+    qCooling: np.ndarray
+    mode: np.ndarray
+
+
+def _steps(x, ndim):
+    # 시나리오 계수 (...)는 (..., 1)로, 시간별 계수 (..., 시간)는 그대로
+    x = np.asarray(x, dtype=float)
+    return x if x.ndim == ndim and ndim > 0 else x[..., None]
+
+
+def exponential_step(s, B):
+    """
+    지수 적분 스텝 계수 phi = (1 - exp(-B s)) / B  (s = dt / C, B -> 0 이면 s)
+    """
+    x = np.asarray(B, dtype=float) * s
+    safe = np.where(x > 0, x, 1.0)
+    return np.where(x > 0, -np.expm1(-safe) / safe, 1.0) * s
+
+
+def feedback_conductance(mode, qTotal, G, K, rule):
+    """
+    난방/냉방 열량까지 포함한 순 열량 dq = A - B T 의 실효 컨덕턴스 B [W/K]
+
+    setpoint      : 운전 중 G + K
+    load_following: 운전 중 (qHeating/qCooling > 0) K
+    absolute      : 운전 중 손실(획득)을 상쇄하면 0, 반대 방향이면 2 G
+    """
+    heating = mode == MODE_HEATING
+    cooling = mode == MODE_COOLING
+    if rule == 0:
+        return np.where(heating | cooling, G + K, G)
+    if rule == 1:
+        return np.where((heating & (qTotal < 0)) | (cooling & (qTotal > 0)), K, G)
+    offset = (heating & (qTotal < 0)) | (cooling & (qTotal > 0))
+    doubled = (heating & (qTotal > 0)) | (cooling & (qTotal < 0))
+    return np.where(offset, 0.0, np.where(doubled, 2 * G, G))
+
+
+def linear_recurrence(a, b, x0, memory=None):
+    """
+    x[0] = x0, x[k+1] = a[k] * x[k] + b[k] 의 해를 prefix scan으로 계산
+
+    a, b는 (..., n-1) 형태 (a는 브로드캐스팅 가능), x0는 (...) 형태.
+    log2(n) 번의 배열 연산만 사용하며 나눗셈이 없어 a가 0에 가까워도 안정적이다.
+    memory가 주어지면 memory 스텝보다 오래된 항 (x0 포함)은 버리고 log2(memory) 번만
+    계산한다 (a의 memory 스텝 곱이 무시할 만큼 작을 때의 근사).
+    """
+    b = np.asarray(b, dtype=float)
+    x0 = np.asarray(x0, dtype=float)
+    a = np.asarray(a, dtype=float)
+    B = b.copy()
+    n = B.shape[-1]
+    span = n if memory is None else min(n, max(1, int(memory)))
+    d = 1
+    if a.ndim == 0 or a.shape[-1] == 1:
+        # 시간 불변 계수: d 단계의 곱수는 a**d 로 일정하다
+        ad = a
+        while d < span:
+            B[..., d:] += ad * B[..., :-d]
+            ad = ad * ad
+            d *= 2
+        A = np.zeros(np.shape(a)[:-1] + (n,)) if np.ndim(a) else np.zeros(n)
+        A[..., :d] = a ** np.arange(1, min(d, n) + 1)
+    else:
+        A = np.array(np.broadcast_to(a, b.shape))
+        while d < span:
+            B[..., d:] += A[..., d:] * B[..., :-d]
+            A[..., d:] *= A[..., :-d].copy()
+            d *= 2
+        if d < n:
+            A[..., d:] = 0.0  # x0에서 d 스텝 이상 떨어진 값은 버린 항과 같이 x0 항도 버림
+    x = np.empty(b.shape[:-1] + (n + 1,))
+    x[..., 0] = x0
+    x[..., 1:] = A * x0[..., None] + B
+    return x
+
+
+def apply_thermostat(Troom, qTotalHouse, Tset_heating, Tset_cooling,
+                     hvac_rule='setpoint', hvac_gain=0.0, Tcontrol=None):
+    """
+    주어진 실내온도/열부하로 난방·냉방 부하와 운전 모드를 벡터 연산으로 계산
+    """
+    rule = HVAC_RULES[hvac_rule]
+    Th, Tc, K = (_steps(x, np.ndim(Troom)) for x in (Tset_heating, Tset_cooling, hvac_gain))
+    Tctl = Troom if Tcontrol is None else Tcontrol
+
+    heating = Tctl < Th
+    cooling = ~heating & (Tctl > Tc)
+    qHeating, qCooling = _hvac_loads(heating, cooling, Troom, qTotalHouse, Th, Tc, K, rule)
+    mode = np.where(heating, MODE_HEATING, np.where(cooling, MODE_COOLING, MODE_NEUTRAL)).astype(np.int8)
+    return qHeating, qCooling, mode
+
+
+def _hvac_loads(heating, cooling, T, q, Th, Tc, K, rule):
+    # 운전 모드와 실내온도/열부하에 따른 난방·냉방 부하
+    if rule == 0:
+        qHeating = np.where(heating, K * (Th - T), 0.0)
+        qCooling = np.where(cooling, K * (T - Tc), 0.0)
+    elif rule == 1:
+        qHeating = np.where(heating & (q < 0), K * (Th - T) - q, 0.0)
+        qCooling = np.where(cooling & (q > 0), K * (T - Tc) + q, 0.0)
+    else:
+        qHeating = np.where(heating, np.abs(q), 0.0)
+        qCooling = np.where(cooling, np.abs(q), 0.0)
+    return qHeating, qCooling
+
+
+def exponential_feedback_step(T, S, G, s, Th, Tc, K, rule, mode):
+    """
+    되먹임이 있는 지수 적분 한 스텝 (스텝 시작 실내온도 T, 운전 모드 mode -> 다음 실내온도)
+
+    스텝 도중 설정온도에 닿으면 그 시각에서 나눠 바뀐 모드로 나머지 시간을 적분한다.
+    s는 dt / C, rule은 HVAC_RULES 값. 모든 인자는 같은 형태로 브로드캐스팅된다.
+    """
+    shape = np.broadcast(T, S, G, s, Th, Tc, K, mode).shape
+    T = np.array(np.broadcast_to(T, shape), dtype=float)
+    rem = np.array(np.broadcast_to(s, shape), dtype=float)
+    mode = np.array(np.broadcast_to(mode, shape))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(MAX_SWITCHES + 1):
+            q = S - G * T
+            qh, qc = _hvac_loads(mode == MODE_HEATING, mode == MODE_COOLING, T, q, Th, Tc, K, rule)
+            dq = q + qh - qc
+            B = feedback_conductance(mode, q, G, K, rule)
+            end = T + exponential_step(rem, B) * dq
+            if i == MAX_SWITCHES:
+                return end
+            # 평형온도 쪽으로 가는 길에 있는 설정온도와 그 너머의 운전 모드
+            Tinf = np.where(B > 0, T + dq / B, T)
+            neutral = mode == MODE_NEUTRAL
+            to_heating = neutral & (Tinf < Th)
+            to_cooling = neutral & ~to_heating & (Tinf > Tc)
+            from_heating = (mode == MODE_HEATING) & (Tinf > Th)
+            from_cooling = (mode == MODE_COOLING) & (Tinf < Tc)
+            target = np.where(to_heating | from_heating, Th, Tc)
+            crossing = (to_heating | to_cooling | from_heating | from_cooling) & ((target - T) * (Tinf - target) >= 0)
+            tau = np.where(crossing, np.log((T - Tinf) / (target - Tinf)) / B, np.inf)
+            cross = tau < rem
+            if not cross.any():
+                return end
+            T = np.where(cross, target, end)
+            rem = np.where(cross, rem - tau, 0.0)
+            mode = np.where(cross, np.where(to_heating, MODE_HEATING, np.where(to_cooling, MODE_COOLING,
+                                                                                 MODE_NEUTRAL)), mode)
+    return T
+
+
+def _row_kernel(S, G, s, T0, Th, Tc, K, rule, feedback, dynamic, Tctl, use_ctl, exact,
+                Troom, qTotal, qHeating, qCooling, mode):
+    # 스크립트의 시간 루프와 같은 순서로 한 시간씩 계산
+    # (1차원 배열 또는 리스트를 받으며 numba로 그대로 컴파일된다, G/s/K는 시간별 값)
+    T = T0
+    split = exact and feedback and not use_ctl  # 스텝을 모드 전환 시각에서 나눔
+    for k in range(len(S)):
+        if k > 0 and dynamic:
+            if split:
+                # exponential_feedback_step과 같이 설정온도에 닿는 시각에서 스텝을 나눔
+                md = mode[k - 1]
+                Gk = G[k - 1]
+                Kk = K[k - 1]
+                rem = s[k - 1]
+                for it in range(MAX_SWITCHES + 1):
+                    q = S[k - 1] - Gk * T
+                    qh = 0.0
+                    qc = 0.0
+                    B = Gk
+                    if md == 1:
+                        if rule == 0:
+                            qh = Kk * (Th - T)
+                            B = Gk + Kk
+                        elif rule == 1:
+                            if q < 0:
+                                qh = Kk * (Th - T) - q
+                                B = Kk
+                        else:
+                            qh = abs(q)
+                            if q < 0:
+                                B = 0.0
+                            elif q > 0:
+                                B = 2 * Gk
+                    elif md == 2:
+                        if rule == 0:
+                            qc = Kk * (T - Tc)
+                            B = Gk + Kk
+                        elif rule == 1:
+                            if q > 0:
+                                qc = Kk * (T - Tc) + q
+                                B = Kk
+                        else:
+                            qc = abs(q)
+                            if q > 0:
+                                B = 0.0
+                            elif q < 0:
+                                B = 2 * Gk
+                    dq = q + qh - qc
+                    # 평형온도 쪽으로 가는 길에 있는 설정온도 (nxt: 그 너머의 운전 모드, -1이면 없음)
+                    nxt = -1
+                    target = Tc
+                    Tinf = T
+                    if it < MAX_SWITCHES and B > 0:
+                        Tinf = T + dq / B
+                        if md == 0 and Tinf < Th:
+                            target = Th
+                            nxt = 1
+                        elif md == 0 and Tinf > Tc:
+                            nxt = 2
+                        elif md == 1 and Tinf > Th:
+                            target = Th
+                            nxt = 0
+                        elif md == 2 and Tinf < Tc:
+                            nxt = 0
+                    if nxt >= 0 and (target - T) * (Tinf - target) >= 0 and Tinf != target:
+                        tau = math.log((T - Tinf) / (target - Tinf)) / B
+                        if tau < rem:
+                            T = target
+                            rem -= tau
+                            md = nxt
+                            continue
+                    x = B * rem
+                    if x > 0:
+                        T = T - math.expm1(-x) / x * rem * dq
+                    else:
+                        T = T + rem * dq
+                    break
+            else:
+                dq = qTotal[k - 1]
+                if feedback:
+                    dq += qHeating[k - 1] - qCooling[k - 1]
+                step = s[k - 1]
+                if exact:
+                    # feedback_conductance와 같은 실효 컨덕턴스 (되먹임이 있으면 Tcontrol로 정한 모드)
+                    B = G[k - 1]
+                    md = mode[k - 1]
+                    q = qTotal[k - 1]
+                    if feedback and md != 0:
+                        if rule == 0:
+                            B = G[k - 1] + K[k - 1]
+                        elif rule == 1:
+                            if (md == 1 and q < 0) or (md == 2 and q > 0):
+                                B = K[k - 1]
+                        elif (md == 1 and q < 0) or (md == 2 and q > 0):
+                            B = 0.0
+                        elif (md == 1 and q > 0) or (md == 2 and q < 0):
+                            B = 2 * G[k - 1]
+                    x = B * step
+                    if x > 0:
+                        step = -math.expm1(-x) / x * step
+                T = T + step * dq
+        Troom[k] = T
+        q = S[k] - G[k] * T
+        qTotal[k] = q
+
+        t = Tctl[k] if use_ctl else T
+        qh = 0.0
+        qc = 0.0
+        md = 0
+        if t < Th or (split and t == Th):
+            md = 1
+            if rule == 0:
+                qh = K[k] * (Th - T)
+            elif rule == 1:
+                if q < 0:
+                    qh = K[k] * (Th - T) - q
+            else:
+                qh = abs(q)
+        elif t > Tc or (split and t == Tc):
+            md = 2
+            if rule == 0:
+                qc = K[k] * (T - Tc)
+            elif rule == 1:
+                if q > 0:
+                    qc = K[k] * (T - Tc) + q
+            else:
+                qc = abs(q)
+        qHeating[k] = qh
+        qCooling[k] = qc
+        mode[k] = md
+
+
+_jit_kernel = None
+_has_numba = None
+
+
+def has_numba():
+    # numba 설치 여부 (numba는 선택 사항이며 import에 수백 ms가 걸리므로 JIT 커널을 쓸 때만 import)
+    global _has_numba
+    if _has_numba is None:
+        _has_numba = importlib.util.find_spec('numba') is not None
+    return _has_numba
+
+
+def _get_jit_kernel():
+    global _jit_kernel
+    if _jit_kernel is None:
+        import numba
+
+        _jit_kernel = numba.njit(cache=True, nogil=True)(_row_kernel)
+    return _jit_kernel
+
+
+def _solve_rows(S, G, s, T0, Th, Tc, K, rule, feedback, dynamic, Tcontrol, exact, jit):
+    # 시나리오별로 1차원 커널 실행 (jit=False이면 파이썬 float 리스트로 계산)
+    shape = S.shape
+    S2 = S.reshape(-1, shape[-1])
+    n = S2.shape[0]
+    steps = [np.broadcast_to(_steps(p, S.ndim), shape).reshape(n, -1) for p in (G, s, K)]
+    params = [np.broadcast_to(p, shape[:-1]).reshape(n).astype(float) for p in (T0, Th, Tc)]
+    use_ctl = Tcontrol is not None
+    Tctl = np.broadcast_to(Tcontrol, shape).reshape(n, -1) if use_ctl else np.empty((n, 1))
+    out = [np.empty(S2.shape) for _ in range(4)] + [np.empty(S2.shape, dtype=np.int8)]
+    kernel = _get_jit_kernel() if jit else _row_kernel
+    for i in range(n):
+        T0_i, Th_i, Tc_i = (float(v[i]) for v in params)
+        if jit:
+            G_i, s_i, K_i = (np.ascontiguousarray(v[i], dtype=float) for v in steps)
+            row_out = [o[i] for o in out]
+            kernel(np.ascontiguousarray(S2[i]), G_i, s_i, T0_i, Th_i, Tc_i, K_i, rule, feedback, dynamic,
+                   np.ascontiguousarray(Tctl[i]), use_ctl, exact, *row_out)
+        else:
+            G_i, s_i, K_i = (v[i].tolist() for v in steps)
+            row_out = [[0.0] * shape[-1] for _ in range(5)]
+            kernel(S2[i].tolist(), G_i, s_i, T0_i, Th_i, Tc_i, K_i, rule, feedback, dynamic,
+                   Tctl[i].tolist(), use_ctl, exact, *row_out)
+            for o, r in zip(out, row_out):
+                o[i] = r
+    return Trajectory(*(o.reshape(shape) for o in out))
+
+
+def _solve_stepwise(S, G, s, T0, Th, Tc, K, rule, feedback, dynamic, Tcontrol, exact):
+    # 시간 방향은 순차, 시나리오 축은 벡터화
+    lead = S.shape[:-1]
+    Troom = np.empty(S.shape)
+    qTotal = np.empty(S.shape)
+    qHeating = np.empty(S.shape)
+    qCooling = np.empty(S.shape)
+    mode = np.empty(S.shape, dtype=np.int8)
+    T = np.array(np.broadcast_to(T0, lead), dtype=float)
+    Th, Tc = (np.broadcast_to(p, lead) for p in (Th, Tc))
+    Gt, st, Kt = (np.broadcast_to(_steps(p, S.ndim), S.shape) for p in (G, s, K))
+    split = exact and feedback and Tcontrol is None
+    for k in range(S.shape[-1]):
+        if k > 0 and dynamic and split:
+            T = exponential_feedback_step(T, S[..., k - 1], Gt[..., k - 1], st[..., k - 1], Th, Tc, Kt[..., k - 1],
+                                          rule, mode[..., k - 1])
+        elif k > 0 and dynamic:
+            dq = qTotal[..., k - 1]
+            if feedback:
+                dq = dq + qHeating[..., k - 1] - qCooling[..., k - 1]
+            step = st[..., k - 1]
+            if exact:
+                B = (feedback_conductance(mode[..., k - 1], qTotal[..., k - 1], Gt[..., k - 1], Kt[..., k - 1], rule)
+                     if feedback else Gt[..., k - 1])
+                step = exponential_step(step, B)
+            T = T + step * dq
+        Troom[..., k] = T
+        G = Gt[..., k]
+        K = Kt[..., k]
+        q = S[..., k] - G * T
+        qTotal[..., k] = q
+        t = T if Tcontrol is None else Tcontrol[..., k]
+        heating = (t < Th) | (split & (t == Th))
+        cooling = ~heating & ((t > Tc) | (split & (t == Tc)))
+        if rule == 0:
+            qh = np.where(heating, K * (Th - T), 0.0)
+            qc = np.where(cooling, K * (T - Tc), 0.0)
+        elif rule == 1:
+            qh = np.where(heating & (q < 0), K * (Th - T) - q, 0.0)
+            qc = np.where(cooling & (q > 0), K * (T - Tc) + q, 0.0)
+        else:
+            qh = np.where(heating, np.abs(q), 0.0)
+            qc = np.where(cooling, np.abs(q), 0.0)
+        qHeating[..., k] = qh
+        qCooling[..., k] = qc
+        mode[..., k] = np.where(heating, MODE_HEATING, np.where(cooling, MODE_COOLING, MODE_NEUTRAL))
+    return Trajectory(Troom, qTotal, qHeating, qCooling, mode)
+
+
+def _solve_scan(S, G, s, T0, Th, Tc, K, hvac_rule, dynamic, Tcontrol, exact):
+    # 난방/냉방이 실내온도에 되먹임되지 않는 경우: Troom은 선형 점화식
+    lead = S.shape[:-1]
+    G = _steps(G, S.ndim)
+    if dynamic:
+        s = _steps(s, S.ndim)
+        if exact:
+            a = np.exp(-s * G)
+            s = exponential_step(s, G)
+        else:
+            a = 1.0 - s * G
+        if a.shape[-1] > 1:
+            a = a[..., :-1]
+        b = (s[..., :-1] if s.shape[-1] > 1 else s) * S[..., :-1]
+        Troom = linear_recurrence(a, b, np.broadcast_to(T0, lead))
+    else:
+        Troom = np.array(np.broadcast_to(np.asarray(T0, dtype=float)[..., None], S.shape))
+    qTotal = S - G * Troom
+    qHeating, qCooling, mode = apply_thermostat(Troom, qTotal, Th, Tc, hvac_rule, K, Tcontrol)
+    return Trajectory(Troom, qTotal, qHeating, qCooling, mode)
+
+
+def solve_troom(S, G, C, Troom_initial, Tset_heating, Tset_cooling, dt=1.0,
+                hvac_rule='setpoint', hvac_gain=None, feedback=False,
+                Tcontrol=None, dynamic=True, method='auto', integrator='euler'):
+    """
+    실내온도 점화식과 난방/냉방 분기를 한 번에 해석
+
+    S는 (시간,) 또는 (시나리오, ..., 시간) 형태이며, G/C/설정온도 등 계수는
+    스칼라 또는 시나리오 축 형태로 브로드캐스팅된다.
+    G, C, hvac_gain은 S와 차원 수가 같으면 시간별 계수로 사용한다.
+    hvac_gain 기본값은 C / dt (한 스텝 만에 설정온도로 되돌리는 열량, 5_test 방식).
+    integrator는 'euler' (스크립트와 같은 명시적 Euler) 또는 'exponential' (스텝 크기와 무관하게 안정).
+
+    method:
+        'auto'     — 되먹임이 없으면 'scan', 있으면 'numba'(설치 시),
+                     없으면 시나리오 수에 따라 'loop' 또는 'stepwise'
+        'scan'     — 선형 점화식 prefix scan (feedback=False 전용)
+        'numba'    — JIT 컴파일 커널
+        'stepwise' — 시간 루프, 시나리오 축 벡터화
+        'loop'     — 순수 파이썬 루프 (float 리스트, 검증용 기준 구현)
+    """
+    if hvac_rule not in HVAC_RULES:
+        raise ValueError(f"unknown hvac_rule {hvac_rule!r}, expected one of {sorted(HVAC_RULES)}")
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"unknown integrator {integrator!r}, expected one of {list(INTEGRATORS)}")
+    exact = integrator == 'exponential'
+    S = np.asarray(S, dtype=float)
+    C = np.asarray(C, dtype=float)
+    if C.ndim == S.ndim:
+        dt = _steps(dt, S.ndim)
+    s = dt / C
+    K = C / dt if hvac_gain is None else np.asarray(hvac_gain, dtype=float)
+    if Tcontrol is not None:
+        Tcontrol = np.broadcast_to(np.asarray(Tcontrol, dtype=float), S.shape)
+    rule = HVAC_RULES[hvac_rule]
+    feedback = bool(feedback) and bool(dynamic)
+
+    if method == 'auto':
+        if not feedback:
+            method = 'scan'
+        elif has_numba():
+            method = 'numba'
+        elif S.ndim > 1 and S.size > 64 * S.shape[-1]:
+            method = 'stepwise'
+        else:
+            method = 'loop'
+
+    args = (S, G, s, Troom_initial, Tset_heating, Tset_cooling, K)
+    if method == 'scan':
+        if feedback:
+            raise ValueError("method='scan' cannot solve a recurrence with HVAC feedback")
+        return _solve_scan(*args, hvac_rule, dynamic, Tcontrol, exact)
+    if method == 'numba':
+        if not has_numba():
+            raise ImportError("method='numba' requires the numba package")
+        return _solve_rows(*args, rule, feedback, dynamic, Tcontrol, exact, jit=True)
+    if method == 'stepwise':
+        return _solve_stepwise(*args, rule, feedback, dynamic, Tcontrol, exact)
+    if method == 'loop':
+        return _solve_rows(*args, rule, feedback, dynamic, Tcontrol, exact, jit=False)
+    raise ValueError(f"unknown method {method!r}")
+
+
+def next_troom(trajectory, C, dt=1.0, feedback=False, G=None, hvac_gain=None, hvac_rule='setpoint',
+               integrator='euler', Tset_heating=None, Tset_cooling=None):
+    """
+    마지막 스텝 다음 시간의 실내온도 (다음 구간의 Troom_initial로 이어 계산할 때 사용)
+
+    integrator='exponential'이면 G (되먹임이 있으면 hvac_gain도)가 필요하다.
+    되먹임이 있으면 설정온도를 주어야 solve_troom과 같이 스텝 도중 모드 전환을 반영한다.
+    """
+    ndim = trajectory.Troom.ndim
+
+    def last(x):
+        x = np.asarray(x, dtype=float)
+        return x[..., -1] if x.ndim == ndim else x  # 시간별 계수는 마지막 스텝 값
+
+    C = last(C)
+    dq = trajectory.qTotalHouse[..., -1]
+    if feedback:
+        dq = dq + trajectory.qHeating[..., -1] - trajectory.qCooling[..., -1]
+    step = np.asarray(dt, dtype=float) / C
+    if integrator == 'exponential':
+        B = last(G)
+        if feedback:
+            K = C / dt if hvac_gain is None else last(hvac_gain)
+            if Tset_heating is not None and Tset_cooling is not None:
+                T = trajectory.Troom[..., -1]
+                S = trajectory.qTotalHouse[..., -1] + B * T
+                return exponential_feedback_step(T, S, B, step, Tset_heating, Tset_cooling, K,
+                                                 HVAC_RULES[hvac_rule], trajectory.mode[..., -1])
+            B = feedback_conductance(trajectory.mode[..., -1], trajectory.qTotalHouse[..., -1], B, K,
+                                     HVAC_RULES[hvac_rule])
+        step = exponential_step(step, B)
+    return trajectory.Troom[..., -1] + step * dq
@@ -0,0 +1,130 @@
+## 결과 저장소 (채널별 .npy 메모리 맵 + JSON 메타데이터)
+#
+# 저장소는 디렉터리 하나이며 채널마다 <채널>.npy 파일과 meta.json을 둔다.
+# .npy는 np.load(mmap_mode='r')로 열리므로 수천 개 시나리오-연도를 열어도
+# 실제로 읽는 부분만 메모리에 올라온다. meta.json은 모든 채널을 다 쓴 뒤 마지막에
+# 원자적으로 기록하므로, meta.json이 없는 디렉터리는 완성되지 않은 저장소다.
+
+import json
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from greenhouse.heat_balance import CHOICE_PARAMS, DEFAULT_PARAMS
+from greenhouse.results import CHANNELS, MODE_DTYPE, ResultSet, check_channels
+from greenhouse.weather import weather_hash
+
+STORE_VERSION = 1
+META_FILE = 'meta.json'
+
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _channel_file(path, name):
+    return os.path.join(path, f'{name}.npy')
+
+
+def create_store(path, shape, channels=None, dtype=np.float32):
+    """
+    채널별 쓰기용 메모리 맵 할당 (다 채운 뒤 write_meta 호출)
+
+    기존 저장소에 덮어쓰면 이번에 저장하지 않는 채널의 .npy 파일은 지운다.
+    """
+    channels = check_channels(channels)
+    os.makedirs(path, exist_ok=True)
+    meta_file = os.path.join(path, META_FILE)
+    if os.path.exists(meta_file):
+        os.remove(meta_file)  # 덮어쓰는 동안은 미완성 저장소로 보이도록
+    for name in CHANNELS:
+        if name not in channels and os.path.exists(_channel_file(path, name)):
+            os.remove(_channel_file(path, name))  # 이전 저장소의 채널
+    data = {name: open_memmap(_channel_file(path, name), mode='w+', shape=tuple(shape),
+                              dtype=MODE_DTYPE if name == 'mode' else dtype)
+            for name in channels}
+    return ResultSet(data)
+
+
+def write_meta(path, result, params, weather=None, kind='simulation', scenarios=None):
+    """
+    채널 배열을 디스크에 반영하고 meta.json 기록
+
+    params    : 설계 변수 (시나리오 공통 값)
+    scenarios : 스윕 시나리오 표 (열 이름 -> 배열)
+    """
+    for values in result.data.values():
+        if isinstance(values, np.memmap):
+            values.flush()
+    p = dict(DEFAULT_PARAMS)
+    p.update(params or {})
+    meta = {
+        'version': STORE_VERSION,
+        'kind': kind,
+        'params': {name: _jsonable(value) for name, value in p.items()},
+        'variant': {name: _jsonable(p[name]) for name in CHOICE_PARAMS},
+        'scenarios': {name: _jsonable(np.asarray(v)) for name, v in (scenarios or {}).items()},
+        'weather': None if weather is None else {'sha1': weather_hash(weather), 'n_hours': len(weather.Toutdoor)},
+        'channels': {name: {'dtype': str(v.dtype), 'shape': list(v.shape), 'unit': CHANNELS[name][0]}
+                     for name, v in result.data.items()},
+    }
+    tmp_file = os.path.join(path, f'{META_FILE}.{os.getpid()}.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_file, os.path.join(path, META_FILE))
+    return meta
+
+
+def save_result(result, path, weather=None):
+    """
+    SimulationResult (또는 스윕 ResultSet)를 저장소로 기록
+    """
+    from greenhouse.model import SimulationResult
+
+    first = next(iter(result.data.values()))
+    store = create_store(path, first.shape, result.channels,
+                         dtype=next((v.dtype for k, v in result.data.items() if k != 'mode'), np.float64))
+    for name, values in result.data.items():
+        store.data[name][...] = values
+    if isinstance(result, SimulationResult):
+        return write_meta(path, store, result.params, weather, kind='simulation')
+    return write_meta(path, store, result.base, weather, kind='sweep', scenarios=result.params)
+
+
+def read_meta(path):
+    with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != STORE_VERSION:
+        raise ValueError(f"{path}: unsupported result store version {meta.get('version')!r}")
+    return meta
+
+
+def open_result(path, weather=None, mmap_mode='r', channels=None):
+    """
+    저장소를 메모리 맵으로 열기
+
+    kind='simulation'이면 SimulationResult (print_summary, plot 등 사용 가능),
+    스윕이면 시나리오 표를 params로, 기준 설계 변수를 base로 가진 ResultSet을 반환한다.
+    결과의 meta 속성에 메타데이터가 들어 있다. weather를 주면 계산에 쓴 기상데이터와 같은지 확인한다.
+    """
+    meta = read_meta(path)
+    if weather is not None and meta['weather'] is not None and weather_hash(weather) != meta['weather']['sha1']:
+        raise ValueError(f"{path}: results were computed with different weather data")
+    names = list(meta['channels']) if channels is None else [n for n in check_channels(channels)]
+    missing = [name for name in names if name not in meta['channels']]
+    if missing:
+        raise KeyError(f"{path}: channel(s) not stored: {', '.join(missing)}")
+    data = {name: np.load(_channel_file(path, name), mmap_mode=mmap_mode) for name in names}
+    if meta['kind'] == 'simulation':
+        from greenhouse.model import GreenhouseModel, SimulationResult
+
+        result = SimulationResult(GreenhouseModel(**meta['params']), data)
+    else:
+        result = ResultSet(data, {name: np.asarray(v) for name, v in meta['scenarios'].items()}, meta['params'])
+    result.meta = meta
+    return result
@@ -0,0 +1,132 @@
+## 장기(다년) 스트리밍 계산
+#
+# 기상데이터를 구간(예: 1년) 단위로 받아 구간마다 해석하고, 마지막 실내온도 상태를
+# 다음 구간의 Troom_initial로 넘긴다. 한 번에 한 구간만 메모리에 있으므로
+# 계산 기간이 30년이든 100년이든 메모리 사용량은 구간 크기로 고정된다.
+
+import numpy as np
+
+from greenhouse.heat_balance import DEFAULT_PARAMS, next_troom_initial, solve_heat_balance
+from greenhouse.weather import Weather, resample_weather, steps_per_hour
+
+_END = object()
+
+
+def repeat_weather(weather, n_years):
+    """
+    같은 연간 기상데이터를 n_years번 반복 (복사하지 않음)
+    """
+    for _ in range(n_years):
+        yield weather
+
+
+def split_weather(weather, chunk_hours):
+    """
+    기상데이터를 chunk_hours 시간씩 나눈 구간 (배열 보기, 복사하지 않음)
+    """
+    n_hours = len(weather.Toutdoor)
+    for start in range(0, n_hours, chunk_hours):
+        yield Weather(*(np.asarray(v)[start:start + chunk_hours] for v in weather))
+
+
+def iter_chunks(params, chunks, lead=(), method='auto'):
+    """
+    기상데이터 구간을 차례로 해석하며 (시작 스텝, Weather, HeatBalance, Trajectory)를 생성
+
+    params : 설계 변수 (스윕처럼 lead 형태의 시나리오 배열 가능)
+    chunks : 시간별 Weather 구간의 iterable (repeat_weather, split_weather 등)
+    timestep이 60분보다 작으면 구간마다 보간하며, 생성하는 Weather는 보간한 계열이다.
+    구간 마지막 시간은 다음 구간 첫 시간을 향해 보간하므로 연간 한 번에 보간한 계열과 같다.
+    """
+    p = dict(DEFAULT_PARAMS)
+    p.update(params)
+    start = 0
+    chunks = iter(chunks)
+    following = next(chunks, _END)
+    while following is not _END:
+        hourly, following = following, next(chunks, _END)
+        weather = _resample_chunk(hourly, None if following is _END else following, p['timestep'])
+        hb, traj = solve_heat_balance(p, weather, lead=lead, method=method)
+        yield start, weather, hb, traj
+        start += traj.Troom.shape[-1]
+        p['Troom_initial'] = next_troom_initial(p, hb, traj)
+
+
+def _resample_chunk(hourly, following, timestep):
+    # 다음 구간 첫 시간까지 붙여 보간하고 잘라냄 (greenhouse.design_day 구간과 같은 방식)
+    if following is None or steps_per_hour(timestep) == 1:
+        return resample_weather(hourly, timestep)
+    n_steps = len(hourly.Toutdoor) * steps_per_hour(timestep)
+    extended = Weather(*(np.concatenate([np.asarray(v), np.asarray(w)[:1]]) for v, w in zip(hourly, following)))
+    return Weather(*(v[:n_steps] for v in resample_weather(extended, timestep)))
+
+
+class RunningSummary:
+    """
+    구간별 결과를 누적한 전체 기간 집계 (열량 [kWh], 최대 부하 [kW], 온도 [°C])
+
+    최대 부하 발생 시간은 전체 기간 기준 시간 인덱스 (0부터).
+    steps_per_hour : 시간당 스텝 수 (sub-hourly 계산이면 update에 스텝 단위 계열을 넘김)
+    """
+
+    def __init__(self, steps_per_hour=1):
+        self.steps_per_hour = steps_per_hour
+        self.n_steps = 0
+        self.heating = 0.0
+        self.cooling = 0.0
+        self.peak_heating = None
+        self.peak_heating_hour = None
+        self.peak_cooling = None
+        self.peak_cooling_hour = None
+        self.Troom_min = None
+        self.Troom_max = None
+        self._Troom_sum = 0.0
+
+    def _peak(self, current, hour, q, start):
+        k = np.argmax(q, axis=-1)
+        value = np.take_along_axis(q, k[..., None], axis=-1)[..., 0] / 1000
+        k = (k + start) // self.steps_per_hour
+        if current is None:
+            return value, k
+        better = value > current
+        return np.where(better, value, current), np.where(better, k, hour)
+
+    def update(self, start, trajectory):
+        # start: 구간 시작 스텝 (iter_chunks가 생성하는 값)
+        traj = trajectory
+        self.n_steps += traj.Troom.shape[-1]
+        self.heating = self.heating + traj.qHeating.sum(axis=-1) / 1000 / self.steps_per_hour
+        self.cooling = self.cooling + traj.qCooling.sum(axis=-1) / 1000 / self.steps_per_hour
+        self.peak_heating, self.peak_heating_hour = self._peak(self.peak_heating, self.peak_heating_hour,
+                                                               traj.qHeating, start)
+        self.peak_cooling, self.peak_cooling_hour = self._peak(self.peak_cooling, self.peak_cooling_hour,
+                                                               traj.qCooling, start)
+        Troom_C = traj.Troom - 273.15
+        lo, hi = Troom_C.min(axis=-1), Troom_C.max(axis=-1)
+        self.Troom_min = lo if self.Troom_min is None else np.minimum(self.Troom_min, lo)
+        self.Troom_max = hi if self.Troom_max is None else np.maximum(self.Troom_max, hi)
+        self._Troom_sum = self._Troom_sum + Troom_C.sum(axis=-1)
+        return self
+
+    @property
+    def n_hours(self):
+        return self.n_steps // self.steps_per_hour
+
+    @property
+    def Troom_mean(self):
+        return self._Troom_sum / self.n_steps
+
+    def as_dict(self):
+        names = ('n_hours', 'heating', 'cooling', 'peak_heating', 'peak_heating_hour', 'peak_cooling',
+                 'peak_cooling_hour', 'Troom_min', 'Troom_max', 'Troom_mean')
+        return {name: getattr(self, name) for name in names}
+
+
+def simulate_stream(params, chunks, lead=(), method='auto'):
+    """
+    전체 기간을 구간 단위로 계산하고 RunningSummary만 반환 (시간별 계열은 보관하지 않음)
+    """
+    summary = RunningSummary(steps_per_hour(params.get('timestep', DEFAULT_PARAMS['timestep'])))
+    for start, _, _, traj in iter_chunks(params, chunks, lead=lead, method=method):
+        summary.update(start, traj)
+    return summary
@@ -0,0 +1,145 @@
+## 설계 변수 일괄 스윕 (N개 시나리오 x 시간을 한 번에 계산)
+
+from typing import NamedTuple
+
+import numpy as np
+
+from greenhouse.heat_balance import CHOICE_PARAMS, DEFAULT_PARAMS, solve_heat_balance
+from greenhouse.results import ResultSet, check_channels, collect
+from greenhouse.store import create_store, write_meta
+from greenhouse.weather import resample_weather, steps_per_hour
+
+CHUNK_SIZE = 64  # 한 번에 진행하는 시나리오 수 (64 x 8760 배열이 CPU 캐시에 들어가는 크기)
+SERIES_CHANNELS = ('Troom', 'qHeating', 'qCooling')  # sweep_series 기본 저장 채널
+
+
+class SweepResult(NamedTuple):
+    """
+    시나리오별 연간 집계 (각 배열 길이 = 시나리오 수)
+    """
+    params: dict  # 시나리오별 설계 변수 (열 이름 -> 배열)
+    annual_heating: np.ndarray  # 연간 난방부하 [kWh]
+    annual_cooling: np.ndarray  # 연간 냉방부하 [kWh]
+    peak_heating: np.ndarray  # 최대 난방부하 [kW]
+    peak_heating_hour: np.ndarray  # 최대 난방부하 발생 시간 (0부터)
+    peak_cooling: np.ndarray  # 최대 냉방부하 [kW]
+    peak_cooling_hour: np.ndarray  # 최대 냉방부하 발생 시간 (0부터)
+
+    def __len__(self):
+        return len(self.annual_heating)
+
+    def rows(self):
+        # 시나리오별 dict 목록 (출력/저장용)
+        names = list(self.params) + list(self._fields[1:])
+        columns = list(self.params.values()) + list(self[1:])
+        return [dict(zip(names, (c[i].item() for c in columns))) for i in range(len(self))]
+
+
+def as_table(scenarios):
+    """
+    시나리오 표를 열 이름 -> (N,) 배열 dict로 변환
+    (dict of 배열, dict 목록, pandas.DataFrame 모두 가능)
+    """
+    if hasattr(scenarios, 'to_dict') and hasattr(scenarios, 'columns'):
+        scenarios = {name: scenarios[name].to_numpy() for name in scenarios.columns}
+    if isinstance(scenarios, dict):
+        table = {name: np.asarray(values) for name, values in scenarios.items()}
+    else:
+        scenarios = list(scenarios)
+        names = list(dict.fromkeys(name for row in scenarios for name in row))
+        table = {name: np.asarray([row[name] for row in scenarios]) for name in names}
+
+    lengths = {len(values) for values in table.values()}
+    if len(lengths) != 1:
+        raise ValueError(f"scenario columns must all have the same length, got {sorted(lengths)}")
+    for name in table:
+        if name not in DEFAULT_PARAMS:
+            raise ValueError(f"unknown parameter {name!r}")
+        if name in CHOICE_PARAMS:
+            raise ValueError(f"{name!r} selects a model variant and cannot vary across scenarios")
+    return table
+
+
+def sweep(scenarios, weather, base=None, chunk_size=CHUNK_SIZE, method='auto'):
+    """
+    설계 변수 표의 N개 시나리오를 (N, 시간) 상태 배열로 함께 계산
+
+    scenarios : 시나리오별로 바꿀 변수 (예: {'fr': [...], 'ht': [...]})
+    weather   : 시간별 greenhouse.weather.Weather
+    base      : 나머지 변수의 기준값 (기본값 DEFAULT_PARAMS)
+    """
+    table = as_table(scenarios)
+    n = len(next(iter(table.values()))) if table else 1
+    params = dict(DEFAULT_PARAMS)
+    params.update(base or {})
+    steps = steps_per_hour(params['timestep'])
+    weather = resample_weather(weather, params['timestep'])
+
+    out = {name: np.empty(n) for name in ('annual_heating', 'annual_cooling', 'peak_heating', 'peak_cooling')}
+    out['peak_heating_hour'] = np.empty(n, dtype=np.int64)
+    out['peak_cooling_hour'] = np.empty(n, dtype=np.int64)
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        chunk = dict(params)
+        chunk.update({name: values[start:stop] for name, values in table.items()})
+        _, traj = solve_heat_balance(chunk, weather, lead=(stop - start,), method=method)
+
+        out['annual_heating'][start:stop] = traj.qHeating.sum(axis=-1) / 1000 / steps
+        out['annual_cooling'][start:stop] = traj.qCooling.sum(axis=-1) / 1000 / steps
+        out['peak_heating_hour'][start:stop] = np.argmax(traj.qHeating, axis=-1) // steps
+        out['peak_cooling_hour'][start:stop] = np.argmax(traj.qCooling, axis=-1) // steps
+        out['peak_heating'][start:stop] = traj.qHeating.max(axis=-1) / 1000
+        out['peak_cooling'][start:stop] = traj.qCooling.max(axis=-1) / 1000
+
+    return SweepResult(params=table, **out)
+
+
+def sweep_series(scenarios, weather, channels=SERIES_CHANNELS, dtype=np.float32, base=None,
+                 chunk_size=CHUNK_SIZE, method='auto', path=None):
+    """
+    시나리오별 시간별 계열을 (시나리오, 스텝) 배열로 보관하는 스윕
+
+    channels : 저장할 채널 (greenhouse.results.CHANNELS, None이면 전체)
+    dtype    : 저장 dtype (기본 float32, 계산은 float64로 하고 저장할 때만 변환)
+    path     : 지정하면 메모리 대신 greenhouse.store 저장소에 바로 기록
+    """
+    table = as_table(scenarios)
+    n = len(next(iter(table.values()))) if table else 1
+    params = dict(DEFAULT_PARAMS)
+    params.update(base or {})
+    step_weather = resample_weather(weather, params['timestep'])
+
+    result = None
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        chunk = dict(params)
+        chunk.update({name: values[start:stop] for name, values in table.items()})
+        hb, traj = solve_heat_balance(chunk, step_weather, lead=(stop - start,), method=method)
+        if result is None:
+            first = collect(hb, traj, step_weather.Toutdoor, channels, dtype)
+            shape = (n, len(step_weather.Toutdoor))
+            if path is None:
+                result = ResultSet.allocate(shape, channels, dtype, table, available=first, base=params)
+            else:
+                result = create_store(path, shape, [name for name in check_channels(channels) if name in first],
+                                      dtype)
+                result.params = table
+                result.base = params
+            for name, values in first.items():
+                result.data[name][start:stop] = values
+        else:
+            collect(hb, traj, step_weather.Toutdoor, result.channels, out=result.data, index=slice(start, stop))
+    if path is not None:
+        result.meta = write_meta(path, result, params, weather, kind='sweep', scenarios=table)
+    return result
+
+
+def grid(**axes):
+    """
+    변수별 값 목록의 모든 조합으로 시나리오 표 생성
+    (예: grid(fr=[0.2, 0.3], Tset_heating=[288, 291]) -> 4개 시나리오)
+    """
+    names = list(axes)
+    mesh = np.meshgrid(*(np.asarray(axes[name]) for name in names), indexing='ij')
+    return {name: m.ravel() for name, m in zip(names, mesh)}
@@ -0,0 +1,143 @@
+## 스크립트별 모델 설정 (gangnung_dandong*.py 를 GreenhouseModel 변수로 표현)
+#
+# gangnung_dandong4.py, 5.py, _v1.py, _v2.py는 실내온도를 고정한 정적 계산이다
+# (room='fixed', _v2.py는 고정 실내온도의 부하를 누적하는 room='open_loop').
+# 이 스크립트들은 0시 실내온도만 Troom_initial (297 K)로 두고 나머지 시간은 300 K로
+# 계산하는데, 여기서는 부하 계산 실내온도를 모든 시간 Troom_fixed로 둔다 (0시 부하만 다름).
+# 5.py는 등가 외기온도를 계산하지만 쓰지 않으므로 alpha_roof = 0 (등가 외기온도 = 외기온도)으로,
+# 지표면 면적 (2200 m2) 기준 바닥 열전달은 바닥면적 기준 hs로 환산해서 표현한다.
+
+from greenhouse.heat_balance import DEFAULT_PARAMS
+
+VARIANTS = {
+    'gangnung_dandong5_test': {},
+    'gangnung_dandong5_1': {
+        'hvac_rule': 'load_following',
+        'hvac_recovery': None,  # 손실(획득) 열량만 난방(냉방)
+    },
+    'gangnung_dandong5_2': {
+        'fracSolarWindow': 0.5,
+        'transGlass': 0.8,
+        'solair': 'wind',
+        'Tset_heating': 18 + 273,
+        'Tset_cooling': 25 + 273,
+        'feedback': True,
+    },
+    'gangnung_dandong_final': {
+        'widthHouse': 8.5,
+        'heightHouse': 4.0,
+        'fracSolarWindow': 0.5,
+        'alpha_roof': 0.15,
+        'rRoof': 0.3,
+        'rFloor': 2,
+        'rSideWall': 0.3,
+        'ACH': 1,
+        'Troom_initial': 10 + 273,
+        'Tground': 15 + 273,
+        'Tset_heating': 15 + 273,
+        'Tset_cooling': 25 + 273,
+        'hvac_recovery': 3600,
+        'envelope': 'r',
+        'vent': 'ach',
+        'vent_drive': 'outdoor',
+        'hvac_rule': 'load_following',
+    },
+    'gangnung_dandong_final2': {
+        'widthHouse': 8.5,
+        'heightHouse': 4.0,
+        'fracSolarWindow': 0.5,
+        'alpha_roof': 0.15,
+        'rRoof': 0.3,
+        'rFloor': 2,
+        'rSideWall': 0.3,
+        'ACH': 1,
+        'Troom_initial': 13 + 273,
+        'Tground': 15 + 273,
+        'Tset_heating': 20 + 273,
+        'Tset_cooling': 30 + 273,
+        'hvac_recovery': 3600,
+        'envelope': 'r',
+        'vent': 'ach',
+        'hvac_rule': 'load_following',
+    },
+    'gangnung_dandong4': {
+        'fracSolarWindow': 0.5,
+        'transGlass': 0.8,
+        'areaWindow': 15,
+        'areaDoor': 5,
+        'Troom_fixed': 300,
+        'Troom_initial': 297,
+        'Tset_heating': 20 + 273,
+        'Tset_cooling': 28 + 273,
+        'envelope': 'r',
+        'vent': 'ach',
+        'vent_drive': 'outdoor',
+        'solair': 'constant',
+        'hvac_rule': 'absolute',
+        'control': 'outdoor',
+        'room': 'fixed',
+    },
+    'gangnung_dandong5': {
+        'areaRoof': 2217,
+        'areaSideWall': 385,
+        'areaFrontBack': 300,
+        'hs': 0.244 * 2200 / (70 * 8.6),  # 지표면 면적 2200 m2
+        'Agh': 2902,
+        'fracSolarWindow': 0.5,
+        'transGlass': 0.8,
+        'alpha_roof': 0,
+        'Troom_fixed': 295,
+        'Troom_initial': 295,
+        'Tground': 4.12 + 273,
+        'Tset_heating': 16 + 273,
+        'Tset_cooling': 28 + 273,
+        'hvac_rule': 'absolute',
+        'control': 'outdoor',
+        'room': 'fixed',
+    },
+    'gangnung_dandong_v1': {
+        'fracSolarWindow': 0.5,
+        'transGlass': 0.8,
+        'rRoof': 1 / 8.3 + 0.012 / 0.96 + 1 / 23.0,  # 유리 지붕
+        'rFloor': 1 / 8.3 + 0.15 / 1.13 + 0.5 / 1.5,  # 콘크리트 슬래브 + 토양
+        'rSideWall': 1 / 8.3 + 0.010 / 0.96 + 1 / 23.0,  # 유리 벽체
+        'Troom_fixed': 300,
+        'Troom_initial': 297,
+        'Tset_heating': 10 + 273,
+        'Tset_cooling': 34 + 273,
+        'envelope': 'r',
+        'vent': 'none',
+        'solair': 'wind',
+        'hvac_rule': 'absolute',
+        'room': 'fixed',
+    },
+    'gangnung_dandong_v2': {
+        'fracSolarWindow': 0.5,
+        'transGlass': 0.8,
+        'rRoof': 1 / 8.3 + 0.012 / 0.96 + 1 / 23.0,
+        'rFloor': 1 / 8.3 + 0.15 / 1.13 + 0.5 / 1.5,
+        'rSideWall': 1 / 8.3 + 0.010 / 0.96 + 1 / 23.0,
+        'cAir': 1.005,  # cp_air [kJ/kgK]
+        'Troom_fixed': 300,
+        'Troom_initial': 297,
+        'Tset_heating': 10 + 273,
+        'Tset_cooling': 34 + 273,
+        'hvac_recovery': 3600 * 1000,  # qHeating [kW] = (Tset_heating - Troom) * mHouse * cp_air / (3600 * 1000)
+        'dt': 1000.0,  # dT = qTotalHouse [kW] * 1000 / (mHouse * cp_air [kJ/kgK])
+        'envelope': 'r',
+        'vent': 'none',
+        'solair': 'wind',
+        'room': 'open_loop',
+    },
+}
+
+
+def variant_params(name):
+    """
+    스크립트 이름(확장자 제외)의 전체 설계 변수
+    """
+    if name not in VARIANTS:
+        raise KeyError(f"unknown variant {name!r}, expected one of {sorted(VARIANTS)}")
+    p = dict(DEFAULT_PARAMS)
+    p.update(VARIANTS[name])
+    return p
@@ -0,0 +1,128 @@
+## TMY 기상데이터 로더 (열 단위 일괄 읽기 + 바이너리 캐시)
+
+import hashlib
+import os
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from greenhouse.profiling import stage
+
+N_HOURS = 8760  # 연간 시간 수 [hr]
+MINUTES_PER_HOUR = 60
+
+# 엑셀 열 배치: A=시간, B=외기온도 [K], C=풍속 [m/s], D=수증기분압 [Pa], E=일사량 [W/m2]
+FIRST_COLUMN = 2
+LAST_COLUMN = 5
+
+CACHE_VERSION = 1
+CACHE_DIRNAME = '.tmy_cache'
+
+
+class Weather(NamedTuple):
+    """
+    연간 기상데이터 (각 배열 길이 = 시간 수)
+    """
+    Toutdoor: np.ndarray  # 외기온도 [K]
+    Vwind: np.ndarray  # 풍속 [m/s]
+    PW: np.ndarray  # 수증기분압 [Pa]
+    radSolar: np.ndarray  # 일사량 [W/m2]
+
+    @property
+    def n_hours(self):
+        return len(self.Toutdoor)
+
+    def as_array(self):
+        return np.stack(self)
+
+
+def weather_hash(weather):
+    """
+    기상데이터 내용의 sha1 (결과 저장 시 어떤 기상데이터로 계산했는지 기록)
+    """
+    data = np.ascontiguousarray(np.stack([np.asarray(v, dtype=float) for v in weather]))
+    return hashlib.sha1(data.tobytes()).hexdigest()
+
+
+def steps_per_hour(timestep):
+    """
+    timestep [분] 간격의 시간당 스텝 수 (60분의 약수여야 함)
+    """
+    if not timestep > 0 or MINUTES_PER_HOUR % timestep:
+        raise ValueError(f"timestep must divide {MINUTES_PER_HOUR} minutes, got {timestep!r}")
+    return int(MINUTES_PER_HOUR // timestep)
+
+
+def resample_weather(weather, timestep=MINUTES_PER_HOUR):
+    """
+    시간별 기상데이터를 timestep [분] 간격으로 선형 보간 (60이면 그대로 반환)
+
+    시간별 값은 각 시간의 시작 시각 값으로 보며, 마지막 시간 이후 스텝은 마지막 값을 유지한다.
+    """
+    steps = steps_per_hour(timestep)
+    if steps == 1:
+        return weather
+    n_hours = len(weather.Toutdoor)
+    t = np.arange(n_hours * steps) / steps
+    hours = np.arange(n_hours)
+    return Weather(*(np.interp(t, hours, np.asarray(v, dtype=float)) for v in weather))
+
+
+def _cache_path(path, n_hours, cache_dir):
+    # 파일 경로, 크기, 수정시각이 바뀌면 캐시 키도 바뀐다
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = f"{CACHE_VERSION}|{path}|{stat.st_size}|{stat.st_mtime_ns}|{n_hours}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIRNAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}.npy")
+
+
+def read_tmy_xlsx(path, n_hours=N_HOURS):
+    """
+    엑셀 파일에서 B~E열을 read-only 스트리밍으로 한 번에 읽기
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = wb.active
+        rows = sheet.iter_rows(min_row=1, max_row=n_hours,
+                               min_col=FIRST_COLUMN, max_col=LAST_COLUMN,
+                               values_only=True)
+        data = np.array(list(rows), dtype=float)
+    finally:
+        wb.close()
+
+    if data.shape != (n_hours, LAST_COLUMN - FIRST_COLUMN + 1):
+        raise ValueError(f"{path}: expected {n_hours} rows of weather data, got {len(data)}")
+    return np.ascontiguousarray(data.T)
+
+
+def load_tmy(path='TMY3_Gangnung.xlsx', n_hours=N_HOURS, cache=True, cache_dir=None):
+    """
+    TMY 기상데이터 읽기
+
+    한 번 읽은 파일은 (경로, 크기, 수정시각) 키로 .npy 캐시에 저장해 두고
+    다음 실행부터는 엑셀을 파싱하지 않고 캐시에서 바로 읽는다.
+    """
+    with stage('weather'):
+        if not cache:
+            return Weather(*read_tmy_xlsx(path, n_hours))
+
+        cache_file = _cache_path(path, n_hours, cache_dir)
+        try:
+            data = np.load(cache_file)
+        except (OSError, ValueError):
+            data = None
+        if data is None or data.shape != (LAST_COLUMN - FIRST_COLUMN + 1, n_hours):
+            data = read_tmy_xlsx(path, n_hours)
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"  # 프로세스/스레드별 임시 파일
+            with open(tmp_file, 'wb') as f:
+                np.save(f, data)
+            os.replace(tmp_file, cache_file)  # 동시 실행 시에도 깨진 캐시가 보이지 않도록
+        return Weather(*data)
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from greenhouse.benchmark import synthetic_weather, write_tmy_xlsx
+
+
+@pytest.fixture(scope='session')
+def weather():
+    # 합성 연간 기상데이터 (8760시간)
+    return synthetic_weather()
+
+
+@pytest.fixture(scope='session')
+def short_weather(weather):
+    # 빠른 테스트용 2주 기상데이터
+    return type(weather)(*(np.asarray(v[:336]) for v in weather))
+
+
+@pytest.fixture(scope='session')
+def tmy_path(tmp_path_factory, weather):
+    path = tmp_path_factory.mktemp('weather') / 'TMY3_Gangnung.xlsx'
+    write_tmy_xlsx(str(path), weather)
+    return str(path)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from greenhouse.analysis import DAYS_IN_MONTH, monthly_hourly, result_profiles
+from greenhouse.model import GreenhouseModel
+
+PERCENTILES = (0, 5, 50, 95, 100)
+
+
+def reference(series):
+    # 달마다 (일수, 24) 블록을 잘라 NumPy 함수로 계산
+    out = {name: np.empty((12, 24)) for name in ('mean', 'sum', 'max', 'min')}
+    out.update({f'p{q:g}': np.empty((12, 24)) for q in PERCENTILES})
+    start = 0
+    for m, days in enumerate(DAYS_IN_MONTH):
+        block = series[start:start + days * 24].reshape(days, 24)
+        start += days * 24
+        for name, func in (('mean', np.mean), ('sum', np.sum), ('max', np.max), ('min', np.min)):
+            out[name][m] = func(block, axis=0)
+        for q in PERCENTILES:
+            out[f'p{q:g}'][m] = np.percentile(block, q, axis=0)
+    return out
+
+
+def test_matches_numpy_per_month(weather):
+    out = monthly_hourly(weather.Toutdoor, stats=('mean', 'sum', 'max', 'min'), percentiles=PERCENTILES)
+    expected = reference(np.asarray(weather.Toutdoor))
+    assert set(out) == set(expected)
+    for name, values in expected.items():
+        np.testing.assert_allclose(out[name], values, rtol=1e-12, err_msg=name)
+
+
+def test_stacked_and_sub_hourly_series(weather):
+    stacked = np.stack([weather.Toutdoor, weather.radSolar])
+    out = monthly_hourly(stacked, percentiles=(50,))
+    assert out['p50'].shape == (2, 12, 24)
+    for i, series in enumerate(stacked):
+        row = monthly_hourly(series, percentiles=(50,))
+        for name in out:
+            np.testing.assert_allclose(out[name][i], row[name], rtol=1e-12, err_msg=name)
+    # 15분 스텝은 시간 평균으로 (매시 안에서 일정하면 시간별 계열과 같음)
+    fine = monthly_hourly(np.repeat(weather.Toutdoor, 4))
+    for name, values in monthly_hourly(weather.Toutdoor).items():
+        np.testing.assert_allclose(fine[name], values, rtol=1e-12, err_msg=name)
+
+
+def test_result_profiles(weather):
+    result = GreenhouseModel().simulate(weather)
+    profiles = result_profiles(result, percentiles=(95,))
+    assert set(profiles) == {'qTotalHouse', 'qHeating', 'qCooling'}
+    expected = reference(result.qHeating)
+    for name in ('mean', 'sum', 'max', 'p95'):
+        np.testing.assert_allclose(profiles['qHeating'][name], expected[name], rtol=1e-12, err_msg=name)
+
+
+def test_errors(weather):
+    with pytest.raises(ValueError, match='multiple of 8760'):
+        monthly_hourly(weather.Toutdoor[:-1])
+    with pytest.raises(ValueError, match="unknown statistic 'median'"):
+        monthly_hourly(weather.Toutdoor, stats=('median',))
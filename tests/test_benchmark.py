@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pytest
+
+from greenhouse.benchmark import (BENCHMARK_VERSION, bench_load, bench_scripts, bench_variant, compare, main,
+                                  synthetic_weather)
+from greenhouse.weather import N_HOURS, read_tmy_xlsx
+
+VARIANT = 'gangnung_dandong5_2'
+
+
+def test_synthetic_weather_is_seeded():
+    w = synthetic_weather(48, seed=1)
+    assert all(np.shape(v) == (48,) for v in w)
+    for a, b in zip(w, synthetic_weather(48, seed=1)):
+        np.testing.assert_array_equal(a, b)
+    assert not np.array_equal(w.Toutdoor, synthetic_weather(48, seed=2).Toutdoor)
+    # 밤(6시 이전, 18시 이후)에는 일사량 0, 풍속은 음수가 아님
+    hour = np.arange(48) % 24
+    night = (hour <= 6) | (hour >= 19)
+    assert np.all(w.radSolar[night] == 0) and np.all(w.radSolar >= 0) and np.all(w.Vwind >= 0)
+
+
+def test_write_tmy_xlsx_round_trip(tmy_path, weather):
+    for a, b in zip(read_tmy_xlsx(tmy_path), weather):
+        np.testing.assert_allclose(a, b, rtol=1e-15)
+
+
+def test_bench_stages(tmy_path, weather):
+    stages = bench_variant('gangnung_dandong_final', weather, repeat=2, plots=True)
+    assert list(stages) == ['solair', 'heat_balance', 'aggregation', 'plotting']
+    for t in stages.values():
+        assert 0 < t['min'] <= t['median']
+    assert stages['plotting']['repeat'] == 1  # 그래프는 repeat // 5 회 (최소 1회)
+    assert list(bench_variant(VARIANT, weather, repeat=1, plots=False)) == ['solair', 'heat_balance', 'aggregation']
+    load = bench_load(tmy_path, repeat=2)
+    assert load['excel_load']['repeat'] == 1 and load['cache_load']['repeat'] == 2
+
+
+def test_failed_script_is_recorded(tmp_path):
+    # TMY 파일이 없는 작업 폴더에서는 마지막 오류 줄을 기록
+    out = bench_scripts(str(tmp_path), 'gangnung_dandong5_test.py', timeout=120)
+    assert list(out) == ['gangnung_dandong5_test']
+    assert 'FileNotFoundError' in out['gangnung_dandong5_test']['error']
+
+
+def test_compare():
+    def report(scale):
+        return {
+            'load': {'cache_load': {'min': 0.002 * scale}},
+            'variants': {VARIANT: {'heat_balance': {'min': 0.01 * scale}, 'plotting': {'min': 0.0}}},
+            'scripts': {'gangnung_dandong5_2': {'wall': 3.0 * scale}, 'gangnung_dandong4': {'error': 'failed'}},
+        }
+
+    old = report(1.0)
+    new = report(2.0)
+    new['variants']['gangnung_dandong4'] = {'heat_balance': {'min': 0.01}}  # 이전 결과에 없는 단계는 제외
+    rows = {key: (t_old, t_new, ratio) for key, t_old, t_new, ratio in compare(new, old)}
+    assert set(rows) == {('load', '', 'cache_load'), ('variant', VARIANT, 'heat_balance'),
+                         ('variant', VARIANT, 'plotting'), ('script', 'gangnung_dandong5_2', 'wall')}
+    assert rows[('variant', VARIANT, 'heat_balance')] == pytest.approx((0.01, 0.02, 2.0))
+    assert np.isnan(rows[('variant', VARIANT, 'plotting')][2])
+
+
+def test_main_writes_and_compares(tmp_path, capsys):
+    path = tmp_path / 'bench.json'
+    argv = ['--variant', VARIANT, '--repeat', '1', '--no-plots', '-o', str(path)]
+    report = main(argv)
+    saved = json.loads(path.read_text(encoding='utf-8'))
+    assert saved == json.loads(json.dumps(report))
+    assert saved['version'] == BENCHMARK_VERSION and saved['n_hours'] == N_HOURS
+    assert list(saved['variants']) == [VARIANT] and 'scripts' not in saved
+    capsys.readouterr()
+    main(argv[:-2] + ['--compare', str(path)])
+    out = capsys.readouterr().out
+    assert '이전 결과 대비' in out and f'variant  {VARIANT}' in out
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+
+from greenhouse.cache import SWEEP_FIELDS, ResultCache, result_key
+from greenhouse.model import GreenhouseModel
+from greenhouse.store import META_FILE
+from greenhouse.sweep import sweep
+
+
+def test_simulate_round_trip(short_weather, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    model = GreenhouseModel(feedback=True, fr=0.4)
+    computed = cache.simulate(model, short_weather)
+    stored = cache.simulate(model, short_weather)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 1
+    for name in computed.channels:
+        np.testing.assert_array_equal(stored.data[name], computed.data[name])
+    assert stored.summary() == computed.summary()
+
+
+def test_key_normalizes_numbers(short_weather):
+    key = result_key({'Tset_heating': 291}, short_weather)
+    assert result_key({'Tset_heating': 291.0}, short_weather) == key
+    assert result_key({'Tset_heating': np.float64(291)}, short_weather) == key
+    assert result_key({'Tset_heating': 292}, short_weather) != key
+    assert result_key({'Tset_heating': 291}, short_weather, channels=['Troom']) != key
+
+
+def test_key_depends_on_weather_content(short_weather):
+    changed = type(short_weather)(*(np.array(v, dtype=float) for v in short_weather))
+    changed.Toutdoor[100] += 0.1
+    assert result_key({}, changed) != result_key({}, short_weather)
+
+
+def test_channels_and_dtype_are_separate_entries(short_weather, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    model = GreenhouseModel()
+    cache.simulate(model, short_weather)
+    subset = cache.simulate(model, short_weather, channels=('Troom', 'qHeating'))
+    single = cache.simulate(model, short_weather, dtype=np.float32)
+    assert cache.misses == 3 and len(cache) == 3
+    assert set(subset.channels) == {'Troom', 'qHeating'}
+    assert single.data['Troom'].dtype == np.float32
+
+
+def test_incomplete_entry_is_recomputed(short_weather, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    model = GreenhouseModel()
+    cache.simulate(model, short_weather)
+    entry = next(e.path for e in os.scandir(cache.path) if e.is_dir())
+    os.remove(os.path.join(entry, META_FILE))
+    result = cache.simulate(model, short_weather)
+    assert cache.misses == 2
+    assert os.path.exists(os.path.join(entry, META_FILE))
+    np.testing.assert_array_equal(result.Troom, model.simulate(short_weather).Troom)
+
+
+def test_sweep_partial_overlap(short_weather, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    base = {'feedback': True}
+    cache.sweep({'fr': np.array([0.1, 0.2])}, short_weather, base=base)
+    scenarios = {'fr': np.array([0.2, 0.3, 0.1])}
+    table = cache.sweep(scenarios, short_weather, base=base)
+    assert (cache.hits, cache.misses) == (2, 3)
+    expected = sweep(scenarios, short_weather, base=base)
+    for name in SWEEP_FIELDS:
+        np.testing.assert_allclose(getattr(table, name), getattr(expected, name), rtol=1e-12, err_msg=name)
+        assert getattr(table, name).dtype == getattr(expected, name).dtype
+
+
+def test_evict_least_recently_used(short_weather, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    models = [GreenhouseModel(fr=fr) for fr in (0.1, 0.2, 0.3)]
+    seen = set()
+    for i, model in enumerate(models):
+        cache.simulate(model, short_weather)
+        entry, = {e.path for e in os.scandir(cache.path)} - seen
+        seen.add(entry)
+        os.utime(os.path.join(entry, META_FILE), (1000 + i, 1000 + i))
+    cache.simulate(models[0], short_weather)  # 적중하면 마지막 사용 시각 갱신
+    sizes = [size for _, size, _ in sorted(cache._entries())]
+    assert cache.evict(sizes[-1] + sizes[-2]) == 1
+    assert cache.hits == 1 and len(cache) == 2
+    cache.simulate(models[0], short_weather)
+    cache.simulate(models[1], short_weather)
+    assert (cache.hits, cache.misses) == (2, 4)  # 0.2가 가장 오래 쓰지 않아 지워졌음
+    assert cache.clear() == 3 and len(cache) == 0
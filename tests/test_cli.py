@@ -0,0 +1,59 @@
+import csv
+import json
+import os
+
+import pytest
+
+from greenhouse.cli import INDEX_FILE, load_config, main, run_batch
+from greenhouse.model import GreenhouseModel
+from greenhouse.variants import VARIANTS, variant_params
+from greenhouse.weather import load_tmy
+
+
+def write_config(directory, name, text):
+    path = directory / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_batch_runs_every_variant_and_records_bad_configs(tmp_path, tmy_path):
+    configs = tmp_path / 'configs'
+    configs.mkdir()
+    for name in VARIANTS:
+        write_config(configs, f'{name}.toml', f'variant = "{name}"\nweather = {json.dumps(tmy_path)}\n')
+    write_config(configs, 'bad_key.toml', 'variant = "gangnung_dandong_final"\nfigure = false\n')
+    write_config(configs, 'bad_syntax.toml', 'variant = \n')
+    write_config(configs, 'bad_figure.toml', 'figures = ["total_load", "heat_map"]\n')
+    out = tmp_path / 'runs'
+    seen = []
+    rows = run_batch(str(configs / '*.toml'), str(out), max_workers=0, figures=False, progress=seen.append)
+    assert len(rows) == len(seen) == len(VARIANTS) + 3
+
+    with open(out / INDEX_FILE, newline='', encoding='utf-8') as f:
+        index = {row['name']: row for row in csv.DictReader(f)}
+    assert {name for name, row in index.items() if row['status'] == 'error'} == {'bad_key', 'bad_syntax',
+                                                                                 'bad_figure'}
+    assert 'figure' in index['bad_key']['error']
+    assert 'heat_map' in index['bad_figure']['error']
+    weather = load_tmy(tmy_path)
+    for name in VARIANTS:
+        expected = GreenhouseModel(**variant_params(name)).simulate(weather).summary()
+        assert float(index[name]['annual_heating']) == pytest.approx(expected['annual_heating'], rel=1e-9)
+        assert os.path.exists(out / name / 'summary.json')
+    assert not os.path.exists(out / 'bad_key')
+
+
+def test_load_config_validates_figures(tmp_path):
+    path = write_config(tmp_path, 'run.toml', 'figures = ["components"]\n')
+    assert load_config(path)['figures'] == ['components']
+    path = write_config(tmp_path, 'run.toml', 'figures = "components"\n')
+    with pytest.raises(ValueError, match='list of figure names'):
+        load_config(path)
+
+
+def test_main_exit_status(tmp_path, tmy_path, capsys):
+    good = write_config(tmp_path, 'good.toml', f'variant = "gangnung_dandong_final"\nweather = {json.dumps(tmy_path)}\n')
+    assert main([good, '-o', str(tmp_path / 'runs'), '--workers', '0', '--no-figures']) == 0
+    bad = write_config(tmp_path, 'bad.toml', 'sweep = 1\nparams = 2\nunknown = 3\n')
+    assert main([good, bad, '-o', str(tmp_path / 'runs'), '--workers', '0', '--no-figures']) == 1
+    assert '1/2 runs succeeded' in capsys.readouterr().out
@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+import pytest
+
+from greenhouse.design_day import design_day, time_constant, validate_design_day
+from greenhouse.heat_balance import build_heat_balance
+from greenhouse.model import GreenhouseModel
+from greenhouse.variants import VARIANTS, variant_params
+
+DYNAMIC = sorted(name for name in VARIANTS if variant_params(name)['room'] == 'dynamic')
+STATIC = sorted(set(VARIANTS) - set(DYNAMIC))
+
+# 구간 계산을 하는 설정 (스크립트의 dt = 1초, 실제 스텝 길이의 지수 적분)
+WINDOWED = [
+    {'timestep': 5},
+    {'timestep': 5, 'dt': None, 'integrator': 'exponential'},
+    {'timestep': 1, 'dt': 60.0, 'integrator': 'exponential'},
+    {'dt': None, 'integrator': 'exponential'},
+]
+
+
+def check(params, weather, windowed):
+    r = validate_design_day(params, weather)
+    assert r['peak_heating'] == pytest.approx(r['full_peak_heating'], rel=1e-4)
+    assert r['peak_heating_hour'] == r['full_peak_heating_hour']
+    assert (r['fraction'] < 1) == windowed
+    return r
+
+
+@pytest.mark.parametrize('name', sorted(VARIANTS))
+def test_script_settings_run_full_year(weather, name):
+    # 스크립트의 dt = 1초는 시정수가 수백 시간이라 예열 구간이 연간의 절반을 넘음
+    check(variant_params(name), weather, windowed=False)
+
+
+@pytest.mark.parametrize('settings', WINDOWED)
+@pytest.mark.parametrize('name', DYNAMIC)
+def test_windows_match_full_year(weather, name, settings):
+    params = variant_params(name)
+    params.update(settings)
+    check(params, weather, windowed=True)
+    # 초기값 과도 응답 (0시 최대 부하)이 없어도 추운 구간에서 찾음
+    params['Troom_initial'] = params['Tset_heating']
+    check(params, weather, windowed=True)
+
+
+@pytest.mark.parametrize('name', DYNAMIC)
+def test_window_cost(weather, name):
+    # 시정수가 짧으면 예열 포함 계산 시간이 연간의 2% 미만
+    params = variant_params(name)
+    params.update(dt=None, integrator='exponential')
+    assert check(params, weather, windowed=True)['fraction'] < 0.02
+    # 1분 스텝은 실제 계산 시간도 연간 계산보다 훨씬 짧음 (시간별 스텝은 연간 부하 추정이 연간
+    # 계산과 같은 크기라 비슷한 시간이 걸림). 연간 계산이 빠른 numba 되먹임 계산도 25% 정도
+    params['timestep'] = 1
+    r = min((check(params, weather, windowed=True) for _ in range(3)), key=lambda r: r['time_ratio'])
+    assert r['fraction'] < 0.02
+    assert r['time_ratio'] < 0.5
+
+
+@pytest.mark.parametrize('name', STATIC)
+def test_static_runs_full_year(weather, name):
+    # 실내온도를 고정한 계산은 구간으로 나누지 않음
+    params = variant_params(name)
+    params.update(WINDOWED[0])
+    check(params, weather, windowed=False)
+
+
+def test_initial_transient_is_included(weather):
+    # 초기값이 설정온도보다 낮으면 0시가 최대 부하
+    params = variant_params('gangnung_dandong_final')
+    params.update(timestep=5, dt=None, integrator='exponential')
+    r = check(params, weather, windowed=True)
+    assert r['peak_heating_hour'] == 0
+
+
+def test_fallback_is_plain_run(weather):
+    model = GreenhouseModel(**variant_params('gangnung_dandong5_2'))
+    result = design_day(model, weather)
+    full = model.simulate(weather, channels=('qHeating',))
+    assert result.fraction == 1.0
+    assert result.peak_heating == full.qHeating.max() / 1000
+
+
+def test_time_constant_follows_feedback(weather):
+    def tau(**params):
+        p = variant_params('gangnung_dandong5_test')
+        p.update(timestep=5, **params)
+        return time_constant(p, build_heat_balance(p, weather.Toutdoor[:1], weather.radSolar[:1], weather.Vwind[:1]))
+
+    assert tau(feedback=True) == pytest.approx(tau())  # 중립 모드가 가장 느림
+    assert tau(feedback=True, hvac_rule='absolute') == math.inf  # 난방 중 실내온도 고정
+    assert np.isfinite(tau(feedback=True, hvac_rule='load_following'))
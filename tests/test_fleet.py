@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from greenhouse.fleet import simulate_fleet
+from greenhouse.model import GreenhouseModel
+from greenhouse.variants import variant_params
+
+HOUSES = {
+    'gangnung_dandong_final': {  # envelope='r': 면적은 형상에서 계산
+        'lengthHouse': [70.0, 50.0, 90.0],
+        'widthHouse': [8.5, 7.0, 10.0],
+        'fr': [0.0, 0.3, 0.1],
+    },
+    'gangnung_dandong5_2': {  # envelope='ht': 형상과 함께 면적도 온실별로 지정
+        'lengthHouse': [70.0, 50.0, 90.0],
+        'widthHouse': [8.6, 7.0, 10.0],
+        'areaRoof': [696.36, 408.0, 1020.0],
+        'areaSideWall': [604.8, 432.0, 777.6],
+        'areaFrontBack': [64.5, 52.5, 75.0],
+    },
+}
+
+
+@pytest.mark.parametrize('variant', sorted(HOUSES))
+def test_fleet_matches_single_runs(variant, short_weather):
+    base = variant_params(variant)
+    houses = HOUSES[variant]
+    counts = np.array([2.0, 1.0, 3.0])
+    fleet = simulate_fleet(houses, short_weather, counts=counts, base=base, dtype=np.float64, chunk_size=2)
+    heating = np.zeros(len(short_weather.Toutdoor))
+    peaks = []
+    for i, count in enumerate(counts):
+        params = dict(base)
+        params.update({name: values[i] for name, values in houses.items()})
+        result = GreenhouseModel(**params).simulate(short_weather)
+        np.testing.assert_allclose(fleet.qHeating[i], result.qHeating, rtol=1e-12)
+        np.testing.assert_allclose(fleet.qCooling[i], result.qCooling, rtol=1e-12)
+        assert fleet.rows()[i]['annual_heating'] == pytest.approx(result.summary()['annual_heating'], rel=1e-12)
+        heating += count * result.qHeating
+        peaks.append(result.qHeating.max())
+    np.testing.assert_allclose(fleet.heating, heating, rtol=1e-12)
+    summary = fleet.summary()
+    assert summary['n_houses'] == 6
+    assert summary['diversity_factor'] == pytest.approx(counts @ peaks / heating.max(), rel=1e-12)
+    assert summary['diversity_factor'] >= 1
+
+
+def test_ht_geometry_needs_areas(short_weather):
+    # envelope='ht' 면적은 고정 입력값이라 형상만 바꾸면 온실마다 다른 형상이 섞임
+    houses = {'widthHouse': [8.6, 12.0]}
+    with pytest.raises(ValueError, match='areaRoof, areaSideWall, areaFrontBack'):
+        simulate_fleet(houses, short_weather)
+    houses['areaRoof'] = [696.36, 972.0]
+    with pytest.raises(ValueError, match='areaSideWall, areaFrontBack'):
+        simulate_fleet(houses, short_weather)
+    # 면적과 무관한 층수, 면적을 계산하는 envelope='r'은 그대로 계산
+    assert len(simulate_fleet({'nFloor': [1, 2]}, short_weather)) == 2
+    assert len(simulate_fleet({'widthHouse': [8.6, 12.0]}, short_weather, base={'envelope': 'r'})) == 2
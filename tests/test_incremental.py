@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from greenhouse.incremental import IncrementalSimulation
+from greenhouse.model import GreenhouseModel
+from greenhouse.weather import Weather
+
+CHANNELS = ('Troom', 'qTotalHouse', 'qHeating', 'qCooling', 'mode')
+CASES = [
+    {'feedback': True},
+    {'feedback': True, 'timestep': 15},
+    {'feedback': True, 'integrator': 'exponential', 'dt': None, 'hvac_rule': 'load_following', 'hvac_recovery': 3600},
+    {},
+]
+
+
+def piecewise(params, weather, pieces):
+    # 구간마다 새 모델로 계산하고 다음 구간 첫 실내온도를 이어 붙인 기준 결과
+    # (구간 끝 다음 한 시간까지 계산해서 끝 시각의 실내온도를 얻음)
+    data = {name: [] for name in CHANNELS}
+    T = GreenhouseModel(**params).Troom_initial
+    for start, stop, changes in pieces:
+        p = dict(params, Troom_initial=T, **changes)
+        model = GreenhouseModel(**p)
+        last = min(stop + 1, len(weather.Toutdoor))
+        result = model.simulate(Weather(*(np.asarray(v)[start:last] for v in weather)), channels=CHANNELS)
+        n = (stop - start) * result.steps_per_hour
+        for name in CHANNELS:
+            data[name].append(result.data[name][:n])
+        if stop < len(weather.Toutdoor):
+            T = float(result.data['Troom'][n])
+    return {name: np.concatenate(parts) for name, parts in data.items()}
+
+
+def check(sim, expected):
+    result = sim.result()
+    for name in CHANNELS:
+        np.testing.assert_allclose(result.data[name], expected[name], rtol=1e-9, atol=1e-5, err_msg=name)
+
+
+@pytest.mark.parametrize('params', CASES)
+def test_set_params_equals_full_recompute(weather, params):
+    sim = IncrementalSimulation(GreenhouseModel(**params), weather, tol=0)
+    sim.set_params(2000, 2200, Tset_heating=292)
+    sim.set_params(2100, 2400, Tset_heating=290, Tset_cooling=299)  # 겹치면 나중 변경이 우선
+    n = len(weather.Toutdoor)
+    check(sim, piecewise(params, weather, [(0, 2000, {}), (2000, 2100, {'Tset_heating': 292}),
+                                           (2100, 2400, {'Tset_heating': 290, 'Tset_cooling': 299}),
+                                           (2400, n, {})]))
+
+
+@pytest.mark.parametrize('params', CASES)
+def test_patch_weather_equals_full_recompute(weather, params):
+    sim = IncrementalSimulation(GreenhouseModel(**params), weather, tol=0)
+    patch = {'Toutdoor': np.asarray(weather.Toutdoor[5000:5030]) - 8, 'radSolar': np.zeros(30)}
+    report = sim.patch_weather(5000, **patch)
+    assert report.start <= 5000 * sim.steps_per_hour
+    patched = Weather(*(np.array(v, dtype=float) for v in weather))
+    for name, values in patch.items():
+        getattr(patched, name)[5000:5030] = values
+    expected = GreenhouseModel(**params).simulate(patched, channels=CHANNELS)
+    check(sim, expected.data)
+
+
+def test_reconverges_before_the_end(weather):
+    model = GreenhouseModel(feedback=True)
+    sim = IncrementalSimulation(model, weather)
+    report = sim.set_params(2000, 2024, Tset_heating=292)
+    assert report.reconverged
+    assert report.fraction < 0.1
+    expected = piecewise(model.params, weather, [(0, 2000, {}), (2000, 2024, {'Tset_heating': 292}),
+                                                 (2024, len(weather.Toutdoor), {})])
+    np.testing.assert_allclose(sim.result().Troom, expected['Troom'], atol=10 * sim.tol)
+
+
+def test_rejects_model_choices(short_weather):
+    sim = IncrementalSimulation(GreenhouseModel(), short_weather)
+    with pytest.raises(ValueError):
+        sim.set_params(10, 20, feedback=True)
+    with pytest.raises(ValueError):
+        sim.set_params(10, 20, Troom_initial=290)
+    with pytest.raises(ValueError):
+        sim.patch_weather(330, Toutdoor=np.zeros(10))
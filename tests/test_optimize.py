@@ -0,0 +1,19 @@
+import pytest
+
+from greenhouse.optimize import optimize
+
+
+@pytest.mark.parametrize('envelope, names', [
+    ('ht', {'fr', 'Tset_heating', 'Tset_cooling'}),
+    ('r', {'rRoof', 'rSideWall', 'Tset_heating', 'Tset_cooling'}),
+])
+def test_default_variables_follow_envelope(short_weather, envelope, names):
+    result = optimize(short_weather, base={'envelope': envelope}, population=4, n_iter=2)
+    assert set(result.params) == names
+
+
+def test_explicit_variables(short_weather):
+    result = optimize(short_weather, variables={'fr': (0.1, 0.5)}, population=4, n_iter=3)
+    assert set(result.params) == {'fr'}
+    assert 0.1 <= result.params['fr'] <= 0.5
+    assert result.n_evaluations <= result.n_requests
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import numpy as np
+
+from greenhouse.model import GreenhouseModel
+from greenhouse.profiling import active, profiling, stage
+
+
+def test_disabled_stage_is_shared_null_context():
+    assert active() is None
+    assert stage('integration') is stage('results')
+
+
+def test_nested_stages(short_weather, tmp_path):
+    with profiling() as prof:
+        assert active() is prof
+        GreenhouseModel().simulate(short_weather).summary()
+        with prof.stage('plotting'):
+            with prof.stage('aggregation'):
+                data = np.ones(2 ** 20)  # 8 MB
+                with prof.stage('aggregation'):  # 같은 이름의 안쪽 단계는 한 번만 집계
+                    pass
+            del data
+    assert active() is None
+    stats = prof.report()['stages']
+    assert {'solair', 'integration', 'results'} <= set(stats)
+    assert stats['aggregation']['calls'] == 1 and stats['plotting']['calls'] == 1
+    assert stats['plotting']['wall'] >= stats['aggregation']['wall']
+    assert stats['plotting']['peak_memory'] >= stats['aggregation']['peak_memory'] >= 8e6
+    prof.write(str(tmp_path / 'profile.json'))
+    assert 'integration' in prof.format()
+
+
+def test_threads_keep_separate_stacks():
+    # 스레드마다 같은 이름의 단계가 동시에 열려 있어도 각각 집계
+    n_threads = 4
+    barrier = threading.Barrier(n_threads)
+    errors = []
+
+    def work():
+        try:
+            with prof.stage('integration'):
+                barrier.wait(timeout=30)
+                with prof.stage('results'):
+                    time.sleep(0.01)
+                barrier.wait(timeout=30)
+        except Exception as e:  # 스레드 예외를 테스트로 전달
+            errors.append(e)
+
+    with profiling(memory=False) as prof:
+        threads = [threading.Thread(target=work) for _ in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+    assert not errors
+    stats = prof.report()['stages']
+    assert stats['integration']['calls'] == stats['results']['calls'] == n_threads
+    assert stats['results']['wall'] >= n_threads * 0.01
+    assert not prof._stacks
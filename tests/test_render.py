@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+pytest.importorskip('matplotlib')
+
+from greenhouse.model import GreenhouseModel
+from greenhouse.plotting import FIGURES
+from greenhouse.render import render, render_sweep
+
+
+def test_render_sweep_simulates_each_scenario_once(short_weather, tmp_path, monkeypatch):
+    calls = []
+    simulate = GreenhouseModel.simulate
+
+    def counted(self, *args, **kwargs):
+        calls.append(self.params['fr'])
+        return simulate(self, *args, **kwargs)
+
+    monkeypatch.setattr(GreenhouseModel, 'simulate', counted)
+    figures = ['total_load', 'room_temperature']
+    paths = render_sweep({'fr': [0.1, 0.3]}, short_weather, str(tmp_path), figures=figures, max_workers=0)
+    assert calls == [0.1, 0.3]
+    assert sorted(os.listdir(tmp_path)) == ['000', '001']
+    assert all(os.path.exists(path) for path in paths)
+    assert len(paths) >= 2 * len(figures)
+
+
+def test_render_writes_every_figure(weather, tmp_path):
+    result = GreenhouseModel().simulate(weather)
+    paths = render({'run': result}, str(tmp_path), max_workers=0)
+    assert all(os.path.exists(path) for path in paths)
+    assert len(paths) >= len(FIGURES)
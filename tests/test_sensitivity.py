@@ -0,0 +1,85 @@
+import math
+
+import numpy as np
+import pytest
+
+from greenhouse.model import GreenhouseModel
+from greenhouse.sensitivity import factor_bounds, saltelli_samples, sensitivity, sobol_indices
+
+ISHIGAMI_A, ISHIGAMI_B = 7.0, 0.1
+
+
+def ishigami(X):
+    x1, x2, x3 = np.moveaxis(X, -1, 0)
+    return np.sin(x1) + ISHIGAMI_A * np.sin(x2) ** 2 + ISHIGAMI_B * x3 ** 4 * np.sin(x1)
+
+
+def ishigami_indices():
+    # 해석해 (x1, x2, x3 ~ U(-pi, pi))
+    a, b, pi = ISHIGAMI_A, ISHIGAMI_B, math.pi
+    V1 = 0.5 * (1 + b * pi ** 4 / 5) ** 2
+    V2 = a ** 2 / 8
+    V13 = b ** 2 * pi ** 8 * (1 / 18 - 1 / 50)
+    V = V1 + V2 + V13
+    return np.array([V1, V2, 0.0]) / V, np.array([V1 + V13, V2, V13]) / V
+
+
+def test_ishigami_reference_values():
+    S1_ref, ST_ref = ishigami_indices()
+    np.testing.assert_allclose(S1_ref, [0.3139, 0.4424, 0.0], atol=1e-4)
+    np.testing.assert_allclose(ST_ref, [0.5576, 0.4424, 0.2437], atol=1e-4)
+    bounds = {name: (-math.pi, math.pi) for name in ('x1', 'x2', 'x3')}
+    A, B, AB = saltelli_samples(bounds, 2 ** 16, seed=0)
+    assert AB.shape == (3, 2 ** 16, 3)
+    for i in range(3):
+        # AB[i]는 i열만 B
+        np.testing.assert_array_equal(AB[i][:, i], B[:, i])
+        np.testing.assert_array_equal(np.delete(AB[i], i, axis=1), np.delete(A, i, axis=1))
+    S1, ST = sobol_indices(ishigami(A), ishigami(B), ishigami(AB))
+    np.testing.assert_allclose(S1, S1_ref, atol=0.01)
+    np.testing.assert_allclose(ST, ST_ref, atol=0.01)
+
+
+def test_sobol_indices_shift_invariant():
+    # 평균이 큰 출력도 같은 지수 (평균을 빼고 계산), 상수 출력은 0
+    bounds = {name: (-math.pi, math.pi) for name in ('x1', 'x2', 'x3')}
+    A, B, AB = saltelli_samples(bounds, 1024, seed=1)
+    f_A, f_B, f_AB = ishigami(A), ishigami(B), ishigami(AB)
+    for a, b in zip(sobol_indices(f_A, f_B, f_AB), sobol_indices(f_A + 1e6, f_B + 1e6, f_AB + 1e6)):
+        np.testing.assert_allclose(a, b, rtol=1e-6)
+    S1, ST = sobol_indices(np.ones(4), np.ones(4), np.ones((3, 4)))
+    assert not S1.any() and not ST.any()
+
+
+def test_factor_bounds():
+    bounds = factor_bounds({'fr': 0.9}, factors=('fr', 'Agh', 'rRoof'), bounds={'rRoof': (0.1, 0.5)})
+    assert bounds['fr'] == pytest.approx((0.72, 1.0))  # 비율 변수는 1에서 자름
+    assert bounds['rRoof'] == (0.1, 0.5)
+    with pytest.raises(ValueError, match="unknown parameter 'area'"):
+        factor_bounds(factors=('area',))
+    with pytest.raises(ValueError, match="'fr': lower bound"):
+        factor_bounds(factors=('fr',), bounds={'fr': (0.5, 0.5)})
+
+
+def test_sensitivity(short_weather):
+    factors = ('ht', 'fr', 'Agh', 'rRoof')  # 'ht' 외피는 rRoof를 쓰지 않음
+    base = {'envelope': 'ht', 'ACH': 2.0}
+    serial = sensitivity(short_weather, base, factors, n_samples=16, chunk_size=50, max_workers=0)
+    assert serial.n_evaluations == 16 * (len(factors) + 2) + 2 * len(factors) + 1
+    parallel = sensitivity(short_weather, base, factors, n_samples=16, chunk_size=50, max_workers=2)
+    for name in ('oat', 'S1', 'ST'):
+        for output, values in getattr(serial, name).items():
+            np.testing.assert_allclose(getattr(parallel, name)[output], values, rtol=1e-12)
+
+    baseline = GreenhouseModel(**base).simulate(short_weather).summary()
+    assert serial.baseline['annual_heating'] == pytest.approx(baseline['annual_heating'], rel=1e-12)
+    # 탄성도는 범위 양 끝 단일 계산의 차분
+    lo, hi = serial.bounds['fr']
+    ends = [GreenhouseModel(**base, fr=fr).simulate(short_weather).summary()['annual_heating'] for fr in (lo, hi)]
+    x0 = GreenhouseModel(**base).params['fr']
+    expected = (ends[1] - ends[0]) / baseline['annual_heating'] / ((hi - lo) / x0)
+    assert serial.oat['annual_heating'][1] == pytest.approx(expected, rel=1e-9)
+    for output in serial.baseline:
+        assert serial.oat[output][3] == serial.S1[output][3] == serial.ST[output][3] == 0
+    assert serial.ranking('annual_heating')[-1] == ('rRoof', 0.0)
+    assert 'annual_heating (ST)' in serial.format()
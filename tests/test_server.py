@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from greenhouse import server
+from greenhouse.model import GreenhouseModel
+from greenhouse.weather import load_tmy
+
+
+@pytest.fixture
+def address(tmp_path, monkeypatch, caplog):
+    # 서버 프로세스 안에서 계산하는 서버를 스레드로 띄움
+    monkeypatch.setattr(server, 'MAX_LINE', 2 ** 16)
+    path = str(tmp_path / 'greenhouse.sock')
+    thread = threading.Thread(target=server.serve, kwargs={'path': path, 'max_workers': 0})
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not os.path.exists(path):
+        assert thread.is_alive() and time.monotonic() < deadline
+        time.sleep(0.01)
+    yield path
+    if thread.is_alive():
+        try:
+            with server.Client(path=path, timeout=30) as client:
+                client.call('shutdown')
+        except (ConnectionError, FileNotFoundError):
+            pass  # 테스트에서 이미 종료를 요청해 서버가 닫히는 중
+    thread.join(30)
+    assert not thread.is_alive()
+    assert not os.path.exists(path)
+    # 연결 처리 작업이 취소되거나 예외로 끝나면 asyncio가 ERROR로 기록함
+    assert not [r for r in caplog.records if r.name == 'asyncio' and r.levelno >= logging.ERROR]
+
+
+def test_requests_on_one_connection(address, tmy_path):
+    with server.Client(path=address, timeout=60) as client:
+        assert client.call('ping')['pid'] == os.getpid()
+        assert client.call('weather', weather=tmy_path)['n_hours'] == 8760
+        result = client.call('simulate', weather=tmy_path, params={'fr': 0.4}, channels=['Troom'])
+        expected = GreenhouseModel(fr=0.4).simulate(load_tmy(tmy_path))
+        assert result['summary'] == pytest.approx(expected.summary())
+        assert result['series']['Troom'] == pytest.approx(expected.Troom.tolist())
+        with pytest.raises(RuntimeError, match='unknown op'):
+            client.call('solve')
+        with pytest.raises(RuntimeError, match='KeyError'):
+            client.call('simulate')
+        stats = client.call('stats')  # 오류 뒤에도 연결 유지
+        assert (stats['requests'], stats['errors']) == (6, 2)  # stats 요청 포함
+
+
+def test_overlong_line_gets_error_then_close(address):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(30)
+        sock.connect(address)
+        sock.sendall(b'{"op": "ping", "pad": "' + b'x' * 2 ** 17 + b'"}\n')
+        with sock.makefile('rb') as f:
+            response = json.loads(f.readline())
+            assert f.readline() == b''  # 줄 경계를 잃었으므로 연결 종료
+    assert response['ok'] is False and 'exceeds' in response['error']
+    with server.Client(path=address, timeout=30) as client:
+        assert client.call('stats')['errors'] == 1
+
+
+def test_shutdown_closes_open_connections(address):
+    idle = server.Client(path=address, timeout=30)
+    try:
+        idle.call('ping')
+        with server.Client(path=address, timeout=30) as client:
+            assert client.call('shutdown') == {}
+        with pytest.raises(ConnectionError):
+            idle.call('ping')
+    finally:
+        idle.close()
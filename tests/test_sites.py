@@ -0,0 +1,66 @@
+import csv
+
+import numpy as np
+import pytest
+
+from greenhouse.benchmark import synthetic_weather, write_tmy_xlsx
+from greenhouse.model import GreenhouseModel
+from greenhouse.sites import SITE_METRICS, load_sites, run_sites, tmy_files
+from greenhouse.weather import load_tmy
+
+N = 336
+PARAMS = {'ACH': 2.0, 'feedback': True}
+
+
+@pytest.fixture(scope='module')
+def site_dir(tmp_path_factory):
+    # 기후가 조금씩 다른 관측소 세 곳 (2주)
+    path = tmp_path_factory.mktemp('sites')
+    for i, name in enumerate(('gangnung', 'daegwallyeong', 'sokcho')):
+        w = synthetic_weather(N, seed=i)
+        write_tmy_xlsx(str(path / f'{name}.xlsx'), w._replace(Toutdoor=w.Toutdoor - 3 * i))
+    return path
+
+
+def test_tmy_files(site_dir, tmp_path):
+    named = tmy_files(site_dir)
+    assert [name for name, _ in named] == ['daegwallyeong', 'gangnung', 'sokcho']
+    assert tmy_files([named[2][1], named[0][1]]) == [named[2], named[0]]  # 파일 목록은 입력 순서
+    (tmp_path / 'gangnung.xlsx').write_bytes(b'')
+    with pytest.raises(ValueError, match='duplicate site name'):
+        tmy_files([site_dir, tmp_path / 'gangnung.xlsx'])
+
+
+def test_load_sites_matches_load_tmy(site_dir):
+    loaded = load_sites(site_dir, max_workers=3, n_hours=N, cache=False)
+    assert list(loaded) == ['daegwallyeong', 'gangnung', 'sokcho']
+    for name, weather in loaded.items():
+        for a, b in zip(weather, load_tmy(str(site_dir / f'{name}.xlsx'), n_hours=N, cache=False)):
+            np.testing.assert_array_equal(a, b)
+
+
+@pytest.mark.parametrize('max_workers', [0, 2])
+def test_run_sites_matches_single_runs(site_dir, tmp_path, max_workers):
+    table = run_sites(site_dir, PARAMS, load_workers=3, max_workers=max_workers, n_hours=N, cache=False)
+    assert table.sites == ('daegwallyeong', 'gangnung', 'sokcho') and table.metrics == SITE_METRICS
+    assert table.values.shape == (3, len(SITE_METRICS))
+    for site, row in zip(table.sites, table.rows()):
+        weather = load_tmy(str(site_dir / f'{site}.xlsx'), n_hours=N, cache=False)
+        summary = GreenhouseModel(**PARAMS).simulate(weather).summary()
+        assert row == {'site': site, **{name: summary[name] for name in SITE_METRICS}}
+    # 추운 관측소일수록 난방부하가 큼
+    heating = dict(zip(table.sites, table.column('annual_heating')))
+    assert heating['gangnung'] < heating['daegwallyeong'] < heating['sokcho']
+
+    table.write_csv(str(tmp_path / 'sites.csv'))
+    with open(tmp_path / 'sites.csv', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['site'] for row in rows] == list(table.sites)
+    assert float(rows[1]['peak_heating']) == table.rows()[1]['peak_heating']
+
+
+def test_run_sites_errors(site_dir):
+    with pytest.raises(ValueError, match="unknown metric\\(s\\) 'heating'"):
+        run_sites(site_dir, metrics=('annual_heating', 'heating'), max_workers=0, n_hours=N, cache=False)
+    with pytest.raises(ValueError, match="unknown parameter\\(s\\) 'widthhouse'"):  # 작업자로 보내기 전에 검증
+        run_sites(site_dir, {'widthhouse': 8.0}, max_workers=0, n_hours=N, cache=False)
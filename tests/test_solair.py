@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from greenhouse.solair import Tsolair2_from_weather, calculate_Tsolair2
+
+
+def script_solair(Toutdoor, radSolar, Vwind, model, alpha_roof=0.2, epsilon=0.9):
+    # 스크립트의 시간별 스칼라 계산
+    out = []
+    for T, rad, V in zip(Toutdoor.tolist(), radSolar.tolist(), Vwind.tolist()):
+        if model == 'fixed':
+            out.append(T + (alpha_roof * rad) / 17)
+        else:
+            h_out_corrected = 5.7 + 3.8 * V
+            out.append(T + (alpha_roof * rad) / h_out_corrected - (epsilon * 63) / h_out_corrected)
+    return np.array(out)
+
+
+@pytest.mark.parametrize('coeffs', [{}, {'alpha_roof': 0.15}])
+@pytest.mark.parametrize('model', ['fixed', 'wind'])
+def test_matches_script_loop(model, coeffs, short_weather):
+    w = short_weather
+    Tsolair2 = calculate_Tsolair2(w.Toutdoor, w.radSolar, w.Vwind, model=model, **coeffs)
+    np.testing.assert_allclose(Tsolair2, script_solair(w.Toutdoor, w.radSolar, w.Vwind, model, **coeffs),
+                               rtol=1e-15)
+
+
+def test_epsilon_only_shifts_wind_model(short_weather):
+    w = short_weather
+    base = calculate_Tsolair2(w.Toutdoor, w.radSolar, w.Vwind, model='wind')
+    dark = calculate_Tsolair2(w.Toutdoor, w.radSolar, w.Vwind, model='wind', epsilon=0.0)
+    np.testing.assert_allclose(dark - base, 0.9 * 63 / (5.7 + 3.8 * w.Vwind))
+
+
+@pytest.mark.parametrize('model', ['fixed', 'wind', 'constant'])
+def test_broadcasts_over_leading_axes(model, short_weather):
+    # (연도, 시간) 기상 배열 묶음은 연도별 계산과 같음
+    years = np.stack([np.stack(short_weather), np.stack(short_weather)[:, ::-1]])
+    batch = Tsolair2_from_weather(years, model=model)
+    assert batch.shape == (2, len(short_weather.Toutdoor))
+    for year, data in zip(batch, years):
+        np.testing.assert_array_equal(year, Tsolair2_from_weather(data, model=model))
+    np.testing.assert_array_equal(batch[0], Tsolair2_from_weather(short_weather, model=model))
+
+
+def test_constant_ignores_weather(short_weather):
+    w = short_weather
+    Tsolair2 = calculate_Tsolair2(w.Toutdoor, w.radSolar, model='constant', Tsolair=295.0)
+    assert Tsolair2.shape == w.Toutdoor.shape and np.all(Tsolair2 == 295.0)
+    assert np.all(calculate_Tsolair2(w.Toutdoor, None, model='constant') == 300)
+
+
+def test_errors(short_weather):
+    w = short_weather
+    with pytest.raises(ValueError, match='needs Vwind'):
+        calculate_Tsolair2(w.Toutdoor, w.radSolar, model='wind')
+    with pytest.raises(ValueError, match="unknown sol-air model 'sky'"):
+        calculate_Tsolair2(w.Toutdoor, w.radSolar, w.Vwind, model='sky')
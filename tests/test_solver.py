@@ -0,0 +1,169 @@
+import numpy as np
+import pytest
+
+from greenhouse.heat_balance import hvac_gain, solve_heat_balance, step_seconds
+from greenhouse.model import GreenhouseModel
+from greenhouse.solver import HVAC_RULES, has_numba, linear_recurrence, solve_troom
+from greenhouse.variants import VARIANTS, variant_params
+
+METHODS = ['loop', 'stepwise'] + (['numba'] if has_numba() else [])
+
+
+def script_loop(p, hb):
+    # gangnung_dandong*.py 시간 루프의 파이썬 옮김 (성분별 열량 합, 설정온도 분기)
+    n = len(hb.S)
+    C = float(hb.C)
+    dt = step_seconds(p)
+    K = float(hvac_gain(p, C))
+    Th, Tc = p['Tset_heating'], p['Tset_cooling']
+    Troom = np.zeros(n)
+    qTotalHouse = np.zeros(n)
+    qHeating = np.zeros(n)
+    qCooling = np.zeros(n)
+    for k in range(n):
+        if k == 0:
+            Troom[k] = p['Troom_initial']
+        else:
+            dq = qTotalHouse[k - 1]
+            if p['feedback']:
+                dq += qHeating[k - 1] - qCooling[k - 1]
+            Troom[k] = Troom[k - 1] + dq * dt / C
+        q = hb.qRad[k] if np.ndim(hb.qRad) else hb.qRad
+        for U, T in hb.components.values():
+            q += U * ((T[k] if np.ndim(T) else T) - Troom[k])
+        qTotalHouse[k] = q
+        if Troom[k] < Th:
+            if p['hvac_rule'] == 'setpoint':
+                qHeating[k] = (Th - Troom[k]) * K
+            elif q < 0:
+                qHeating[k] = (Th - Troom[k]) * K - q
+        elif Troom[k] > Tc:
+            if p['hvac_rule'] == 'setpoint':
+                qCooling[k] = (Troom[k] - Tc) * K
+            elif q > 0:
+                qCooling[k] = (Troom[k] - Tc) * K + q
+    return Troom, qTotalHouse, qHeating, qCooling
+
+
+def static_loop(p, hb, Toutdoor, script=False):
+    # 정적 스크립트 (gangnung_dandong4.py, 5.py, _v1.py, _v2.py) 루프: 고정 실내온도의 열부하와
+    # 외기온도 또는 실내온도 분기 (_v2.py는 열부하를 누적한 실내온도로 분기)
+    # script=True이면 스크립트처럼 0시 열부하를 Troom_initial에서 계산 (Troom[0] = Troom_initial)
+    n = len(hb.S)
+    C = float(hb.C)
+    K = float(hvac_gain(p, C))
+    Th, Tc = p['Tset_heating'], p['Tset_cooling']
+    Troom = np.zeros(n)
+    qTotalHouse = np.zeros(n)
+    qHeating = np.zeros(n)
+    qCooling = np.zeros(n)
+    for k in range(n):
+        Tload = p['Troom_initial'] if script and k == 0 else p['Troom_fixed']
+        q = hb.qRad[k]
+        for U, T in hb.components.values():
+            q += U * ((T[k] if np.ndim(T) else T) - Tload)
+        qTotalHouse[k] = q
+        if p['room'] == 'fixed':
+            Troom[k] = Tload
+        else:
+            Troom[k] = p['Troom_initial'] if k == 0 else Troom[k - 1] + qTotalHouse[k - 1] * step_seconds(p) / C
+        t = Toutdoor[k] if p['control'] == 'outdoor' else Troom[k]
+        if t < Th:
+            qHeating[k] = (Th - Troom[k]) * K if p['hvac_rule'] == 'setpoint' else abs(q)
+        elif t > Tc:
+            qCooling[k] = (Troom[k] - Tc) * K if p['hvac_rule'] == 'setpoint' else abs(q)
+    return Troom, qTotalHouse, qHeating, qCooling
+
+
+@pytest.mark.parametrize('name', sorted(VARIANTS))
+def test_variant_matches_script_loop(name, weather):
+    p = variant_params(name)
+    hb, _ = solve_heat_balance(p, weather)
+    expected = script_loop(p, hb) if p['room'] == 'dynamic' else static_loop(p, hb, weather.Toutdoor)
+    result = GreenhouseModel(**p).simulate(weather)
+    for channel, values in zip(('Troom', 'qTotalHouse', 'qHeating', 'qCooling'), expected):
+        np.testing.assert_allclose(result.data[channel], values, rtol=1e-8, atol=1e-6, err_msg=channel)
+    # 성분 열전달량의 합은 열부하 (_v2.py도 누적 실내온도가 아닌 고정 실내온도 기준)
+    np.testing.assert_allclose(sum(result.components().values()), result.qTotalHouse, rtol=1e-8, atol=1e-6)
+
+
+@pytest.mark.parametrize('name', ['gangnung_dandong4', 'gangnung_dandong_v1', 'gangnung_dandong_v2'])
+def test_static_variant_differs_from_script_at_hour_zero(name, weather):
+    # 스크립트는 0시 열부하만 Troom_initial (297 K)에서 계산하고 변형은 모든 시간 Troom_fixed (300 K)
+    p = variant_params(name)
+    hb, _ = solve_heat_balance(p, weather)
+    Troom, qTotalHouse, qHeating, qCooling = static_loop(p, hb, weather.Toutdoor, script=True)
+    result = GreenhouseModel(**p).simulate(weather)
+    dq = float(hb.G) * (p['Troom_fixed'] - p['Troom_initial'])
+    assert dq > 0
+    assert result.qTotalHouse[0] == pytest.approx(qTotalHouse[0] - dq, rel=1e-9)
+    np.testing.assert_allclose(result.qTotalHouse[1:], qTotalHouse[1:], rtol=1e-8, atol=1e-6)
+    if p['room'] == 'fixed':
+        assert (Troom[0], result.Troom[0]) == (p['Troom_initial'], p['Troom_fixed'])
+        np.testing.assert_array_equal(result.Troom[1:], Troom[1:])
+    else:
+        # _v2.py는 0시 열부하 차이만큼 누적 실내온도가 평행 이동
+        shift = dq * step_seconds(p) / float(hb.C)
+        np.testing.assert_allclose(result.Troom[1:], Troom[1:] - shift, rtol=1e-8, atol=1e-6)
+    # 연간 부하 차이는 0시 한 시간 정도
+    assert result.qHeating.sum() == pytest.approx(qHeating.sum(), rel=1e-4, abs=dq)
+    assert result.qCooling.sum() == pytest.approx(qCooling.sum(), rel=1e-4, abs=dq)
+
+
+@pytest.mark.parametrize('integrator', ['euler', 'exponential'])
+@pytest.mark.parametrize('feedback', [False, True])
+@pytest.mark.parametrize('rule', sorted(HVAC_RULES))
+def test_methods_agree(rule, feedback, integrator, short_weather):
+    p = variant_params('gangnung_dandong5_test')
+    hb, _ = solve_heat_balance(p, short_weather)
+    args = (hb.S, hb.G, hb.C, p['Troom_initial'], p['Tset_heating'], p['Tset_cooling'])
+    # Euler는 스크립트의 dt = 1 s, 지수 적분은 실제 스텝 길이 (명시적 Euler가 발산하는 간격)
+    dt = 1.0 if integrator == 'euler' else 3600.0
+    kwargs = dict(dt=dt, hvac_rule=rule, hvac_gain=float(hb.C) / 3600, feedback=feedback, integrator=integrator)
+    reference = solve_troom(*args, method='loop', **kwargs)
+    for method in METHODS + ([] if feedback else ['scan']):
+        traj = solve_troom(*args, method=method, **kwargs)
+        for name in ('Troom', 'qTotalHouse', 'qHeating', 'qCooling'):
+            np.testing.assert_allclose(getattr(traj, name), getattr(reference, name), rtol=1e-9, atol=1e-6,
+                                       err_msg=f'{method} {name}')
+        np.testing.assert_array_equal(traj.mode, reference.mode)
+
+
+def test_scenario_axis_matches_single_rows(short_weather):
+    p = variant_params('gangnung_dandong5_2')
+    hb, _ = solve_heat_balance(p, short_weather)
+    Th = np.array([285.0, 291.0, 293.0])
+    K = float(hb.C) / 3600
+    batch = solve_troom(np.broadcast_to(hb.S, (3, len(hb.S))), hb.G, hb.C, p['Troom_initial'], Th,
+                        p['Tset_cooling'], dt=3600.0, hvac_gain=K, feedback=True, method='stepwise')
+    for i, t in enumerate(Th):
+        row = solve_troom(hb.S, hb.G, hb.C, p['Troom_initial'], t, p['Tset_cooling'], dt=3600.0, hvac_gain=K,
+                          feedback=True, method='loop')
+        np.testing.assert_allclose(batch.Troom[i], row.Troom, rtol=1e-12)
+
+
+@pytest.mark.parametrize('a', [0.7, np.linspace(0.6, 0.8, 199)])
+def test_linear_recurrence_memory(a):
+    # memory보다 가까운 값은 그대로, 먼 값은 버린 항 (a**memory 배) 만큼만 다름
+    b = np.random.default_rng(0).uniform(1, 2, 199)
+    x = linear_recurrence(a, b, 5.0)
+    x_loop = [5.0]
+    for ak, bk in zip(np.broadcast_to(a, b.shape), b):
+        x_loop.append(ak * x_loop[-1] + bk)
+    np.testing.assert_allclose(x, x_loop, rtol=1e-12)
+    short = linear_recurrence(a, b, 5.0, memory=24)
+    np.testing.assert_allclose(short[:33], x[:33], rtol=1e-12)  # 2의 거듭제곱으로 올림한 32 스텝까지 정확
+    np.testing.assert_allclose(short, x, rtol=4 * np.max(a) ** 32)
+    assert not np.array_equal(short, x)
+
+
+@pytest.mark.parametrize('name', ['gangnung_dandong5_2', 'gangnung_dandong_final', 'gangnung_dandong_final2'])
+def test_exponential_feedback_converges_with_step(name, weather):
+    # 큰 스텝도 설정온도를 지나는 시각에서 나누므로 1분 스텝과 실내온도 범위가 같음
+    p = dict(variant_params(name), integrator='exponential', dt=None, feedback=True)
+    hourly = GreenhouseModel(**p).simulate(weather).summary()
+    fine = GreenhouseModel(**dict(p, timestep=1)).simulate(weather).summary()
+    assert hourly['Troom_max'] == pytest.approx(fine['Troom_max'], abs=0.2)
+    assert hourly['Troom_min'] == pytest.approx(fine['Troom_min'], abs=0.2)
+    for metric in ('annual_heating', 'annual_cooling'):
+        assert hourly[metric] == pytest.approx(fine[metric], rel=0.15, abs=1.0), metric
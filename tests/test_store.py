@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pytest
+
+from greenhouse.heat_balance import DEFAULT_PARAMS
+from greenhouse.model import GreenhouseModel
+from greenhouse.store import META_FILE, create_store, open_result, save_result
+from greenhouse.sweep import sweep_series
+
+
+def test_round_trip(short_weather, tmp_path):
+    result = GreenhouseModel(feedback=True).simulate(short_weather)
+    save_result(result, str(tmp_path), short_weather)
+    stored = open_result(str(tmp_path), short_weather)
+    assert set(stored.channels) == set(result.channels)
+    for name in result.channels:
+        np.testing.assert_array_equal(stored.data[name], result.data[name])
+    assert stored.summary() == result.summary()
+
+
+def test_overwrite_removes_stale_channels(short_weather, tmp_path):
+    path = str(tmp_path)
+    save_result(GreenhouseModel().simulate(short_weather), path)
+    save_result(GreenhouseModel().simulate(short_weather, channels=('Troom', 'qHeating')), path)
+    assert sorted(os.listdir(path)) == sorted([META_FILE, 'Troom.npy', 'qHeating.npy'])
+    assert set(open_result(path).channels) == {'Troom', 'qHeating'}
+
+
+def test_incomplete_store_has_no_meta(tmp_path):
+    path = str(tmp_path)
+    create_store(path, (4,), ('Troom',))
+    assert not os.path.exists(os.path.join(path, META_FILE))
+    with pytest.raises(OSError):
+        open_result(path)
+
+
+def test_sweep_store_matches_memory(short_weather, tmp_path):
+    scenarios = {'fr': np.array([0.1, 0.2, 0.3])}
+    memory = sweep_series(scenarios, short_weather, chunk_size=2)
+    stored = sweep_series(scenarios, short_weather, chunk_size=2, path=str(tmp_path))
+    opened = open_result(str(tmp_path))
+    np.testing.assert_array_equal(opened.params['fr'], scenarios['fr'])
+    for name in memory.channels:
+        np.testing.assert_array_equal(opened.data[name], memory.data[name])
+        np.testing.assert_array_equal(stored.data[name], memory.data[name])
+
+
+def test_saved_sweep_keeps_base(short_weather, tmp_path):
+    # 메모리 스윕을 save_result로 저장해도 기준 설계 변수가 meta에 남음
+    base = {'Tset_heating': 290.0, 'ACH': 2.0, 'vent': 'ach', 'feedback': True}
+    result = sweep_series({'fr': np.array([0.1, 0.3])}, short_weather, base=base)
+    meta = save_result(result, str(tmp_path), short_weather)
+    direct = sweep_series({'fr': np.array([0.1, 0.3])}, short_weather, base=base, path=str(tmp_path / 'direct'))
+    assert meta['params'] == direct.meta['params'] != dict(DEFAULT_PARAMS)
+    assert meta['variant'] == direct.meta['variant']
+    opened = open_result(str(tmp_path), short_weather)
+    assert {name: opened.base[name] for name in base} == base
+    np.testing.assert_array_equal(opened.params['fr'], [0.1, 0.3])
+    for name in result.channels:
+        np.testing.assert_array_equal(opened.data[name], result.data[name])
+    save_result(opened, str(tmp_path / 'copy'))
+    assert open_result(str(tmp_path / 'copy')).meta['params'] == meta['params']
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from greenhouse.model import GreenhouseModel
+from greenhouse.stream import repeat_weather, simulate_stream, split_weather
+from greenhouse.variants import variant_params
+from greenhouse.weather import Weather
+
+CASES = [
+    ('gangnung_dandong5_test', {}),
+    ('gangnung_dandong5_2', {}),
+    ('gangnung_dandong_final', {}),
+    ('gangnung_dandong5_2', {'integrator': 'exponential', 'dt': None}),
+    ('gangnung_dandong_final2', {'air_properties': 'table'}),
+    ('gangnung_dandong5_test', {'timestep': 15}),  # 구간 경계 시간도 다음 구간을 향해 보간
+    ('gangnung_dandong5_test', {'timestep': 15, 'integrator': 'exponential', 'dt': None}),
+    ('gangnung_dandong_final', {'timestep': 5, 'integrator': 'exponential', 'dt': None, 'feedback': True}),
+    ('gangnung_dandong4', {}),
+    ('gangnung_dandong_v2', {'integrator': 'exponential'}),  # 정적 계산은 integrator를 쓰지 않음
+]
+
+
+@pytest.mark.parametrize('variant, changes', CASES)
+def test_chunked_matches_full_year(variant, changes, weather):
+    params = dict(variant_params(variant), **changes)
+    model = GreenhouseModel(**params)
+    full = model.simulate(weather)
+    parts = list(model.stream(split_weather(weather, 1000)))
+    assert len(parts) == 9
+    # 물성치 표는 구간마다 고정점 반복을 하므로 수렴 허용오차 정도 차이
+    # (5_test의 열량은 K (Tset - Troom), K = C / 1 s 이라 실내온도 반올림 오차가 크게 보임)
+    rtol = 1e-6 if params['air_properties'] == 'table' else 1e-9
+    for name in ('Troom', 'qHeating', 'qCooling', 'qTotalHouse'):
+        np.testing.assert_allclose(np.concatenate([part.data[name] for part in parts]), full.data[name],
+                                   rtol=rtol, atol=1e-5, err_msg=name)
+
+
+@pytest.mark.parametrize('variant', ['gangnung_dandong5_test', 'gangnung_dandong5_2'])
+def test_stream_summary_matches_multi_year(variant, weather):
+    params = variant_params(variant)
+    summary = simulate_stream(params, repeat_weather(weather, 3))
+    years = Weather(*(np.tile(v, 3) for v in weather))
+    expected = GreenhouseModel(**params).simulate(years).summary()
+    assert summary.n_hours == 3 * len(weather.Toutdoor)
+    assert float(summary.heating) == pytest.approx(expected['annual_heating'], rel=1e-10)
+    assert float(summary.cooling) == pytest.approx(expected['annual_cooling'], rel=1e-10)
+    assert float(summary.peak_heating) == pytest.approx(expected['peak_heating'], rel=1e-12)
+    assert int(summary.peak_heating_hour) == expected['peak_heating_hour']
+    assert float(summary.Troom_min) == pytest.approx(expected['Troom_min'], rel=1e-12)
+    assert float(summary.Troom_mean) == pytest.approx(expected['Troom_mean'], rel=1e-10)
+
+
+def test_stream_scenario_axis(weather):
+    params = dict(variant_params('gangnung_dandong5_2'), Tset_heating=np.array([285.15, 291.15]))
+    summary = simulate_stream(params, split_weather(weather, 2000), lead=(2,))
+    for i, t in enumerate(params['Tset_heating']):
+        expected = GreenhouseModel(**dict(params, Tset_heating=t)).simulate(weather).summary()
+        assert summary.heating[i] == pytest.approx(expected['annual_heating'], rel=1e-10)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from greenhouse.model import GreenhouseModel
+from greenhouse.sweep import as_table, grid, sweep, sweep_series
+from greenhouse.variants import variant_params
+
+SCENARIOS = grid(fr=[0.0, 0.3], Tset_heating=[285.15, 291.15], Troom_initial=[283.15, 293.15])
+
+
+@pytest.mark.parametrize('variant', ['gangnung_dandong5_test', 'gangnung_dandong5_2', 'gangnung_dandong_final'])
+@pytest.mark.parametrize('timestep', [60, 15])
+def test_sweep_rows_match_single_runs(variant, timestep, short_weather):
+    base = variant_params(variant)
+    base['timestep'] = timestep
+    table = sweep(SCENARIOS, short_weather, base=base, chunk_size=3)
+    assert len(table) == 8
+    for row in table.rows():
+        params = dict(base)
+        params.update({name: row[name] for name in SCENARIOS})
+        summary = GreenhouseModel(**params).simulate(short_weather).summary()
+        for name in ('annual_heating', 'annual_cooling', 'peak_heating', 'peak_cooling'):
+            assert row[name] == pytest.approx(summary[name], rel=1e-9, abs=1e-9), name
+        assert row['peak_heating_hour'] == summary['peak_heating_hour']
+
+
+def test_sweep_series_matches_single_runs(short_weather):
+    base = variant_params('gangnung_dandong5_2')
+    series = sweep_series(SCENARIOS, short_weather, dtype=np.float64, base=base, chunk_size=5)
+    for i in range(8):
+        params = dict(base)
+        params.update({name: values[i] for name, values in SCENARIOS.items()})
+        result = GreenhouseModel(**params).simulate(short_weather)
+        for name in series.channels:
+            np.testing.assert_allclose(series.data[name][i], result.data[name], rtol=1e-12, err_msg=name)
+
+
+def test_as_table_rejects_model_choice():
+    with pytest.raises(ValueError, match='feedback'):
+        as_table({'feedback': [True, False]})
+    with pytest.raises(ValueError, match='same length'):
+        as_table({'fr': [0.1, 0.2], 'ACH': [1.0]})
@@ -0,0 +1,120 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+import greenhouse.weather
+from greenhouse.benchmark import write_tmy_xlsx
+from greenhouse.weather import CACHE_DIRNAME, Weather, load_tmy, read_tmy_xlsx, resample_weather
+
+N = 48
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    # 엑셀을 실제로 읽은 횟수
+    calls = []
+
+    def counting(path, n_hours):
+        calls.append(path)
+        return read_tmy_xlsx(path, n_hours)
+
+    monkeypatch.setattr(greenhouse.weather, 'read_tmy_xlsx', counting)
+    return calls
+
+
+def write(path, weather, scale=1.0):
+    write_tmy_xlsx(str(path), Weather(*(np.asarray(v[:N]) * scale for v in weather)))
+    return str(path)
+
+
+def test_cache_round_trip(tmp_path, weather, reads):
+    path = write(tmp_path / 'tmy.xlsx', weather)
+    first = load_tmy(path, n_hours=N)
+    for name, values in first._asdict().items():
+        np.testing.assert_allclose(values, getattr(weather, name)[:N], rtol=1e-15, err_msg=name)
+    cached = load_tmy(path, n_hours=N)
+    for a, b in zip(cached, first):
+        np.testing.assert_array_equal(a, b)
+    assert len(reads) == 1
+    assert len(os.listdir(tmp_path / CACHE_DIRNAME)) == 1
+    load_tmy(path, n_hours=N, cache=False)
+    assert len(reads) == 2
+
+
+def test_cache_rebuilt_when_file_changes(tmp_path, weather, reads):
+    path = write(tmp_path / 'tmy.xlsx', weather)
+    load_tmy(path, n_hours=N)
+    # 내용은 같고 수정시각만 바뀜
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    load_tmy(path, n_hours=N)
+    assert len(reads) == 2
+    # 수정시각은 그대로 두고 내용 (크기)만 바뀜
+    stat = os.stat(path)
+    write(path, weather, scale=1.5)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(path).st_size != stat.st_size
+    changed = load_tmy(path, n_hours=N)
+    assert len(reads) == 3
+    np.testing.assert_allclose(changed.Toutdoor, 1.5 * weather.Toutdoor[:N])
+
+
+def test_corrupt_cache_is_rewritten(tmp_path, weather, reads):
+    path = write(tmp_path / 'tmy.xlsx', weather)
+    load_tmy(path, n_hours=N)
+    cache_dir = tmp_path / CACHE_DIRNAME
+    (cache_file,) = cache_dir.iterdir()
+    cache_file.write_bytes(b'not an npy file')
+    np.testing.assert_allclose(load_tmy(path, n_hours=N).radSolar, weather.radSolar[:N], rtol=1e-15)
+    assert len(reads) == 2
+    assert np.load(cache_file).shape == (4, N)
+
+
+def test_threads_share_cold_cache(tmp_path, weather, monkeypatch):
+    # 같은 프로세스의 여러 스레드가 동시에 캐시를 만들어도 임시 파일이 겹치지 않음
+    path = write(tmp_path / 'tmy.xlsx', weather)
+    n_threads = 4
+    barrier = threading.Barrier(n_threads)
+    replaced = []
+    replace = os.replace
+
+    def read_together(path, n_hours):
+        data = read_tmy_xlsx(path, n_hours)
+        barrier.wait(timeout=30)  # 모든 스레드가 캐시가 없는 상태에서 읽음
+        return data
+
+    def recording_replace(src, dst):
+        replaced.append(src)
+        replace(src, dst)
+
+    monkeypatch.setattr(greenhouse.weather, 'read_tmy_xlsx', read_together)
+    monkeypatch.setattr(os, 'replace', recording_replace)
+    results, errors = [], []
+
+    def work():
+        try:
+            results.append(load_tmy(path, n_hours=N))
+        except Exception as e:  # 스레드 예외를 테스트로 전달
+            errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+    assert not errors and len(results) == n_threads
+    assert len(set(replaced)) == n_threads
+    for result in results:
+        np.testing.assert_array_equal(result.Toutdoor, results[0].Toutdoor)
+    assert [p.suffix for p in (tmp_path / CACHE_DIRNAME).iterdir()] == ['.npy']
+
+
+def test_resample_weather_interpolates_within_hours(short_weather):
+    fine = resample_weather(short_weather, 15)
+    assert len(fine.Toutdoor) == 4 * len(short_weather.Toutdoor)
+    np.testing.assert_array_equal(fine.Toutdoor[::4], short_weather.Toutdoor)
+    np.testing.assert_allclose(fine.Toutdoor[2], (short_weather.Toutdoor[0] + short_weather.Toutdoor[1]) / 2)
+    assert fine.Toutdoor[-1] == short_weather.Toutdoor[-1]  # 마지막 시간 이후는 마지막 값 유지
+    assert resample_weather(short_weather, 60) is short_weather